@@ -0,0 +1,143 @@
+import argparse
+import sqlite3
+
+# Sum and count of every (year, month, type_id), kept current by the triggers
+# below so month totals are a primary-key lookup instead of a scan.
+AGGREGATES_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        year INTEGER NOT NULL,
+        month INTEGER NOT NULL,
+        type_id INTEGER NOT NULL,
+        total INTEGER NOT NULL DEFAULT 0,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (year, month, type_id)
+    ) WITHOUT ROWID
+"""
+
+AGGREGATES_TRIGGERS_SQL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_aggregates_insert
+    AFTER INSERT ON transactions
+    BEGIN
+        INSERT INTO monthly_aggregates (year, month, type_id, total, count)
+        VALUES (NEW.year, NEW.month, NEW.type_id, NEW.amount, 1)
+        ON CONFLICT (year, month, type_id) DO UPDATE
+        SET total = total + excluded.total, count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_aggregates_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        UPDATE monthly_aggregates
+        SET total = total - OLD.amount, count = count - 1
+        WHERE year = OLD.year AND month = OLD.month AND type_id = OLD.type_id;
+
+        DELETE FROM monthly_aggregates
+        WHERE year = OLD.year AND month = OLD.month AND type_id = OLD.type_id AND count = 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_aggregates_update
+    AFTER UPDATE OF type_id, amount, month, year ON transactions
+    BEGIN
+        UPDATE monthly_aggregates
+        SET total = total - OLD.amount, count = count - 1
+        WHERE year = OLD.year AND month = OLD.month AND type_id = OLD.type_id;
+
+        DELETE FROM monthly_aggregates
+        WHERE year = OLD.year AND month = OLD.month AND type_id = OLD.type_id AND count = 0;
+
+        INSERT INTO monthly_aggregates (year, month, type_id, total, count)
+        VALUES (NEW.year, NEW.month, NEW.type_id, NEW.amount, 1)
+        ON CONFLICT (year, month, type_id) DO UPDATE
+        SET total = total + excluded.total, count = count + 1;
+    END
+    """,
+]
+
+# Aggregates computed from scratch, used to rebuild and to check
+ACTUAL_AGGREGATES_QUERY = """
+    SELECT year, month, type_id, SUM(amount), COUNT(*)
+    FROM transactions
+    GROUP BY year, month, type_id
+"""
+
+
+def create_aggregates(cursor):
+    """Create monthly_aggregates and its triggers, backfilling a new table"""
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'monthly_aggregates'"
+    )
+    exists = cursor.fetchone() is not None
+
+    cursor.execute(AGGREGATES_TABLE_SQL.format(name="monthly_aggregates"))
+    for trigger_sql in AGGREGATES_TRIGGERS_SQL:
+        cursor.execute(trigger_sql)
+
+    if not exists:
+        rebuild_aggregates(cursor)
+
+
+def rebuild_aggregates(cursor):
+    """Recompute monthly_aggregates from the transactions table"""
+    cursor.execute("DELETE FROM monthly_aggregates")
+    cursor.execute(
+        "INSERT INTO monthly_aggregates (year, month, type_id, total, count) "
+        + ACTUAL_AGGREGATES_QUERY
+    )
+
+
+def check_aggregates(cursor):
+    """Compare monthly_aggregates with a from-scratch rebuild.
+
+    Returns a list of (year, month, type_id, stored, actual) mismatches, where
+    stored and actual are (total, count) pairs or None when missing.
+    """
+    cursor.execute(
+        "SELECT year, month, type_id, total, count FROM monthly_aggregates"
+    )
+    stored = {row[:3]: row[3:] for row in cursor.fetchall()}
+
+    cursor.execute(ACTUAL_AGGREGATES_QUERY)
+    actual = {row[:3]: row[3:] for row in cursor.fetchall()}
+
+    mismatches = []
+    for key in sorted(stored.keys() | actual.keys()):
+        stored_value = stored.get(key)
+        actual_value = actual.get(key)
+        if stored_value != actual_value:
+            mismatches.append((*key, stored_value, actual_value))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check monthly_aggregates against transactions")
+    parser.add_argument("--db", default="finance.db")
+    parser.add_argument("--repair", action="store_true", help="rebuild the aggregates when they differ")
+    args = parser.parse_args()
+
+    # migrate_database builds on this module
+    from migrate_database import upgrade_database
+
+    conn = sqlite3.connect(args.db)
+    upgrade_database(conn)
+    cursor = conn.cursor()
+    type_names = dict(cursor.execute("SELECT id, name FROM transaction_types"))
+
+    mismatches = check_aggregates(cursor)
+    if not mismatches:
+        print("✅ monthly_aggregates is consistent")
+    else:
+        for year, month, type_id, stored, actual in mismatches:
+            print(f"❌ {year}-{month:02d} {type_names.get(type_id, type_id)}: stored={stored} actual={actual}")
+        if args.repair:
+            rebuild_aggregates(cursor)
+            conn.commit()
+            print("🔧 monthly_aggregates rebuilt")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import argparse
+import os
+import time
+from itertools import chain
+
+# NumPy is optional: only this module needs it (pip install numpy)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ledger import EXPENSE_TYPES, INCOME_TYPES, Ledger
+from money import format_amount
+from storage import DEFAULT_PATH
+
+# Rows fetched per fetchmany while reading columns
+READ_BATCH = 50_000
+
+# Columns kept per transaction; period is the month index year * 12 + month - 1
+FIELDS = ("id", "amount", "type_id", "category_id", "period")
+
+COLUMNS_QUERY = """
+    SELECT id, amount, type_id, category_id, year * 12 + month - 1
+    FROM transactions
+    WHERE id > ?
+"""
+
+PERIOD_COLUMNS_QUERY = """
+    SELECT id, amount, type_id, category_id, year * 12 + month - 1
+    FROM transactions
+    WHERE year = ? AND month = ?
+"""
+
+AGGREGATES_QUERY = "SELECT year * 12 + month - 1, type_id, total, count FROM monthly_aggregates"
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("analytics needs NumPy: pip install numpy")
+
+
+def cache_path(db_path):
+    """Where the columns of ``db_path`` are cached ("finance.db" -> "finance.db.columns.npz")"""
+    return db_path + ".columns.npz"
+
+
+def period_text(period):
+    return f"{period // 12}-{period % 12 + 1:02d}"
+
+
+class Columns:
+    """The transactions table as one int64 NumPy array per field of FIELDS.
+
+    ``read`` fills them in a single pass over the table; ``refresh`` brings
+    a cached copy up to date by reading only the rows with an id above
+    ``last_id``, plus the months whose totals or counts no longer match
+    ``monthly_aggregates`` (where rows were deleted or edited). A change
+    that keeps a month's totals, such as a new category, is only picked up
+    by a rebuild.
+    """
+
+    def __init__(self, arrays, last_id):
+        for field in FIELDS:
+            setattr(self, field, arrays[field])
+        self.last_id = last_id
+
+    def __len__(self):
+        return len(self.id)
+
+    @classmethod
+    def read(cls, conn, sql=COLUMNS_QUERY, parameters=(0,)):
+        """Columns of the rows of ``sql`` (SELECTing FIELDS in order)"""
+        require_numpy()
+        cursor = conn.execute(sql, parameters)
+        chunks = []
+        while True:
+            rows = cursor.fetchmany(READ_BATCH)
+            if not rows:
+                break
+            chunks.append(np.fromiter(chain.from_iterable(rows), np.int64, len(rows) * len(FIELDS)))
+        flat = np.concatenate(chunks) if chunks else np.empty(0, np.int64)
+        table = flat.reshape(-1, len(FIELDS))
+        arrays = {field: np.ascontiguousarray(table[:, i]) for i, field in enumerate(FIELDS)}
+        return cls(arrays, int(arrays["id"].max()) if len(table) else 0)
+
+    @classmethod
+    def load(cls, path):
+        """Cached columns, or None if there are none"""
+        require_numpy()
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as cached:
+            return cls({field: cached[field] for field in FIELDS}, int(cached["last_id"]))
+
+    def save(self, path):
+        """Write the columns to ``path``, replacing it only once complete"""
+        partial_path = path + ".partial"
+        with open(partial_path, "wb") as file:
+            np.savez(file, last_id=self.last_id, **{field: getattr(self, field) for field in FIELDS})
+        os.replace(partial_path, path)
+
+    def concatenate(self, others, keep=None):
+        """These columns (the rows in the ``keep`` mask) followed by ``others``'"""
+        arrays = {}
+        for field in FIELDS:
+            mine = getattr(self, field)
+            parts = [mine if keep is None else mine[keep]]
+            arrays[field] = np.concatenate(parts + [getattr(other, field) for other in others])
+        return Columns(arrays, max([self.last_id] + [other.last_id for other in others]))
+
+    def refresh(self, conn):
+        """Columns with what changed in the database since these were read
+        (these same columns if nothing did)"""
+        added = Columns.read(conn, COLUMNS_QUERY, (self.last_id,))
+        columns = self.concatenate([added]) if len(added) else self
+        stale = columns.stale_periods(conn)
+        if not stale:
+            return columns
+
+        reread = [
+            Columns.read(conn, PERIOD_COLUMNS_QUERY, (period // 12, period % 12 + 1))
+            for period in stale
+        ]
+        return columns.concatenate(reread, ~np.isin(columns.period, stale))
+
+    def stale_periods(self, conn):
+        """Months whose per-type totals or counts differ from monthly_aggregates"""
+        stored = {
+            (period, type_id): (total, count)
+            for period, type_id, total, count in conn.execute(AGGREGATES_QUERY)
+        }
+
+        cached = {}
+        if len(self):
+            first = int(self.period.min())
+            width = int(self.type_id.max()) + 1
+            cells = (self.period - first) * width + self.type_id
+            counts = np.bincount(cells)
+            # float64 weights are exact while each cell stays under 2**53 minor units
+            totals = np.rint(np.bincount(cells, weights=self.amount)).astype(np.int64)
+            for cell in np.flatnonzero(counts):
+                period, type_id = divmod(int(cell), width)
+                cached[first + period, type_id] = (int(totals[cell]), int(counts[cell]))
+
+        changed = {key for key in stored.keys() | cached.keys() if stored.get(key) != cached.get(key)}
+        return sorted({period for period, _ in changed})
+
+
+def load_columns(ledger, path=None, rebuild=False):
+    """The ledger's columns, from the cache at ``path`` when there is one,
+    refreshed and saved back"""
+    path = path or cache_path(ledger.path)
+    cached = None if rebuild else Columns.load(path)
+    if cached is None:
+        columns = Columns.read(ledger.conn)
+    else:
+        columns = cached.refresh(ledger.conn)
+    if columns is not cached:
+        columns.save(path)
+    return columns
+
+
+def monthly_totals(columns, by="type_id", mask=None):
+    """Sum of amounts per month and per value of the ``by`` column.
+
+    Returns (periods, keys, matrix): every month from the first to the last
+    with transactions (empty ones are rows of zeros), the distinct values
+    of ``by``, and a periods x keys int64 matrix. ``mask`` selects rows.
+    """
+    period, group, amount = columns.period, getattr(columns, by), columns.amount
+    if mask is not None:
+        period, group, amount = period[mask], group[mask], amount[mask]
+    if not len(period):
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.zeros((0, 0), np.int64)
+
+    first = int(period.min())
+    periods = np.arange(first, int(period.max()) + 1)
+    # Ids are small integers: a lookup table numbers the ones present
+    # without sorting the rows
+    keys = np.flatnonzero(np.bincount(group))
+    key_index = np.zeros(int(keys[-1]) + 1, np.int64)
+    key_index[keys] = np.arange(len(keys))
+    cells = (period - first) * len(keys) + key_index[group]
+    sums = np.bincount(cells, weights=amount, minlength=len(periods) * len(keys))
+    return periods, keys, np.rint(sums).astype(np.int64).reshape(len(periods), len(keys))
+
+
+def rolling_mean(values, window):
+    """Mean of each ``window`` consecutive rows (NaN until there are enough)"""
+    values = np.asarray(values, np.float64)
+    sums = np.cumsum(values, axis=0)
+    means = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        means[window - 1:] = sums[window - 1:]
+        means[window:] -= sums[:-window]
+        means[window - 1:] /= window
+    return means
+
+
+def percentiles(values, q=(10, 50, 90)):
+    return np.percentile(values, q, axis=0)
+
+
+def type_mask(columns, vocabulary, names):
+    """Rows whose type is one of ``names``"""
+    ids = [vocabulary.type_ids[name] for name in names if name in vocabulary.type_ids]
+    wanted = np.zeros(max(ids + [int(columns.type_id.max(initial=0))]) + 1, bool)
+    wanted[ids] = True
+    return wanted[columns.type_id]
+
+
+def monthly_series(columns, vocabulary, names):
+    """(periods, totals) of the types ``names`` together, one total per month"""
+    periods, _, matrix = monthly_totals(columns, "type_id", type_mask(columns, vocabulary, names))
+    return periods, matrix.sum(axis=1)
+
+
+def volatility(series):
+    """Coefficient of variation: standard deviation over mean (0 if the mean is 0)"""
+    mean = series.mean() if len(series) else 0
+    return float(series.std() / mean) if mean else 0.0
+
+
+def share(columns, vocabulary, part, whole):
+    """(periods, fraction) of the ``whole`` types' monthly total that is ``part``"""
+    periods, keys, matrix = monthly_totals(columns, "type_id", type_mask(columns, vocabulary, whole))
+    part_ids = [vocabulary.type_ids[name] for name in part if name in vocabulary.type_ids]
+    totals = matrix.sum(axis=1)
+    parts = matrix[:, np.isin(keys, part_ids)].sum(axis=1)
+    return periods, np.divide(parts, totals, out=np.zeros(len(totals)), where=totals != 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trends over the whole ledger with NumPy")
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    parser.add_argument("--months", type=int, default=12, help="months shown in the trends")
+    parser.add_argument("--window", type=int, default=3, help="months in the rolling means")
+    parser.add_argument("--top", type=int, default=10, help="categories ranked by spend")
+    parser.add_argument("--rebuild", action="store_true", help="read every row instead of using the cache")
+    args = parser.parse_args()
+
+    with Ledger(args.db) as ledger:
+        start = time.perf_counter()
+        columns = load_columns(ledger, rebuild=args.rebuild)
+        print(f"📦 {len(columns):,} transactions loaded in {(time.perf_counter() - start) * 1000:.0f} ms")
+        if not len(columns):
+            return
+        vocabulary = ledger.vocabulary
+
+        start = time.perf_counter()
+        periods, income = monthly_series(columns, vocabulary, INCOME_TYPES)
+        if len(income):
+            low, median, high = percentiles(income)
+            print(
+                f"\n💰 Monthly income: median {format_amount(int(median))}, "
+                f"p10 {format_amount(int(low))}, p90 {format_amount(int(high))}, "
+                f"volatility {volatility(income):.1%}"
+            )
+
+        periods, fraction = share(columns, vocabulary, ["expense_innecesarios"], EXPENSE_TYPES)
+        trend = rolling_mean(fraction, args.window)
+        print(f"\n🛍️  Share of innecesarios in expenses (rolling mean of {args.window} months)")
+        if not len(periods):
+            print("(no expenses)")
+        for period, value, mean in list(zip(periods, fraction, trend))[-args.months:]:
+            print(f"{period_text(int(period))}  {value:6.1%}  {mean:6.1%}")
+
+        expenses = type_mask(columns, vocabulary, EXPENSE_TYPES)
+        periods, categories, matrix = monthly_totals(columns, "category_id", expenses)
+        recent = matrix[-args.months:]
+        spend = recent.sum(axis=0)
+        print(f"\n🏷️  Top categories over the last {len(recent)} months (and their {args.window}-month mean)")
+        if not len(matrix):
+            print("(no expenses)")
+        else:
+            means = np.nan_to_num(rolling_mean(matrix, args.window)[-1])
+            for index in np.argsort(spend)[::-1][:args.top]:
+                name = vocabulary.category_name(int(categories[index]))
+                print(f"{name[:30]:<30} {format_amount(int(spend[index])):>18} {format_amount(int(means[index])):>16}")
+        print(f"\n⏱️  Analysis in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import heapq
+import math
+import unicodedata
+from bisect import bisect_left, insort
+from datetime import datetime
+
+# Suggestions returned by default
+SUGGESTION_LIMIT = 8
+
+# Ranking: a use this many days more recent counts as much as e times the uses
+RECENCY_DAYS = 30
+
+# Prefixes matching at most this many keys are ranked by scanning their
+# matches; wider ones walk the keys from best to worst score instead,
+# which finds SUGGESTION_LIMIT matches quickly precisely because so many
+# keys match
+SCAN_LIMIT = 512
+
+# Cached results kept before the cache is dropped and starts over
+CACHE_SIZE = 4096
+
+
+def normalize(text):
+    """Matching key: case and accents are ignored ("Café" -> "cafe")"""
+    text = text.casefold()
+    if text.isascii():
+        return text
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def julian_day(date):
+    """SQLite's julianday() of a "YYYY-MM-DD HH:MM:SS" date, computed in Python"""
+    moment = datetime.fromisoformat(date)
+    seconds = moment.hour * 3600 + moment.minute * 60 + moment.second
+    return moment.toordinal() + 1721424.5 + seconds / 86400
+
+
+def score(uses, last_day):
+    """Higher is better; independent of today, so rankings never go stale"""
+    return math.log1p(uses) + (last_day or 0) / RECENCY_DAYS
+
+
+class PrefixIndex:
+    """Texts ranked by how often and how recently they were used.
+
+    ``keys`` holds the normalized texts sorted, so the ones starting with
+    a prefix are one bisected slice; ``ranked`` holds them best first.
+    Results are cached per prefix and ``add`` only drops the cached
+    prefixes of the text it changes.
+    """
+
+    def __init__(self, usage=()):
+        # key -> [text shown, uses, julian day of the last use]
+        self.entries = {}
+        for text, uses, last_day in usage:
+            key = normalize(text)
+            entry = self.entries.get(key)
+            if entry is None:
+                self.entries[key] = [text, uses, last_day]
+                continue
+            entry[1] += uses
+            if (last_day or 0) > (entry[2] or 0):
+                entry[0] = text
+                entry[2] = last_day
+
+        self.keys = sorted(self.entries)
+        self.ranks = {key: (-score(uses, last_day), key) for key, (_, uses, last_day) in self.entries.items()}
+        self.ranked = sorted(self.ranks.values())
+        self.cache = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def suggest(self, prefix, limit=SUGGESTION_LIMIT):
+        """Up to ``limit`` texts starting with ``prefix``, best first"""
+        key = normalize(prefix)
+        cached = self.cache.get((key, limit))
+        if cached is not None:
+            return cached
+
+        start = bisect_left(self.keys, key)
+        end = bisect_left(self.keys, key + "\U0010ffff")
+        if end - start <= SCAN_LIMIT:
+            best = heapq.nsmallest(limit, map(self.ranks.__getitem__, self.keys[start:end]))
+        else:
+            best = []
+            for rank in self.ranked:
+                if rank[1].startswith(key):
+                    best.append(rank)
+                    if len(best) == limit:
+                        break
+
+        if len(self.cache) >= CACHE_SIZE:
+            self.cache.clear()
+        result = self.cache[key, limit] = [self.entries[k][0] for _, k in best]
+        return result
+
+    def add(self, text, day):
+        """Count one more use of ``text`` on julian day ``day``"""
+        key = normalize(text)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = [text, 0, day]
+            insort(self.keys, key)
+        else:
+            del self.ranked[bisect_left(self.ranked, self.ranks[key])]
+            if day >= (entry[2] or 0):
+                entry[0] = text
+                entry[2] = day
+        entry[1] += 1
+        rank = self.ranks[key] = (-score(entry[1], entry[2]), key)
+        insort(self.ranked, rank)
+
+        for cached in list(self.cache):
+            if key.startswith(cached[0]):
+                del self.cache[cached]
+
+
+class Suggestions:
+    """Category and description indexes of each transaction type.
+
+    Built once from the whole history (off the Tk thread, it reads every
+    transaction) and then kept current by ``add`` as transactions are
+    entered. Deletions are not subtracted until the next build.
+    """
+
+    def __init__(self, usage, categories):
+        """``usage``: (type, description, category, uses, last julian day)
+        rows; ``categories``: {type: [names]}, so unused ones are offered"""
+        category_usage = {}
+        description_usage = {}
+        for transaction_type, names in categories.items():
+            for name in names:
+                category_usage[transaction_type, name] = [0, None]
+
+        for transaction_type, description, category, uses, last_day in usage:
+            for totals, key in (
+                (category_usage, (transaction_type, category)),
+                (description_usage, (transaction_type, description)),
+            ):
+                counted = totals.get(key)
+                if counted is None:
+                    totals[key] = [uses, last_day]
+                else:
+                    counted[0] += uses
+                    counted[1] = max(counted[1] or 0, last_day or 0)
+
+        self.category_indexes = self.build(category_usage)
+        self.description_indexes = self.build(description_usage)
+
+    @staticmethod
+    def build(usage):
+        rows = {}
+        for (transaction_type, text), (uses, last_day) in usage.items():
+            rows.setdefault(transaction_type, []).append((text, uses, last_day))
+        return {transaction_type: PrefixIndex(texts) for transaction_type, texts in rows.items()}
+
+    @classmethod
+    def from_ledger(cls, ledger):
+        return cls(ledger.usage(), ledger.categories())
+
+    def categories(self, transaction_type, prefix, limit=SUGGESTION_LIMIT):
+        index = self.category_indexes.get(transaction_type)
+        return index.suggest(prefix, limit) if index else []
+
+    def descriptions(self, transaction_type, prefix, limit=SUGGESTION_LIMIT):
+        index = self.description_indexes.get(transaction_type)
+        return index.suggest(prefix, limit) if index else []
+
+    def add(self, transaction_type, description, category, date):
+        """Count a transaction just entered"""
+        day = julian_day(date)
+        for indexes, text in (
+            (self.category_indexes, category),
+            (self.description_indexes, description),
+        ):
+            index = indexes.get(transaction_type)
+            if index is None:
+                index = indexes[transaction_type] = PrefixIndex()
+            index.add(text, day)
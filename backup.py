@@ -0,0 +1,315 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from instrumentation import metrics
+from storage import DEFAULT_PATH
+
+BACKUP_DIR = "backups"
+# Microseconds keep two backups taken in the same second (a manual backup
+# and the safety backup of a restore) from sharing a name. Backups named
+# with whole seconds, as earlier versions did, are still listed.
+TIMESTAMP_FORMAT = "%Y%m%d-%H%M%S-%f"
+TIMESTAMP_FORMATS = (TIMESTAMP_FORMAT, "%Y%m%d-%H%M%S")
+
+# Pages copied per step (1 MB with 4 KB pages). The GIL is released while
+# a step runs, so the Tk thread never waits on a backup for more than one
+# step; STEP_SLEEP is the pause in seconds before retrying a busy source.
+STEP_PAGES = 256
+STEP_SLEEP = 0.01
+
+# Backups kept after each run: the newest ``last`` ones, plus the newest of
+# each of the last ``daily`` days and ``weekly`` ISO weeks that have one
+DEFAULT_RETENTION = {"last": 5, "daily": 7, "weekly": 4}
+
+# Minutes between the app's scheduled backups
+DEFAULT_INTERVAL = 60
+
+
+class BackupCancelled(Exception):
+    pass
+
+
+def backup_prefix(path):
+    """File name prefix of the backups of ``path`` ("finance.db" -> "finance-")"""
+    return os.path.splitext(os.path.basename(path))[0] + "-"
+
+
+def parse_timestamp(text):
+    """When a backup named with ``text`` was taken, or None if it is not a timestamp"""
+    for timestamp_format in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(text, timestamp_format)
+        except ValueError:
+            pass
+    return None
+
+
+def list_backups(path, directory=BACKUP_DIR):
+    """Return [(taken at, backup path)] of ``path``'s backups, newest first"""
+    prefix = backup_prefix(path)
+    if not os.path.isdir(directory):
+        return []
+
+    backups = []
+    for name in os.listdir(directory):
+        if not (name.startswith(prefix) and name.endswith(".db")):
+            continue
+        taken = parse_timestamp(name[len(prefix):-3])
+        if taken is not None:
+            backups.append((taken, os.path.join(directory, name)))
+    backups.sort(reverse=True)
+    return backups
+
+
+def expired_backups(backups, retention=DEFAULT_RETENTION):
+    """Backup paths that ``retention`` no longer keeps (``backups`` newest first)"""
+    keep = {backup for _, backup in backups[:retention["last"]]}
+
+    for period, key in (("daily", lambda t: t.date()), ("weekly", lambda t: t.isocalendar()[:2])):
+        seen = set()
+        for taken, backup in backups:
+            if len(seen) == retention[period]:
+                break
+            if key(taken) not in seen:
+                seen.add(key(taken))
+                keep.add(backup)
+
+    return [backup for _, backup in backups if backup not in keep]
+
+
+def prune_backups(path, directory=BACKUP_DIR, retention=DEFAULT_RETENTION):
+    """Delete expired backups and unfinished ones; returns the deleted paths"""
+    removed = expired_backups(list_backups(path, directory), retention)
+    if os.path.isdir(directory):
+        prefix = backup_prefix(path)
+        removed += [
+            os.path.join(directory, name)
+            for name in os.listdir(directory)
+            if name.startswith(prefix) and name.endswith(".partial")
+        ]
+    for backup in removed:
+        os.remove(backup)
+    return removed
+
+
+def needs_backup(path, directory=BACKUP_DIR):
+    """False when neither the database nor its WAL changed since the newest
+    backup's snapshot was taken.
+
+    The time in a backup's name is read just before its snapshot starts,
+    so a commit made while the copy runs still counts as a change.
+    """
+    backups = list_backups(path, directory)
+    if not backups:
+        return True
+    taken = backups[0][0].timestamp()
+    wal = path + "-wal"
+    changed = max(os.path.getmtime(path), os.path.getmtime(wal) if os.path.exists(wal) else 0)
+    return changed >= taken
+
+
+def uses_wal(path):
+    """Whether the database at ``path`` is in WAL mode, which background
+    backups need so the app can keep committing while they run"""
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+    finally:
+        conn.close()
+
+
+def create_backup(
+    path=DEFAULT_PATH,
+    directory=BACKUP_DIR,
+    pages=STEP_PAGES,
+    sleep=STEP_SLEEP,
+    progress=None,
+    cancel=None,
+):
+    """Copy the live database at ``path`` into ``directory`` while it is in use.
+
+    Uses SQLite's online backup API, ``pages`` pages per step. The copy
+    reads from one snapshot held open for the whole backup, so the app's
+    commits never restart it. In WAL mode that snapshot does not block
+    writers; with a rollback journal (the "durable" profile) commits wait
+    for the whole backup and fail with "database is locked" once it takes
+    longer than their busy timeout, so such databases are only backed up
+    with the app closed (see ``uses_wal``). The copy is written to a
+    ``.partial`` file and renamed when complete.
+    ``progress(remaining, total)`` is called after each step and setting
+    the ``cancel`` event stops the backup. Returns the backup's path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    name = backup_prefix(path) + datetime.now().strftime(TIMESTAMP_FORMAT) + ".db"
+    target_path = os.path.join(directory, name)
+    partial_path = target_path + ".partial"
+
+    source = sqlite3.connect(path)
+    target = sqlite3.connect(partial_path)
+    try:
+        # Without an open read transaction every step takes a new snapshot
+        # and any commit from another connection restarts the backup
+        source.execute("BEGIN")
+        source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+
+        def on_step(status, remaining, total):
+            if cancel is not None and cancel.is_set():
+                raise BackupCancelled()
+            if progress:
+                progress(remaining, total)
+
+        with metrics.timer("backup"):
+            source.backup(target, pages=pages, progress=on_step, sleep=sleep)
+    except BaseException:
+        target.close()
+        os.remove(partial_path)
+        raise
+    finally:
+        source.close()
+
+    target.close()
+    os.replace(partial_path, target_path)
+    return target_path
+
+
+def restore_backup(backup, path=DEFAULT_PATH, directory=BACKUP_DIR):
+    """Replace the database at ``path`` with ``backup``.
+
+    The current database is backed up first. Run it with the app closed.
+    Returns the path of that safety backup, or None if there was no database.
+    """
+    source = sqlite3.connect(backup)
+    try:
+        check = source.execute("PRAGMA quick_check").fetchone()[0]
+        if check != "ok":
+            raise ValueError(f"{backup} is damaged: {check}")
+
+        safety = create_backup(path, directory, pages=-1) if os.path.exists(path) else None
+        target = sqlite3.connect(path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+    finally:
+        source.close()
+    return safety
+
+
+class BackupScheduler:
+    """Takes a hot backup of the app's database every ``interval`` minutes.
+
+    Backups run on their own thread with their own connection; the Tk
+    thread only checks every ``check_interval`` ms whether the running one
+    has finished. A run is skipped when the database has not changed since
+    the newest backup, and expired backups are pruned after each run. The
+    database must be in WAL mode (``uses_wal``).
+    ``on_error(error)`` is called on the Tk thread if a backup fails.
+    """
+
+    def __init__(
+        self,
+        root,
+        path=DEFAULT_PATH,
+        directory=BACKUP_DIR,
+        interval=DEFAULT_INTERVAL,
+        retention=DEFAULT_RETENTION,
+        on_error=None,
+        check_interval=1000,
+    ):
+        self.root = root
+        self.path = path
+        self.directory = directory
+        self.interval = interval * 60_000
+        self.retention = retention
+        self.on_error = on_error
+        self.check_interval = check_interval
+
+        self.thread = None
+        self.error = None
+        self.closed = False
+        self.cancel = threading.Event()
+        self.after_id = self.root.after(self.interval, self.start)
+
+    def start(self):
+        self.error = None
+        self.thread = threading.Thread(target=self.run, name="coiner-backup", daemon=True)
+        self.thread.start()
+        self.after_id = self.root.after(self.check_interval, self.check)
+
+    def run(self):
+        try:
+            if needs_backup(self.path, self.directory):
+                create_backup(self.path, self.directory, cancel=self.cancel)
+                prune_backups(self.path, self.directory, self.retention)
+                metrics.count("backups")
+            else:
+                metrics.count("backups skipped")
+        except BackupCancelled:
+            pass
+        except Exception as error:
+            self.error = error
+
+    def check(self):
+        if self.thread.is_alive():
+            self.after_id = self.root.after(self.check_interval, self.check)
+            return
+        if self.error is not None and self.on_error:
+            self.on_error(self.error)
+        self.after_id = self.root.after(self.interval, self.start)
+
+    def close(self):
+        """Stop scheduling and cancel a backup in progress"""
+        if self.closed:
+            return
+        self.closed = True
+        self.root.after_cancel(self.after_id)
+        self.cancel.set()
+        if self.thread is not None:
+            self.thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot backups of the Coiner database")
+    parser.add_argument("command", choices=["create", "list", "prune", "restore"])
+    parser.add_argument("backup", nargs="?", help="restore: backup file to restore")
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    parser.add_argument("--dir", default=BACKUP_DIR, help="backup directory")
+    parser.add_argument("--keep-last", type=int, default=DEFAULT_RETENTION["last"])
+    parser.add_argument("--keep-daily", type=int, default=DEFAULT_RETENTION["daily"])
+    parser.add_argument("--keep-weekly", type=int, default=DEFAULT_RETENTION["weekly"])
+    args = parser.parse_args()
+    retention = {"last": args.keep_last, "daily": args.keep_daily, "weekly": args.keep_weekly}
+
+    if args.command == "create":
+        start = time.perf_counter()
+        backup = create_backup(
+            args.db,
+            args.dir,
+            progress=lambda remaining, total: print(f"💾 {total - remaining:,}/{total:,} pages", end="\r"),
+        )
+        removed = prune_backups(args.db, args.dir, retention)
+        print(f"\n✅ {backup} in {time.perf_counter() - start:.1f} s ({len(removed)} old backups removed)")
+    elif args.command == "list":
+        backups = list_backups(args.db, args.dir)
+        expired = set(expired_backups(backups, retention))
+        for taken, backup in backups:
+            size = os.path.getsize(backup) / 1024 / 1024
+            print(f"{taken:%Y-%m-%d %H:%M:%S}  {size:8.1f} MB  {backup}{'  (expired)' if backup in expired else ''}")
+    elif args.command == "prune":
+        for backup in prune_backups(args.db, args.dir, retention):
+            print(f"🗑️  {backup}")
+    else:
+        if args.backup is None:
+            parser.error("restore needs the backup file")
+        safety = restore_backup(args.backup, args.db, args.dir)
+        if safety:
+            print(f"💾 Previous database saved as {safety}")
+        print(f"✅ {args.db} restored from {args.backup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,740 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import resource
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import datetime
+
+from autocomplete import Suggestions
+from backup import create_backup
+from import_xlsx import import_workbook
+from ledger import TRANSACTION_TYPES, Ledger, MonthSummary
+from migrate_database import DEFAULT_CATEGORIES, SCHEMA_VERSION, upgrade_database
+from money import MINOR_UNITS
+from storage import DEFAULT_PROFILE, STORAGE_PROFILES, connect
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000, 5_000_000]
+SUITE_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+SUITE_OPERATIONS = [
+    "cold_start",
+    "load_data",
+    "first_paint",
+    "add_transaction",
+    "delete_transaction",
+    "navigation",
+]
+
+# A synthetic month has few incomes and many small expenses
+TYPE_WEIGHTS = [1, 2, 4, 5, 8]
+
+# Amount range in pesos for each type
+AMOUNT_RANGES = {
+    "income_fixed": (500_000, 8_000_000),
+    "income_variable": (50_000, 3_000_000),
+    "expense_indispensable": (20_000, 2_000_000),
+    "expense_necesarios": (5_000, 300_000),
+    "expense_innecesarios": (2_000, 150_000),
+}
+
+# Runs in a fresh interpreter: imports, opening the ledger and the first month
+COLD_START_SCRIPT = """
+from ledger import Ledger, MonthSummary
+ledger = Ledger({path!r}, {profile!r})
+view = ledger.read_month({year}, {month}, {page_size})
+MonthSummary.from_aggregates(view.aggregate_rows)
+ledger.close()
+"""
+
+
+def month_of(index):
+    """Map a sequential month index to (month, year), starting January 2000"""
+    return index % 12 + 1, 2000 + index // 12
+
+
+def synthetic_row(month, year, rng):
+    """One transaction drawn from the app's own type and category vocabularies"""
+    transaction_type = rng.choices(TRANSACTION_TYPES, TYPE_WEIGHTS)[0]
+    category = rng.choice(DEFAULT_CATEGORIES[transaction_type])
+    low, high = AMOUNT_RANGES[transaction_type]
+    return (
+        transaction_type,
+        rng.randint(low, high) * MINOR_UNITS,
+        f"{category} {rng.randint(1, 30)}",
+        category,
+        month,
+        year,
+        f"{year:04d}-{month:02d}-{rng.randint(1, 28):02d} "
+        f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+    )
+
+
+def generate_rows(start, count, rows_per_month, rng):
+    """Yield synthetic transactions, filling one month before the next"""
+    for n in range(start, start + count):
+        month, year = month_of(n // rows_per_month)
+        yield synthetic_row(month, year, rng)
+
+
+def generate_ledger(count, months, rng):
+    """Yield synthetic transactions spread over ``months`` months.
+
+    Rows only depend on the seed of ``rng`` and their position, so a
+    ledger grown in several steps matches one generated in a single pass.
+    """
+    for _ in range(count):
+        month, year = month_of(rng.randrange(months))
+        yield synthetic_row(month, year, rng)
+
+
+def time_month_switches(ledger, total_months, samples, page_size, rng):
+    """Time a month switch (totals plus the first page of every list) in ms"""
+    durations = []
+    for _ in range(samples):
+        month, year = month_of(rng.randrange(total_months))
+        start = time.perf_counter()
+        ledger.month_aggregates(year, month)
+        for transaction_type in TRANSACTION_TYPES:
+            ledger.month_page(year, month, transaction_type, 0, page_size)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def run(sizes, rows_per_month, samples, page_size, with_index, seed):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = Ledger(os.path.join(tmp, "bench.db"))
+        if not with_index:
+            ledger.conn.execute("DROP INDEX idx_transactions_month")
+
+        print(f"{'rows':>10} {'median ms':>10} {'p95 ms':>10}")
+        inserted = 0
+        for size in sorted(sizes):
+            rows = generate_rows(inserted, size - inserted, rows_per_month, rng)
+            while ledger.add_many(itertools.islice(rows, 100_000)):
+                pass
+            inserted = size
+
+            total_months = max(1, size // rows_per_month)
+            durations = time_month_switches(ledger, total_months, samples, page_size, rng)
+            p95 = statistics.quantiles(durations, n=20)[-1]
+            print(f"{size:>10,} {statistics.median(durations):>10.3f} {p95:>10.3f}")
+
+        ledger.close()
+
+
+def percentiles(durations):
+    """p50/p95/p99 and mean of a list of durations in ms"""
+    cuts = statistics.quantiles(durations, n=100, method="inclusive")
+    return {
+        "p50": cuts[49],
+        "p95": cuts[94],
+        "p99": cuts[98],
+        "mean": statistics.fmean(durations),
+        "samples": len(durations),
+    }
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def show(ledger, year, month, page_size):
+    """What load_data does on a cache miss: read the month and summarize it"""
+    view = ledger.read_month(year, month, page_size)
+    return MonthSummary.from_aggregates(view.aggregate_rows)
+
+
+def first_paint(ledger, year, month, page_size):
+    """What a streamed month load waits for before the first repaint: the totals"""
+    stream = ledger.stream_month(year, month, page_size)
+    _, aggregate_rows = next(stream)
+    stream.close()
+    return MonthSummary.from_aggregates(aggregate_rows)
+
+
+def time_cold_start(path, profile, months, samples, page_size, rng):
+    """Wall time of a fresh interpreter opening the ledger and its first month"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    durations = []
+    for _ in range(samples):
+        month, year = month_of(rng.randrange(months))
+        script = COLD_START_SCRIPT.format(
+            path=path, profile=profile, year=year, month=month, page_size=page_size
+        )
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", script], cwd=here, check=True)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def time_operations(ledger, months, samples, page_size, rng):
+    """Time the app's month and write operations, as its database worker runs them"""
+    durations = {operation: [] for operation in SUITE_OPERATIONS[1:]}
+    for _ in range(samples):
+        index = rng.randrange(months)
+        month, year = month_of(index)
+        durations["load_data"].append(timed(show, ledger, year, month, page_size))
+        durations["first_paint"].append(timed(first_paint, ledger, year, month, page_size))
+
+        # Writes return what the app needs to patch the screen in place:
+        # the row position and the stored totals for the consistency check
+        row = synthetic_row(month, year, rng)
+        start = time.perf_counter()
+        transaction_id = ledger.add(*row)
+        ledger.position(transaction_id)
+        ledger.type_aggregate(year, month, row[0])
+        durations["add_transaction"].append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        ledger.delete(transaction_id)
+        ledger.type_aggregate(year, month, row[0])
+        durations["delete_transaction"].append((time.perf_counter() - start) * 1000)
+
+        # "›": the following month, not yet cached
+        month, year = month_of((index + 1) % months)
+        durations["navigation"].append(timed(show, ledger, year, month, page_size))
+    return durations
+
+
+def run_suite(sizes, months, samples, cold_samples, page_size, seed, output, compare, profile=DEFAULT_PROFILE):
+    """Grow a synthetic ledger through ``sizes`` and time every operation at each size"""
+    data_rng = random.Random(seed)
+    results = {}
+
+    # The temporary directory sits next to this script rather than in /tmp,
+    # which is often a tmpfs where fsync costs nothing and profiles look alike
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory(dir=here) as tmp:
+        path = os.path.join(tmp, "bench.db")
+        ledger = Ledger(path, profile)
+        inserted = 0
+
+        print(f"\n🗄️  Profile: {profile}")
+        print(f"{'rows':>10} {'operation':<20} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for size in sorted(sizes):
+            start = time.perf_counter()
+            rows = generate_ledger(size - inserted, months, data_rng)
+            while ledger.add_many(itertools.islice(rows, 100_000)):
+                pass
+            build_seconds = time.perf_counter() - start
+            inserted = size
+
+            # Each size samples the same months, whatever sizes ran before it
+            sample_rng = random.Random(seed + 1)
+            timings = {
+                "cold_start": time_cold_start(path, profile, months, cold_samples, page_size, sample_rng)
+            }
+            timings.update(time_operations(ledger, months, samples, page_size, sample_rng))
+
+            results[str(size)] = {"rows": size, "build_seconds": build_seconds}
+            for operation in SUITE_OPERATIONS:
+                stats = percentiles(timings[operation])
+                results[str(size)][operation] = stats
+                print(
+                    f"{size:>10,} {operation:<20} {stats['p50']:>9.3f} "
+                    f"{stats['p95']:>9.3f} {stats['p99']:>9.3f}"
+                )
+
+        ledger.close()
+
+    report = {
+        "commit": git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "profile": profile,
+        "seed": seed,
+        "months": months,
+        "samples": samples,
+        "cold_samples": cold_samples,
+        "page_size": page_size,
+        "results": results,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+
+    if compare:
+        compare_reports(compare, report)
+
+
+def git_commit():
+    """Short hash of the checked out commit, or None outside a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_reports(baseline_path, report):
+    """Print p50/p95 of ``report`` against a saved baseline"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print(
+        f"\n📊 {baseline.get('commit')} ({baseline.get('profile', DEFAULT_PROFILE)}) -> "
+        f"{report.get('commit')} ({report['profile']})"
+    )
+    print(f"{'rows':>10} {'operation':<20} {'p50 before':>11} {'p50 after':>10} {'p95 ratio':>10}")
+    for size, result in report["results"].items():
+        before = baseline["results"].get(size)
+        if before is None:
+            continue
+        for operation in SUITE_OPERATIONS:
+            if operation not in before:
+                continue
+            ratio = result[operation]["p95"] / before[operation]["p95"]
+            print(
+                f"{result['rows']:>10,} {operation:<20} {before[operation]['p50']:>11.3f} "
+                f"{result[operation]['p50']:>10.3f} {ratio:>9.2f}x"
+            )
+
+
+def write_workbook(path, rows, rng):
+    """Write a HolaMundo.xlsx style workbook with ``rows`` data rows.
+
+    Every data row fills all five sections, like a busy month would.
+    """
+    sections = ["FIJOS", "VARIABLES", "INDISPENSABLES", "NECESARIOS", "INNECESARIOS"]
+    strings = ["Septiembre", "Subtotal", *sections] + [f"Concepto {n}" for n in range(1000)]
+    ns = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    rel_ns = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            "xl/workbook.xml",
+            f'<workbook xmlns="{ns}" xmlns:r="{rel_ns}"><sheets>'
+            f'<sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        )
+        archive.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{rel_ns}/worksheet" Target="worksheets/sheet1.xml"/>'
+            "</Relationships>",
+        )
+        archive.writestr(
+            "xl/sharedStrings.xml",
+            f'<sst xmlns="{ns}">' + "".join(f"<si><t>{text}</t></si>" for text in strings) + "</sst>",
+        )
+
+        with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            columns = ["B", "D", "G", "I", "K"]
+            values = ["C", "E", "H", "J", "L"]
+            sheet.write(f'<worksheet xmlns="{ns}"><sheetData>'.encode())
+            sheet.write(b'<row r="1"><c r="A1" t="s"><v>0</v></c></row><row r="3">')
+            for index, column in enumerate(columns):
+                sheet.write(f'<c r="{column}3" t="s"><v>{index + 2}</v></c>'.encode())
+            sheet.write(b"</row>")
+
+            for r in range(4, rows + 4):
+                cells = "".join(
+                    f'<c r="{column}{r}" t="s"><v>{rng.randrange(7, len(strings))}</v></c>'
+                    f'<c r="{value}{r}"><v>{rng.randint(1_000, 2_000_000)}</v></c>'
+                    for column, value in zip(columns, values)
+                )
+                sheet.write(f'<row r="{r}">{cells}</row>'.encode())
+
+            r = rows + 4
+            cells = "".join(f'<c r="{column}{r}" t="s"><v>1</v></c>' for column in columns)
+            sheet.write(f'<row r="{r}">{cells}</row></sheetData></worksheet>'.encode())
+
+
+def run_import(rows, batch_size, seed):
+    """Time import_workbook on a synthetic workbook with ``rows`` data rows"""
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        workbook = os.path.join(tmp, "bench.xlsx")
+        write_workbook(workbook, rows, rng)
+
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        upgrade_database(conn)
+
+        start = time.perf_counter()
+        imported = import_workbook(conn, workbook, year=2025, mode="append", batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        conn.close()
+
+    print(f"{rows:,} spreadsheet rows -> {imported:,} transactions in {elapsed:.1f} s")
+    print(f"peak RSS {peak_kb / 1024:.0f} MB")
+
+
+# Schema of the databases written before integer amounts
+LEGACY_TABLE_SQL = """
+    CREATE TABLE transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        type TEXT NOT NULL,
+        amount REAL NOT NULL,
+        description TEXT NOT NULL,
+        category TEXT NOT NULL,
+        month INTEGER NOT NULL,
+        year INTEGER NOT NULL,
+        date TEXT NOT NULL
+    )
+"""
+
+
+def run_migrate(rows, months, batch_size, seed, profile):
+    """Time upgrading a legacy (REAL amounts, unversioned) ledger of ``rows`` rows"""
+    rng = random.Random(seed)
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory(dir=here) as tmp:
+        path = os.path.join(tmp, "bench.db")
+        conn = connect(path, profile)
+        conn.execute(LEGACY_TABLE_SQL)
+        legacy_rows = (
+            (kind, amount / MINOR_UNITS, description, category, month, year, date)
+            for kind, amount, description, category, month, year, date in generate_ledger(rows, months, rng)
+        )
+        while True:
+            batch = list(itertools.islice(legacy_rows, 100_000))
+            if not batch:
+                break
+            conn.executemany(
+                "INSERT INTO transactions (type, amount, description, category, month, year, date) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+        conn.commit()
+
+        steps = {}
+
+        def progress(version, description, done, total):
+            if done is None:
+                steps[version] = (description, time.perf_counter())
+
+        start = time.perf_counter()
+        upgrade_database(conn, batch_size, progress)
+        elapsed = time.perf_counter() - start
+        ends = [started for _, started in list(steps.values())[1:]] + [start + elapsed]
+
+        start = time.perf_counter()
+        upgrade_database(conn)
+        noop = (time.perf_counter() - start) * 1000
+        conn.close()
+
+    print(f"{rows:,} legacy rows -> schema v{SCHEMA_VERSION} in {elapsed:.2f} s ({profile})")
+    for (version, (description, started)), ended in zip(steps.items(), ends):
+        print(f"  v{version} {description:<22} {ended - started:8.2f} s")
+    print(f"already current: {noop:.3f} ms")
+
+
+def run_backup(rows, months, seed, profile):
+    """Time a hot backup of a ``rows`` ledger while another thread keeps writing.
+
+    A third thread stands in for the Tk loop: it wakes every millisecond
+    and records how late it was, which is how long a backup step kept it
+    from running.
+    """
+    rng = random.Random(seed)
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory(dir=here) as tmp:
+        path = os.path.join(tmp, "bench.db")
+        ledger = Ledger(path, profile)
+        generated = generate_ledger(rows, months, rng)
+        while ledger.add_many(itertools.islice(generated, 100_000)):
+            pass
+        ledger.close()
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        stop = threading.Event()
+        writes = []
+        late = []
+
+        def writer():
+            with Ledger(path, profile, upgrade=False) as ledger:
+                while not stop.is_set():
+                    ledger.add(*synthetic_row(1, 2000, rng))
+                    writes.append(1)
+                    time.sleep(0.01)
+
+        def ticker():
+            while not stop.is_set():
+                start = time.perf_counter()
+                time.sleep(0.001)
+                late.append((time.perf_counter() - start) * 1000 - 1)
+
+        steps = []
+        last = [time.perf_counter()]
+
+        def progress(remaining, total):
+            now = time.perf_counter()
+            steps.append((now - last[0]) * 1000)
+            last[0] = now
+
+        threads = [threading.Thread(target=writer), threading.Thread(target=ticker)]
+        for thread in threads:
+            thread.start()
+        start = time.perf_counter()
+        create_backup(path, os.path.join(tmp, "backups"), progress=progress)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    print(f"{rows:,} rows ({size_mb:.0f} MB) backed up in {elapsed:.2f} s, {len(steps)} steps, "
+          f"{len(writes)} concurrent commits ({profile})")
+    print(f"step          p50 {statistics.median(steps):6.2f} ms   max {max(steps):6.2f} ms")
+    print(f"ticker delay  p99 {percentiles(late)['p99']:6.2f} ms   max {max(late):6.2f} ms")
+
+
+def run_autocomplete(rows, months, samples, seed):
+    """Time building the autocomplete index of a ``rows`` ledger and querying it.
+
+    Every transaction gets its own description, so the index holds about
+    ``rows`` distinct descriptions. Suggestions are timed with an empty
+    result cache, for prefixes of 1 to 8 characters of real descriptions.
+    """
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = Ledger(os.path.join(tmp, "bench.db"))
+        generated = (
+            (kind, amount, f"{category} {n:x}", category, month, year, date)
+            for n, (kind, amount, _, category, month, year, date) in enumerate(
+                generate_ledger(rows, months, rng)
+            )
+        )
+        while ledger.add_many(itertools.islice(generated, 100_000)):
+            pass
+
+        start = time.perf_counter()
+        suggestions = Suggestions.from_ledger(ledger)
+        build = time.perf_counter() - start
+        ledger.close()
+
+    indexes = suggestions.description_indexes
+    distinct = sum(len(index) for index in indexes.values())
+    cold = []
+    for _ in range(samples):
+        index = indexes[rng.choice(TRANSACTION_TYPES)]
+        prefix = rng.choice(index.keys)[: rng.randint(1, 8)]
+        index.cache.clear()
+        start = time.perf_counter()
+        index.suggest(prefix)
+        cold.append((time.perf_counter() - start) * 1000)
+
+    adds = []
+    for n in range(samples):
+        start = time.perf_counter()
+        suggestions.add(rng.choice(TRANSACTION_TYPES), f"Nueva {n}", "Otro", "2030-01-01 12:00:00")
+        adds.append((time.perf_counter() - start) * 1000)
+
+    print(f"{rows:,} rows, {distinct:,} distinct descriptions: index built in {build:.2f} s")
+    for name, durations in (("suggest", cold), ("add", adds)):
+        stats = percentiles(durations)
+        print(f"{name:<8} p50 {stats['p50']:6.3f} ms   p99 {stats['p99']:6.3f} ms   max {max(durations):6.3f} ms")
+
+
+# Builds the FinanceApp of whatever checkout is first on sys.path and times
+# its window and button hovers. Older versions take no database path and
+# open finance.db in the working directory, and drew each rounded shape as
+# several canvas items (button_elements) instead of one (shape_id).
+WIDGETS_SCRIPT = """
+import inspect, json, statistics, time
+import tkinter as tk
+from main import FinanceApp
+
+def iter_widgets(widget):
+    yield widget
+    for child in widget.winfo_children():
+        yield from iter_widgets(child)
+
+root = tk.Tk()
+start = time.perf_counter()
+if len(inspect.signature(FinanceApp).parameters) > 1:
+    app = FinanceApp(root, "bench.db")
+else:
+    app = FinanceApp(root)
+root.update_idletasks()
+construction = (time.perf_counter() - start) * 1000
+
+canvases = [w for w in iter_widgets(root) if isinstance(w, tk.Canvas)]
+buttons = [w for w in canvases if hasattr(w, "shape_id") or hasattr(w, "button_elements")]
+items = sum(len(canvas.find_all()) for canvas in canvases)
+
+hovers = []
+for _ in range({samples}):
+    for button in buttons:
+        start = time.perf_counter()
+        app.on_button_hover_enter(button)
+        button.update_idletasks()
+        app.on_button_hover_leave(button)
+        button.update_idletasks()
+        hovers.append((time.perf_counter() - start) * 1_000_000)
+
+app.db.close()
+root.destroy()
+print(json.dumps(dict(
+    construction=construction,
+    canvases=len(canvases),
+    items=items,
+    hover_p50=statistics.median(hovers),
+    hover_p95=statistics.quantiles(hovers, n=20)[-1],
+)))
+"""
+
+
+def run_widgets(samples, source=None):
+    """Time building the whole FinanceApp window and hovering its rounded buttons.
+
+    Needs a display. Runs in a fresh interpreter against an empty database
+    in a temporary directory. ``source`` is another checkout of Coiner
+    (e.g. a ``git worktree`` of an older commit) to measure instead of this
+    one, for before/after numbers.
+    """
+    source = os.path.abspath(source or os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as tmp:
+        result = subprocess.run(
+            [sys.executable, "-c", WIDGETS_SCRIPT.format(samples=samples)],
+            cwd=tmp,
+            env=dict(os.environ, PYTHONPATH=source),
+            capture_output=True,
+            text=True,
+        )
+    if result.returncode:
+        sys.exit(f"widgets benchmark failed (it needs a display):\n{result.stderr.strip()}")
+    numbers = json.loads(result.stdout.splitlines()[-1])
+
+    print(f"FinanceApp of {source}")
+    print(f"window construction      {numbers['construction']:8.1f} ms")
+    print(f"canvases / canvas items  {numbers['canvases']:8} / {numbers['items']}")
+    print(f"hover enter+leave p50    {numbers['hover_p50']:8.1f} µs")
+    print(f"hover enter+leave p95    {numbers['hover_p95']:8.1f} µs")
+
+
+def run_charts(months, samples, seed):
+    """Time redrawing the trend chart for ``months`` months of history: new
+    data (recomputing the series) and resizes (moving the lines only).
+
+    Needs a display.
+    """
+    import tkinter as tk
+
+    from chart_panel import TrendChart, trend_series
+    from reports import RangeSums
+
+    rng = random.Random(seed)
+    rows = [
+        (
+            (2000 + index // 12, index % 12 + 1),
+            MonthSummary.from_aggregates(
+                [(name, rng.randint(0, 5_000_000) * MINOR_UNITS, 1) for name in TRANSACTION_TYPES]
+            ),
+        )
+        for index in range(months)
+    ]
+    sums = RangeSums(rows)
+
+    root = tk.Tk()
+    root.geometry("900x400")
+    canvas = tk.Canvas(root, highlightthickness=0, bd=0)
+    canvas.pack(fill="both", expand=True)
+    chart = TrendChart(canvas)
+    root.update()
+
+    data_times = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        chart.set_data(*trend_series(sums))
+        chart.draw()
+        root.update_idletasks()
+        data_times.append((time.perf_counter() - start) * 1000)
+
+    resize_times = []
+    for sample in range(samples):
+        root.geometry(f"{600 + sample % 600}x400")
+        root.update()
+        start = time.perf_counter()
+        chart.draw()
+        root.update_idletasks()
+        resize_times.append((time.perf_counter() - start) * 1000)
+    root.destroy()
+
+    for name, times in (("new data", data_times), ("resize", resize_times)):
+        print(
+            f"{name:<10} p50 {statistics.median(times):6.2f} ms   "
+            f"p95 {statistics.quantiles(times, n=20)[-1]:6.2f} ms   max {max(times):6.2f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coiner benchmarks")
+    parser.add_argument(
+        "benchmark", nargs="?", choices=["month-switch", "import", "suite", "migrate", "backup", "widgets", "autocomplete", "charts"], default="month-switch"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=None)
+    parser.add_argument("--rows-per-month", type=int, default=100)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--no-index", action="store_true", help="baseline without idx_transactions_month")
+    parser.add_argument("--import-rows", type=int, default=1_000_000, help="import/migrate/backup/autocomplete: rows")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="import/migrate: rows per transaction")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--months", type=int, default=120, help="suite/charts: months the ledger spans")
+    parser.add_argument("--cold-samples", type=int, default=20, help="suite: fresh processes per size")
+    parser.add_argument("--output", default="benchmark_results.json", help="suite: JSON results file")
+    parser.add_argument("--compare", default=None, help="suite: earlier JSON results to compare with")
+    parser.add_argument("--source", default=None, help="widgets: another checkout whose window to measure")
+    parser.add_argument(
+        "--profile",
+        choices=sorted(STORAGE_PROFILES),
+        default=DEFAULT_PROFILE,
+        help="suite/migrate/backup: storage profile of the benchmark ledger",
+    )
+    args = parser.parse_args()
+
+    if args.benchmark == "import":
+        run_import(args.import_rows, args.batch_size, args.seed)
+    elif args.benchmark == "migrate":
+        run_migrate(args.import_rows, args.months, args.batch_size, args.seed, args.profile)
+    elif args.benchmark == "backup":
+        run_backup(args.import_rows, args.months, args.seed, args.profile)
+    elif args.benchmark == "widgets":
+        run_widgets(args.samples, args.source)
+    elif args.benchmark == "charts":
+        run_charts(args.months, args.samples, args.seed)
+    elif args.benchmark == "autocomplete":
+        run_autocomplete(args.import_rows, args.months, args.samples, args.seed)
+    elif args.benchmark == "suite":
+        run_suite(
+            args.sizes or SUITE_SIZES,
+            args.months,
+            args.samples,
+            args.cold_samples,
+            args.page_size,
+            args.seed,
+            args.output,
+            args.compare,
+            args.profile,
+        )
+    else:
+        run(
+            args.sizes or DEFAULT_SIZES,
+            args.rows_per_month,
+            args.samples,
+            args.page_size,
+            not args.no_index,
+            args.seed,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import tkinter as tk
+
+from instrumentation import metrics
+from ledger import INCOME_PREFIX
+from money import format_amount
+from reports import TYPE_LABELS, report_range
+from shapes import create_rounded_rectangle
+
+# Trend lines: (key, legend, color), colored as in the summary section
+SERIES = [
+    ("income", "Ingresos", "#66BB6A"),
+    ("expenses", "Egresos", "#FF5722"),
+    ("balance", "Balance", "#f3f4f6"),
+]
+
+# Categories shown in the breakdown, largest first
+TOP_CATEGORIES = 8
+
+# Plot margins (px): left leaves room for the amounts of the y axis
+MARGIN_LEFT = 110
+MARGIN_RIGHT = 20
+MARGIN_TOP = 40
+MARGIN_BOTTOM = 30
+
+# Minimum spacing (px) between labels of the x axis
+LABEL_SPACING = 60
+
+
+def minmax_buckets(values, buckets):
+    """Indexes of the points of ``values`` to draw on ``buckets`` pixel
+    columns: all of them if they fit, else the minimum and maximum of each
+    column, in order, so no peak is lost"""
+    count = len(values)
+    if count <= 2 * buckets:
+        return list(range(count))
+    indexes = []
+    for bucket in range(buckets):
+        low = bucket * count // buckets
+        high = (bucket + 1) * count // buckets
+        if low == high:
+            continue
+        smallest = min(range(low, high), key=values.__getitem__)
+        largest = max(range(low, high), key=values.__getitem__)
+        indexes.extend(sorted({smallest, largest}))
+    return indexes
+
+
+def trend_series(sums):
+    """(first month index, {series key: [monthly values]}) of a RangeSums"""
+    series = {key: [] for key, _, _ in SERIES}
+    for index in range(sums.first, sums.first + len(sums)):
+        month = (index // 12, index % 12 + 1)
+        summary = sums.summary(month, month)
+        series["income"].append(summary.total_income)
+        series["expenses"].append(summary.total_expenses)
+        series["balance"].append(summary.balance)
+    return sums.first, series
+
+
+class TrendChart:
+    """Monthly income, expense and balance lines on a Canvas.
+
+    The lines are canvas items kept between redraws: a resize or new data
+    only moves their points (``coords``) instead of rebuilding them, and
+    the points of a long history are downsampled to the plot's width with
+    ``minmax_buckets``. The downsampled indexes are reused while the data
+    and the width stay the same.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.first = 0
+        self.series = {}
+        self.version = 0
+        self.lines = {}
+        self.indexes = {}
+        self.indexes_key = None
+
+    def set_data(self, first, series):
+        self.first = first
+        self.series = series
+        self.version += 1
+
+    def draw(self):
+        canvas = self.canvas
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        canvas.delete("axis")
+        count = len(next(iter(self.series.values()), []))
+        if not count or width <= MARGIN_LEFT + MARGIN_RIGHT or height <= MARGIN_TOP + MARGIN_BOTTOM:
+            for line in self.lines.values():
+                canvas.itemconfigure(line, state="hidden")
+            if not count:
+                canvas.create_text(
+                    width / 2, height / 2, text="Sin transacciones", fill="#9ca3af",
+                    font=("Poppins", 11), tags="axis",
+                )
+            return
+
+        left, top = MARGIN_LEFT, MARGIN_TOP
+        plot_width = width - MARGIN_LEFT - MARGIN_RIGHT
+        plot_height = height - MARGIN_TOP - MARGIN_BOTTOM
+
+        if self.indexes_key != (self.version, plot_width):
+            self.indexes = {key: minmax_buckets(values, plot_width) for key, values in self.series.items()}
+            self.indexes_key = (self.version, plot_width)
+
+        low = min(0, *(min(values) for values in self.series.values()))
+        high = max(0, *(max(values) for values in self.series.values()))
+        if high == low:
+            high = low + 1
+
+        def x(index):
+            return left + plot_width * index / max(count - 1, 1)
+
+        def y(value):
+            return top + plot_height * (high - value) / (high - low)
+
+        self.draw_axes(x, y, low, high, count, left, top, plot_width, plot_height)
+
+        for key, label, color in SERIES:
+            values = self.series[key]
+            points = []
+            for index in self.indexes[key]:
+                points += (x(index), y(values[index]))
+            if len(points) == 2:
+                points *= 2
+            line = self.lines.get(key)
+            if line is None:
+                self.lines[key] = canvas.create_line(*points, fill=color, width=2)
+            else:
+                canvas.coords(line, points)
+                canvas.itemconfigure(line, state="normal")
+
+    def draw_axes(self, x, y, low, high, count, left, top, plot_width, plot_height):
+        """Grid, labels and legend (a few dozen items, rebuilt each time)"""
+        canvas = self.canvas
+        label_options = dict(fill="#9ca3af", font=("Poppins", 8), tags="axis")
+
+        for step in range(5):
+            value = low + (high - low) * step / 4
+            canvas.create_line(left, y(value), left + plot_width, y(value), fill="#3a3a3a", tags="axis")
+            canvas.create_text(left - 8, y(value), text=format_amount(round(value)), anchor="e", **label_options)
+        if low < 0:
+            canvas.create_line(left, y(0), left + plot_width, y(0), fill="#606060", tags="axis")
+
+        # One label per January, or per few years when they would overlap
+        years = count / 12
+        every = max(1, int(years * LABEL_SPACING / plot_width) + 1)
+        for index in range(count):
+            month_index = self.first + index
+            year, month = month_index // 12, month_index % 12 + 1
+            if (month == 1 and year % every == 0) or (count <= 12 and index == 0):
+                canvas.create_text(x(index), top + plot_height + 14, text=str(year), **label_options)
+
+        legend_x = left
+        for _, label, color in SERIES:
+            canvas.create_line(legend_x, 18, legend_x + 18, 18, fill=color, width=3, tags="axis")
+            canvas.create_text(legend_x + 24, 18, text=label, anchor="w", **dict(label_options, fill="white"))
+            legend_x += 110
+
+
+class ChartPanel:
+    """Hidden window with the monthly trends of the whole history and the
+    expense categories of the last 12 months.
+
+    Built the first time it is toggled on. The trends come from the
+    app's RangeSums (``set_sums``); the categories from the database worker.
+    ``refresh`` after the data changes redraws once the event loop is idle,
+    and only while the window is visible.
+    """
+
+    def __init__(self, root, db, current_month, on_error=None):
+        """``current_month()`` returns the (month, year) the app shows"""
+        self.root = root
+        self.db = db
+        self.current_month = current_month
+        self.on_error = on_error
+        self.sums = None
+        self.categories = []
+        self.category_range = None
+        self.window = None
+        self.redraw_id = None
+        self.stale = True
+        self.visible = False
+
+    def toggle(self):
+        if self.window is None:
+            self.build()
+        if self.visible:
+            self.hide()
+        else:
+            self.visible = True
+            self.window.deiconify()
+            self.window.lift()
+            self.refresh()
+
+    def hide(self):
+        self.visible = False
+        self.window.withdraw()
+
+    def set_sums(self, sums):
+        self.sums = sums
+        self.refresh()
+
+    def build(self):
+        window = tk.Toplevel(self.root)
+        window.withdraw()
+        window.title("Coiner - Gráficos")
+        window.geometry("900x640")
+        window.configure(bg="#2c2c2c")
+        window.protocol("WM_DELETE_WINDOW", self.hide)
+        window.bind("<Escape>", lambda e: self.hide())
+
+        canvas_options = dict(bg="#2c2c2c", highlightthickness=0, bd=0)
+        self.trend_canvas = tk.Canvas(window, height=380, **canvas_options)
+        self.trend_canvas.pack(fill="both", expand=True, padx=10, pady=(10, 0))
+        self.category_canvas = tk.Canvas(window, height=240, **canvas_options)
+        self.category_canvas.pack(fill="x", padx=10, pady=10)
+        self.trend_chart = TrendChart(self.trend_canvas)
+
+        # A resize only moves the existing lines
+        self.trend_canvas.bind("<Configure>", lambda e: self.schedule_redraw())
+        self.category_canvas.bind("<Configure>", lambda e: self.schedule_redraw())
+        self.window = window
+
+    def refresh(self):
+        """Take in changed data: trends from the sums, categories from the database"""
+        self.stale = True
+        if not self.visible:
+            return
+        self.load_categories()
+        self.schedule_redraw()
+
+    def load_categories(self):
+        month, year = self.current_month()
+        start, end = report_range("trailing12", year, month)
+
+        def on_loaded(rows):
+            self.category_range = (start, end)
+            self.categories = [row for row in rows if not row[0].startswith(INCOME_PREFIX)]
+            self.schedule_redraw()
+
+        self.db.submit(
+            lambda ledger: ledger.category_totals(start, end),
+            on_loaded,
+            self.on_error,
+            key="chart_categories",
+            label="chart categories",
+        )
+
+    def schedule_redraw(self):
+        """Redraw when idle, once however many changes or resizes came in"""
+        if self.redraw_id is None and self.window is not None:
+            self.redraw_id = self.root.after_idle(self.redraw)
+
+    def redraw(self):
+        self.redraw_id = None
+        if not self.visible:
+            return
+        with metrics.timer("chart redraw"):
+            if self.stale and self.sums is not None:
+                self.trend_chart.set_data(*trend_series(self.sums))
+                self.stale = False
+            self.trend_chart.draw()
+            self.draw_categories()
+
+    def draw_categories(self):
+        canvas = self.category_canvas
+        canvas.delete("all")
+        width = canvas.winfo_width()
+        if self.category_range is None:
+            return
+
+        (start_year, start_month), (end_year, end_month) = self.category_range
+        canvas.create_text(
+            10, 14,
+            text=f"Egresos por categoría {start_month:02d}/{start_year} - {end_month:02d}/{end_year}",
+            anchor="w", fill="white", font=("Poppins", 10, "bold"),
+        )
+        rows = self.categories[:TOP_CATEGORIES]
+        if not rows:
+            return
+
+        largest = max(rows[0][2], 1)
+        bar_left = 180
+        bar_space = max(width - bar_left - 140, 1)
+        for position, (transaction_type, category, total, _) in enumerate(rows):
+            top = 34 + position * 25
+            canvas.create_text(
+                bar_left - 10, top + 9, text=category[:22], anchor="e",
+                fill="#e0e0e0", font=("Poppins", 9),
+            )
+            bar_width = max(bar_space * total / largest, 6)
+            create_rounded_rectangle(
+                canvas, bar_left, top, bar_left + bar_width, top + 18, radius=6, fill="#FF7043"
+            )
+            canvas.create_text(
+                bar_left + bar_width + 8, top + 9,
+                text=f"{format_amount(total)} · {TYPE_LABELS.get(transaction_type, transaction_type)}",
+                anchor="w", fill="#9ca3af", font=("Poppins", 8),
+            )
@@ -0,0 +1,168 @@
+import argparse
+import csv
+import sys
+from datetime import datetime
+
+# Headless modules only: nothing imported here may import tkinter, so the
+# CLI starts fast and runs without a display (cron, pipelines, SSH)
+from ledger import Ledger, MonthSummary, now_text
+from money import format_amount, parse_amount
+from reports import RANGE_KINDS, month_from_text, parse_month, report_lines, report_range
+from storage import DEFAULT_PATH, DEFAULT_PROFILE, STORAGE_PROFILES
+
+# Rows inserted per transaction by ``bulk``
+BATCH_SIZE = 10_000
+
+# Columns of a ``bulk`` CSV row; month and date are optional
+CSV_COLUMNS = ("type", "amount", "description", "category", "month", "date")
+
+
+def this_month():
+    now = datetime.now()
+    return now.year, now.month
+
+
+def parse_row(fields, default_month, date):
+    """(type, amount, description, category, month, year, date) of a CSV row"""
+    fields = [field.strip() for field in fields]
+    if len(fields) < 4:
+        raise ValueError(f"expected at least 4 columns ({', '.join(CSV_COLUMNS)}), got {len(fields)}")
+    transaction_type, amount, description, category = fields[:4]
+    if not description or not category:
+        raise ValueError("description and category cannot be empty")
+    year, month = month_from_text(fields[4]) if len(fields) > 4 and fields[4] else default_month
+    row_date = fields[5] if len(fields) > 5 and fields[5] else date
+    return transaction_type, parse_amount(amount), description, category, month, year, row_date
+
+
+def add(ledger, args):
+    year, month = args.month
+    try:
+        ledger.vocabulary.type_id(args.type)
+        transaction_id = ledger.add(
+            args.type, parse_amount(args.amount), args.description, args.category, month, year, now_text()
+        )
+    except ValueError as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+    print(transaction_id)
+    return 0
+
+
+def bulk(ledger, args):
+    """Insert CSV rows from a file or stdin, ``args.batch_size`` per commit"""
+    source = sys.stdin if args.file == "-" else open(args.file, newline="", encoding="utf-8")
+    date = now_text()
+    inserted = skipped = 0
+    batch = []
+    try:
+        for line_number, fields in enumerate(csv.reader(source), 1):
+            if not fields or fields[0].startswith("#") or (line_number == 1 and fields[0].strip() == "type"):
+                continue
+            try:
+                row = parse_row(fields, args.month, date)
+                ledger.vocabulary.type_id(row[0])
+            except ValueError as error:
+                if not args.skip_invalid:
+                    print(f"❌ line {line_number}: {error} ({inserted:,} rows inserted)", file=sys.stderr)
+                    return 1
+                print(f"⚠️  line {line_number} skipped: {error}", file=sys.stderr)
+                skipped += 1
+                continue
+            batch.append(row)
+            if len(batch) >= args.batch_size:
+                inserted += ledger.add_many(batch)
+                batch = []
+        if batch:
+            inserted += ledger.add_many(batch)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    print(f"✅ {inserted:,} rows inserted" + (f", {skipped:,} skipped" if skipped else ""), file=sys.stderr)
+    return 0
+
+
+def delete(ledger, args):
+    deleted = ledger.delete_many(args.ids)
+    print(f"🗑️  {deleted} of {len(args.ids)} transactions deleted", file=sys.stderr)
+    return 0 if deleted == len(args.ids) else 1
+
+
+def month(ledger, args):
+    """The month's totals as the app shows them, optionally with its lists"""
+    year, month_number = args.month
+    rows = ledger.month_aggregates(year, month_number)
+    summary = MonthSummary.from_aggregates(rows)
+    print(f"📅 {year}-{month_number:02d}")
+    for line in report_lines(summary):
+        print(line)
+
+    if args.rows:
+        for transaction_type, _, count in rows:
+            print(f"\n{transaction_type} ({count})")
+            for row in ledger.month_page(year, month_number, transaction_type, 0, args.rows):
+                print(f"{row.id:>8}  {row.date}  {format_amount(row.amount):>16}  {row.description} ({row.category})")
+    return 0
+
+
+def report(ledger, args):
+    if args.range == "custom":
+        start, end = args.start, args.end or args.start
+    else:
+        start, end = report_range(args.range, *args.start)
+    summary = ledger.summarize_range(start, end)
+    print(f"📊 {start[0]}-{start[1]:02d} .. {end[0]}-{end[1]:02d}")
+    for line in report_lines(summary):
+        print(line)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="coiner", description="Coiner without the window: entry, deletes and reports"
+    )
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    parser.add_argument("--profile", choices=sorted(STORAGE_PROFILES), default=DEFAULT_PROFILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("add", help="add one transaction and print its id")
+    command.add_argument("type", help="income_fixed, expense_necesarios, ...")
+    command.add_argument("amount", help='e.g. 12000 or "1,500.50"')
+    command.add_argument("description")
+    command.add_argument("category")
+    command.add_argument("--month", type=parse_month, default=this_month(), help="YYYY-MM (default: this month)")
+    command.set_defaults(run=add)
+
+    command = commands.add_parser("bulk", help="add CSV rows from a file or stdin")
+    command.add_argument("file", nargs="?", default="-", help=f"CSV with {', '.join(CSV_COLUMNS)} (default: stdin)")
+    command.add_argument("--month", type=parse_month, default=this_month(), help="YYYY-MM of rows without one")
+    command.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per commit")
+    command.add_argument("--skip-invalid", action="store_true", help="warn about bad rows instead of stopping")
+    command.set_defaults(run=bulk)
+
+    command = commands.add_parser("delete", help="delete transactions by id")
+    command.add_argument("ids", type=int, nargs="+")
+    command.set_defaults(run=delete)
+
+    command = commands.add_parser("month", help="totals, allocations and balance of a month")
+    command.add_argument("month", type=parse_month, nargs="?", default=this_month(), help="YYYY-MM")
+    command.add_argument("--rows", type=int, default=0, help="also list up to this many rows per list")
+    command.set_defaults(run=month)
+
+    command = commands.add_parser("report", help="totals, allocations and balance of a range of months")
+    command.add_argument("range", choices=RANGE_KINDS + ("custom",))
+    command.add_argument("start", type=parse_month, help="YYYY-MM: a month of the range (custom: its first)")
+    command.add_argument("end", type=parse_month, nargs="?", help="custom: YYYY-MM of the last month")
+    command.set_defaults(run=report)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    with Ledger(args.db, args.profile) as ledger:
+        return args.run(ledger, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
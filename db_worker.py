@@ -0,0 +1,170 @@
+import queue
+import sqlite3
+import threading
+import traceback
+
+from instrumentation import metrics
+from ledger import Ledger
+from storage import DEFAULT_PATH, DEFAULT_PROFILE
+
+
+class DatabaseWorker:
+    """Runs SQLite work on a dedicated thread with its own Ledger.
+
+    Jobs are callables taking the worker's Ledger. Their results are
+    handed back to the Tk thread by polling a response queue with
+    ``root.after``, so callbacks can touch widgets safely. Jobs submitted
+    with a ``key`` supersede earlier jobs with the same key: stale ones are
+    skipped if they have not started, interrupted if they are running and
+    their results are discarded. A job's ``label`` names the UI action it
+    serves in the metrics (duration, queries and rows per job).
+
+    A job submitted with ``on_chunk`` returns an iterator instead; each
+    item is handed to ``on_chunk`` on the Tk thread as soon as it is
+    produced, then ``callback(None)`` runs when the iterator is exhausted.
+    A superseded stream stops at its next item.
+    """
+
+    def __init__(self, root, path=DEFAULT_PATH, profile=DEFAULT_PROFILE, poll_interval=8):
+        self.root = root
+        self.path = path
+        self.profile = profile
+        self.poll_interval = poll_interval
+
+        self.requests = queue.Queue()
+        self.responses = queue.Queue()
+        self.generations = {}
+        self.running = None
+        self.ledger = None
+        self.conn = None
+        self.closed = False
+        self.startup_error = None
+
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="coiner-db", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.startup_error is not None:
+            raise self.startup_error
+
+        self.poll_id = self.root.after(self.poll_interval, self.poll)
+
+    def submit(self, job, callback=None, error_callback=None, key=None, label=None, on_chunk=None):
+        """Queue ``job(ledger)``; ``callback(result)`` runs on the Tk thread"""
+        generation = None
+        if key is not None:
+            generation = self.generations.get(key, 0) + 1
+            self.generations[key] = generation
+
+            # Abort the superseded job if it is the one running right now
+            running = self.running
+            if running is not None and running[0] == key and running[1] < generation:
+                self.conn.interrupt()
+
+        self.requests.put((job, callback, error_callback, key, generation, label, on_chunk))
+
+    def cancel(self, key):
+        """Drop any queued or running job submitted under ``key``"""
+        if key not in self.generations:
+            return
+        self.generations[key] += 1
+        running = self.running
+        if running is not None and running[0] == key:
+            self.conn.interrupt()
+
+    def is_stale(self, key, generation):
+        return key is not None and self.generations.get(key) != generation
+
+    def run(self):
+        # Opening the ledger creates or upgrades the schema before the UI
+        # issues its first query
+        try:
+            self.ledger = Ledger(self.path, self.profile)
+            self.conn = self.ledger.conn
+        except Exception as error:
+            self.startup_error = error
+            return
+        finally:
+            self.ready.set()
+
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+
+            job, callback, error_callback, key, generation, label, on_chunk = request
+            if self.is_stale(key, generation):
+                metrics.count("stale jobs skipped")
+                continue
+
+            self.running = (key, generation)
+            try:
+                with metrics.timer(f"db job: {label}"), metrics.action(label):
+                    result = self.execute(job, key, generation)
+                    if on_chunk is not None:
+                        for chunk in result:
+                            if self.is_stale(key, generation):
+                                break
+                            self.responses.put((on_chunk, chunk, key, generation, False))
+                        result = None
+            except Exception as error:
+                # Roll back whatever the failed job left open
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+                self.responses.put((error_callback, error, key, generation, True))
+            else:
+                self.responses.put((callback, result, key, generation, False))
+            finally:
+                self.running = None
+
+        self.ledger.close()
+
+    def execute(self, job, key, generation):
+        """Run a job, retrying it if an interrupt meant for a stale job hit it"""
+        while True:
+            try:
+                return job(self.ledger)
+            except sqlite3.OperationalError as error:
+                if str(error) != "interrupted" or self.is_stale(key, generation):
+                    raise
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+
+    def poll(self):
+        """Deliver finished jobs to their callbacks on the Tk thread"""
+        try:
+            while True:
+                try:
+                    callback, value, key, generation, failed = self.responses.get_nowait()
+                except queue.Empty:
+                    break
+
+                # Superseded jobs (including ones interrupted mid-query) are dropped
+                if self.is_stale(key, generation):
+                    continue
+                if failed and callback is None:
+                    print(f"Database error: {value}")
+                elif callback is not None:
+                    self.deliver(callback, value)
+        finally:
+            # A failing callback must not stop the deliveries that follow
+            if not self.closed:
+                self.poll_id = self.root.after(self.poll_interval, self.poll)
+
+    def deliver(self, callback, value):
+        """Run one callback, reporting (not raising) what it raises"""
+        try:
+            callback(value)
+        except Exception:
+            metrics.count("callback errors")
+            print(f"Error in database callback {getattr(callback, '__qualname__', callback)}:")
+            traceback.print_exc()
+
+    def close(self):
+        """Finish queued jobs, then stop the thread and close its connection"""
+        if self.closed:
+            return
+        self.closed = True
+        self.root.after_cancel(self.poll_id)
+        self.requests.put(None)
+        self.thread.join()
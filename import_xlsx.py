@@ -0,0 +1,371 @@
+import argparse
+import csv
+import posixpath
+import re
+import zipfile
+from datetime import datetime
+from xml.etree.ElementTree import iterparse
+from xml.parsers import expat
+
+from ledger import Vocabulary
+from migrate_database import upgrade_database
+from money import to_minor
+from storage import DEFAULT_PATH, DEFAULT_PROFILE, STORAGE_PROFILES, connect
+
+NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Section headers of the HolaMundo.xlsx layout and the type each one feeds.
+# The header cell holds the description column; the amount is next to it.
+SECTION_TYPES = {
+    "FIJOS": "income_fixed",
+    "VARIABLES": "income_variable",
+    "INDISPENSABLES": "expense_indispensable",
+    "NECESARIOS": "expense_necesarios",
+    "INNECESARIOS": "expense_innecesarios",
+}
+
+# A section ends at its "Subtotal" row
+SECTION_END = "Subtotal"
+
+MONTHS = {
+    "enero": 1,
+    "febrero": 2,
+    "marzo": 3,
+    "abril": 4,
+    "mayo": 5,
+    "junio": 6,
+    "julio": 7,
+    "agosto": 8,
+    "septiembre": 9,
+    "octubre": 10,
+    "noviembre": 11,
+    "diciembre": 12,
+}
+
+IMPORT_MODES = ("upsert", "append", "replace")
+
+# The workbook only has descriptions; each row is filed under its own
+# description as category unless it is listed here: (type, description)
+# -> category. These are the categories the user gave HolaMundo.xlsx's rows.
+CATEGORY_OVERRIDES = {
+    ("income_variable", "Retorno Pizza"): "Proyectos",
+    ("income_variable", "Show de magia adelanto"): "Show de magia",
+    ("income_variable", "Show de Magia"): "Show de magia",
+    ("income_variable", "Sr.wok"): "Proyectos",
+    ("expense_innecesarios", "Platziconf"): "Entretenimiento",
+    ("expense_innecesarios", "Desodorante"): "Entretenimiento",
+    ("expense_innecesarios", "Camisa Fisica"): "Entretenimiento",
+    ("expense_innecesarios", "Café Quindio"): "Café",
+}
+
+INSERT_SQL = """
+    INSERT INTO transactions (type_id, amount, description, category_id, month, year, date, import_key)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Re-importing a workbook updates the rows it created earlier instead of
+# duplicating them; the aggregate triggers follow the UPDATE
+UPSERT_SQL = INSERT_SQL + """
+    ON CONFLICT (import_key) WHERE import_key IS NOT NULL DO UPDATE
+    SET type_id = excluded.type_id,
+        amount = excluded.amount,
+        description = excluded.description,
+        category_id = excluded.category_id,
+        month = excluded.month,
+        year = excluded.year,
+        date = excluded.date
+"""
+
+
+def column_index(reference):
+    """Convert a cell reference such as "C4" or "AB12" to a 0-based column"""
+    index = 0
+    for letter in reference:
+        if letter <= "9":
+            break
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+
+def read_shared_strings(archive):
+    """Stream xl/sharedStrings.xml into a list of strings"""
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as stream:
+        for _, element in iterparse(stream):
+            if element.tag == NS + "si":
+                strings.append("".join(t.text or "" for t in element.iter(NS + "t")))
+                element.clear()
+    return strings
+
+
+def list_sheets(archive):
+    """Return [(sheet name, path inside the zip)] in workbook order"""
+    with archive.open("xl/_rels/workbook.xml.rels") as stream:
+        targets = {}
+        for _, element in iterparse(stream):
+            if element.tag == PKG_REL_NS + "Relationship":
+                target = element.get("Target")
+                if not target.startswith("/"):
+                    target = posixpath.normpath(posixpath.join("xl", target))
+                targets[element.get("Id")] = target.lstrip("/")
+
+    sheets = []
+    with archive.open("xl/workbook.xml") as stream:
+        for _, element in iterparse(stream):
+            if element.tag == NS + "sheet":
+                sheets.append((element.get("name"), targets[element.get(REL_NS + "id")]))
+    return sheets
+
+
+def iter_rows(archive, path, shared_strings, chunk_size=1 << 16):
+    """Stream a worksheet as (row number, {column index: value}) pairs.
+
+    The sheet is fed to expat in chunks and rows are handed out as soon as
+    they are complete, so no tree is built and memory does not grow with
+    the size of the sheet.
+    """
+    # Namespace processing is off for speed, so the tags carry whatever
+    # prefix the sheet uses for SpreadsheetML (none in files from Excel)
+    row_tag = cell_tag = value_tag = text_tag = None
+    ready = []
+    row = 0
+    cells = None
+    column = 0
+    cell_type = None
+    text = None
+
+    def start(name, attrs):
+        nonlocal row_tag, cell_tag, value_tag, text_tag, row, cells, column, cell_type, text
+        if row_tag is None:
+            prefix = name[: name.index(":") + 1] if ":" in name else ""
+            row_tag, cell_tag, value_tag, text_tag = (
+                prefix + "row",
+                prefix + "c",
+                prefix + "v",
+                prefix + "t",
+            )
+        if name == cell_tag:
+            column = column_index(attrs["r"])
+            cell_type = attrs.get("t")
+        elif name == value_tag or name == text_tag:
+            text = []
+        elif name == row_tag:
+            row = int(attrs["r"]) if "r" in attrs else row + 1
+            cells = {}
+
+    def end(name):
+        nonlocal text
+        if name == value_tag or (name == text_tag and cell_type == "inlineStr"):
+            value = "".join(text)
+            text = None
+            if cell_type == "s":
+                value = shared_strings[int(value)]
+            elif cell_type not in ("inlineStr", "str", "e", "b", "d"):
+                value = float(value) if "." in value or "E" in value else int(value)
+            cells[column] = value
+        elif name == row_tag:
+            ready.append((row, cells))
+
+    def characters(data):
+        if text is not None:
+            text.append(data)
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = characters
+
+    with archive.open(path) as stream:
+        while True:
+            chunk = stream.read(chunk_size)
+            parser.Parse(chunk, not chunk)
+            yield from ready
+            ready.clear()
+            if not chunk:
+                break
+
+
+def parse_month(*candidates):
+    """Return the first month number named in the candidates, or None"""
+    for candidate in candidates:
+        if isinstance(candidate, str):
+            for word in re.split(r"\W+", candidate.lower()):
+                if word in MONTHS:
+                    return MONTHS[word]
+    return None
+
+
+def read_category_overrides(path):
+    """(type, description) -> category from a CSV with those three columns"""
+    overrides = {}
+    with open(path, newline="", encoding="utf-8") as file:
+        for line_number, fields in enumerate(csv.reader(file), 1):
+            if not fields or fields[0].startswith("#") or (line_number == 1 and fields[0].strip() == "type"):
+                continue
+            if len(fields) != 3:
+                raise ValueError(f"{path}:{line_number}: expected type, description, category")
+            transaction_type, description, category = (field.strip() for field in fields)
+            overrides[transaction_type, description] = category
+    return overrides
+
+
+def iter_sheet_transactions(archive, sheet_name, path, shared_strings):
+    """Yield (type, amount, description, month, row number) for one sheet"""
+    sections = {}  # description column -> transaction type
+    closed = set()
+    month = None
+
+    for row_number, cells in iter_rows(archive, path, shared_strings):
+        if month is None:
+            month = parse_month(*cells.values(), sheet_name)
+
+        if not sections:
+            for column, value in cells.items():
+                if isinstance(value, str) and value.strip().upper() in SECTION_TYPES:
+                    sections[column] = SECTION_TYPES[value.strip().upper()]
+            continue
+
+        for column, transaction_type in sections.items():
+            if column in closed:
+                continue
+            description = cells.get(column)
+            amount = cells.get(column + 1)
+            if isinstance(description, str) and description.strip() == SECTION_END:
+                closed.add(column)
+                continue
+            if not isinstance(amount, (int, float)) or isinstance(description, (int, float)):
+                continue
+            if month is None:
+                raise ValueError(f"Sheet {sheet_name!r} does not name its month")
+
+            description = (description or "").strip() or "Sin descripción"
+            yield transaction_type, to_minor(amount), description, month, row_number
+
+        if len(closed) == len(sections):
+            break
+
+
+def import_workbook(
+    conn,
+    path,
+    year=None,
+    mode="upsert",
+    batch_size=10_000,
+    progress=None,
+    categories=CATEGORY_OVERRIDES,
+):
+    """Stream every sheet of ``path`` into transactions.
+
+    ``mode`` is "upsert" (re-importing updates the same rows), "append"
+    (always insert) or "replace" (delete each imported month first).
+    A row's category is ``categories[type, description]``, or its
+    description when it has none.
+    Rows are written with executemany, one transaction per batch; the
+    categories a batch names for the first time are created just before.
+    Returns the number of rows imported.
+    """
+    if mode not in IMPORT_MODES:
+        raise ValueError(f"Unknown import mode: {mode!r}")
+    year = year or datetime.now().year
+    sql = UPSERT_SQL if mode == "upsert" else INSERT_SQL
+    cursor = conn.cursor()
+    vocabulary = Vocabulary(conn)
+
+    imported = 0
+    batch = []
+    replaced = set()
+
+    def flush():
+        nonlocal imported
+        if batch:
+            ids = vocabulary.ids((row[0], row[3]) for row in batch)
+            cursor.executemany(
+                sql,
+                (
+                    (type_id, row[1], row[2], category_id, *row[4:])
+                    for row, (type_id, category_id) in zip(batch, ids)
+                ),
+            )
+            conn.commit()
+            imported += len(batch)
+            batch.clear()
+            if progress:
+                progress(imported)
+
+    with zipfile.ZipFile(path) as archive:
+        shared_strings = read_shared_strings(archive)
+        for sheet_name, sheet_path in list_sheets(archive):
+            rows = iter_sheet_transactions(archive, sheet_name, sheet_path, shared_strings)
+            for transaction_type, amount, description, month, row_number in rows:
+                if mode == "replace" and month not in replaced:
+                    flush()
+                    cursor.execute(
+                        "DELETE FROM transactions WHERE year = ? AND month = ?",
+                        (year, month),
+                    )
+                    conn.commit()
+                    replaced.add(month)
+
+                batch.append(
+                    (
+                        transaction_type,
+                        amount,
+                        description,
+                        categories.get((transaction_type, description), description),
+                        month,
+                        year,
+                        f"{year:04d}-{month:02d}-15 12:00:00",
+                        # Appended rows are independent copies, never upserted
+                        None
+                        if mode == "append"
+                        else f"xlsx:{year:04d}-{month:02d}:{transaction_type}:{row_number}",
+                    )
+                )
+                if len(batch) >= batch_size:
+                    flush()
+
+    flush()
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a HolaMundo.xlsx style workbook")
+    parser.add_argument("workbook")
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    parser.add_argument("--profile", choices=sorted(STORAGE_PROFILES), default=DEFAULT_PROFILE)
+    parser.add_argument("--year", type=int, default=None, help="year of the sheets (default: current year)")
+    parser.add_argument("--mode", choices=IMPORT_MODES, default="upsert")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument(
+        "--categories",
+        help="CSV of type, description, category for rows not filed under their description",
+    )
+    args = parser.parse_args()
+    categories = dict(CATEGORY_OVERRIDES)
+    if args.categories:
+        categories.update(read_category_overrides(args.categories))
+
+    conn = connect(args.db, args.profile)
+    upgrade_database(conn)
+    imported = import_workbook(
+        conn,
+        args.workbook,
+        args.year,
+        args.mode,
+        args.batch_size,
+        progress=lambda count: print(f"📥 {count:,} rows imported", end="\r"),
+        categories=categories,
+    )
+    conn.close()
+
+    print(f"\n✅ Imported {imported:,} transactions from {args.workbook}")
+
+
+if __name__ == "__main__":
+    main()
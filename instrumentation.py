@@ -0,0 +1,195 @@
+import os
+import threading
+import time
+from collections import deque
+
+# Upper bounds (ms) of the duration histogram buckets; the last one is open
+BUCKET_BOUNDS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Recent samples kept per timer for percentiles
+RECENT_SAMPLES = 512
+
+
+class Histogram:
+    """Count, total, max, bucket counts and recent samples of a value
+    (a duration in ms, or a per-job count such as queries)"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        index = 0
+        while index < len(BUCKET_BOUNDS) and value > BUCKET_BOUNDS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.recent.append(value)
+
+    def percentile(self, fraction):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+            "buckets": dict(zip([str(b) for b in BUCKET_BOUNDS] + ["inf"], self.buckets)),
+        }
+
+
+class NullTimer:
+    """Context manager that does nothing; returned while metrics are disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_TIMER = NullTimer()
+
+
+class Timer:
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.record(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class Action:
+    """Counts the queries and rows of one database job on the current thread"""
+
+    def __init__(self, metrics, label):
+        self.metrics = metrics
+        self.label = label
+
+    def __enter__(self):
+        self.metrics.local.action = self
+        self.queries = 0
+        self.rows = 0
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.local.action = None
+        self.metrics.record(f"queries per {self.label}", self.queries)
+        self.metrics.record(f"rows per {self.label}", self.rows)
+        return False
+
+
+class Metrics:
+    """Process-wide timers, histograms and counters.
+
+    Everything is a no-op while ``enabled`` is False: ``timer`` hands out
+    a shared do-nothing context manager and the other calls return after
+    one attribute check. Safe to use from the Tk and database threads.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.histograms = {}
+        self.counters = {}
+
+    def timer(self, name):
+        """``with metrics.timer("load_data"):`` records the block's duration"""
+        if not self.enabled:
+            return NULL_TIMER
+        return Timer(self, name)
+
+    def start(self):
+        """perf_counter() to hand to ``stop`` later, or None while disabled"""
+        return time.perf_counter() if self.enabled else None
+
+    def stop(self, name, started):
+        """Record the time since ``start`` (for work that ends in a callback)"""
+        if started is not None:
+            self.record(name, (time.perf_counter() - started) * 1000)
+
+    def action(self, label):
+        """Attribute the queries run inside the block to ``label``"""
+        if not self.enabled or label is None:
+            return NULL_TIMER
+        return Action(self, label)
+
+    def record(self, name, value):
+        if not self.enabled:
+            return
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(value)
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def query(self, sql, start, rows):
+        """Record one SQL statement that started at ``start`` (perf_counter)"""
+        self.record("sql: " + " ".join(sql.split())[:80], (time.perf_counter() - start) * 1000)
+        self.count("queries")
+        self.count("rows fetched", rows)
+        action = getattr(self.local, "action", None)
+        if action is not None:
+            action.queries += 1
+            action.rows += rows
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "histograms": {name: h.to_dict() for name, h in self.histograms.items()},
+                "counters": dict(self.counters),
+            }
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def export_jsonl(self, path):
+        """Append one JSON line per histogram and counter; returns the line count"""
+        snapshot = self.snapshot()
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+        lines = [
+            {"time": timestamp, "kind": "histogram", "name": name, **stats}
+            for name, stats in sorted(snapshot["histograms"].items())
+        ]
+        lines += [
+            {"time": timestamp, "kind": "counter", "name": name, "value": value}
+            for name, value in sorted(snapshot["counters"].items())
+        ]
+        # Imported here: every Ledger imports this module, and the CLI's
+        # start-up time should not pay for json
+        import json
+
+        with open(path, "a", encoding="utf-8") as f:
+            for line in lines:
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+        return len(lines)
+
+
+# Shared instance; COINER_METRICS=1 turns it on from startup
+metrics = Metrics(enabled=os.environ.get("COINER_METRICS") == "1")
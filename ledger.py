@@ -0,0 +1,483 @@
+import time
+from datetime import datetime
+
+from instrumentation import metrics
+from migrate_database import upgrade_database
+from money import percentage
+from month_cache import MonthView
+from search import SEARCH_COUNT_QUERY, match_expression, search_pages
+from storage import DEFAULT_PATH, DEFAULT_PROFILE, connect
+
+# The types the app has a list for. Others can be added to the
+# transaction_types table; their name prefix says how they are summed.
+INCOME_TYPES = ("income_fixed", "income_variable")
+EXPENSE_TYPES = ("expense_indispensable", "expense_necesarios", "expense_innecesarios")
+TRANSACTION_TYPES = INCOME_TYPES + EXPENSE_TYPES
+INCOME_PREFIX = "income_"
+
+# Automatic allocations, as a percentage of income
+AHORRO_PERCENT = 10
+DEUDA_PERCENT = 5
+INVERSION_PERCENT = 10
+
+# Per-type totals and row counts of a month, read from monthly_aggregates
+MONTH_TOTALS_QUERY = """
+    SELECT type_id, total, count
+    FROM monthly_aggregates
+    WHERE year = ? AND month = ?
+"""
+
+# One page of a month's list, newest first. Ties on date are broken by id
+# (which the month index carries) so every row has a stable position.
+MONTH_PAGE_QUERY = """
+    SELECT id, amount, description, category_id, date
+    FROM transactions
+    WHERE year = ? AND month = ? AND type_id = ?
+    ORDER BY date DESC, id DESC
+    LIMIT ? OFFSET ?
+"""
+
+# Position of a row in its list: how many rows of the list come before it
+ROW_POSITION_QUERY = """
+    SELECT COUNT(*)
+    FROM transactions
+    WHERE year = ? AND month = ? AND type_id = ? AND (date, id) > (?, ?)
+"""
+
+# Per-month, per-type aggregates of an inclusive range of months
+RANGE_TOTALS_QUERY = """
+    SELECT year, month, type_id, total, count
+    FROM monthly_aggregates
+    WHERE year * 12 + month BETWEEN ? AND ?
+    ORDER BY year, month
+"""
+
+# Per-type, per-category totals of an inclusive range of months; the row
+# value bounds are a range of the month index
+CATEGORY_TOTALS_QUERY = """
+    SELECT type_id, category_id, SUM(amount), COUNT(*)
+    FROM transactions
+    WHERE (year, month) BETWEEN (?, ?) AND (?, ?)
+    GROUP BY type_id, category_id
+"""
+
+# How often and how recently each description and category was used,
+# for the autocomplete index
+USAGE_QUERY = """
+    SELECT type_id, description, category_id, COUNT(*), julianday(MAX(date))
+    FROM transactions
+    GROUP BY type_id, description, category_id
+"""
+
+INSERT_SQL = """
+    INSERT INTO transactions (type_id, amount, description, category_id, month, year, date)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def allocate(income):
+    """Return the (ahorro, pago deuda, inversión) allocations of an income"""
+    return (
+        percentage(income, AHORRO_PERCENT),
+        percentage(income, DEUDA_PERCENT),
+        percentage(income, INVERSION_PERCENT),
+    )
+
+
+def now_text():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class Transaction:
+    """One row of a month list (amount in minor units)"""
+
+    __slots__ = ("id", "amount", "description", "category", "date")
+
+    def __init__(self, id, amount, description, category, date):
+        self.id = id
+        self.amount = amount
+        self.description = description
+        self.category = category
+        self.date = date
+
+    def __repr__(self):
+        return f"Transaction({self.id}, {self.amount}, {self.description!r}, {self.category!r}, {self.date!r})"
+
+
+class SearchResult(Transaction):
+    """A transaction found by a search, with the list and month it is in"""
+
+    __slots__ = ("type", "month", "year")
+
+    def __init__(self, id, type, amount, description, category, date, month, year):
+        super().__init__(id, amount, description, category, date)
+        self.type = type
+        self.month = month
+        self.year = year
+
+
+class MonthSummary:
+    """Totals, allocations and balance of a month (or range of months),
+    with amounts in minor units."""
+
+    def __init__(self, totals, counts):
+        self.totals = totals
+        self.counts = counts
+
+        self.total_income = sum(
+            total for name, total in totals.items() if name.startswith(INCOME_PREFIX)
+        )
+        self.total_expenses = sum(totals.values()) - self.total_income
+
+        # Automatic calculations (percentages of total income)
+        self.ahorro, self.pago_deuda, self.inversion = allocate(self.total_income)
+        self.total_otros = self.ahorro + self.pago_deuda + self.inversion
+
+        # Final balance
+        self.balance = self.total_income - self.total_otros - self.total_expenses
+
+    def with_delta(self, transaction_type, amount, count):
+        """Summary after adding ``amount`` and ``count`` rows to one type"""
+        totals = dict(self.totals)
+        counts = dict(self.counts)
+        totals[transaction_type] = totals.get(transaction_type, 0) + amount
+        counts[transaction_type] = counts.get(transaction_type, 0) + count
+        return MonthSummary(totals, counts)
+
+    def aggregate_rows(self):
+        """(type, total, count) rows of the non-empty types, as stored"""
+        return [
+            (transaction_type, self.totals[transaction_type], self.counts[transaction_type])
+            for transaction_type in self.totals
+            if self.counts[transaction_type]
+        ]
+
+    @classmethod
+    def from_aggregates(cls, rows):
+        """Build a summary from (type, total, count) rows"""
+        totals = dict.fromkeys(TRANSACTION_TYPES, 0)
+        counts = dict.fromkeys(TRANSACTION_TYPES, 0)
+        for transaction_type, total, count in rows:
+            totals[transaction_type] = totals.get(transaction_type, 0) + total
+            counts[transaction_type] = counts.get(transaction_type, 0) + count
+        return cls(totals, counts)
+
+
+class Vocabulary:
+    """Ids and names of the transaction types and categories, for one connection.
+
+    Both tables are small and read whole. Categories a write names that
+    do not exist yet are created; an id a read does not know reloads the
+    tables, since another connection may have added it.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.load()
+
+    def load(self):
+        self.type_ids = dict(self.conn.execute("SELECT name, id FROM transaction_types"))
+        self.type_names = {type_id: name for name, type_id in self.type_ids.items()}
+        self.category_ids = {}
+        self.category_names = {}
+        for category_id, type_id, name in self.conn.execute(
+            "SELECT id, type_id, name FROM categories ORDER BY id"
+        ):
+            self.category_ids[type_id, name] = category_id
+            self.category_names[category_id] = name
+
+    def type_id(self, name):
+        if name not in self.type_ids:
+            self.load()
+        try:
+            return self.type_ids[name]
+        except KeyError:
+            raise ValueError(f"Unknown transaction type: {name!r}") from None
+
+    def type_name(self, type_id):
+        if type_id not in self.type_names:
+            self.load()
+        return self.type_names[type_id]
+
+    def category_name(self, category_id):
+        if category_id not in self.category_names:
+            self.load()
+        return self.category_names[category_id]
+
+    def ids(self, pairs):
+        """[(type id, category id)] of (type, category) name pairs.
+
+        Missing categories are created together, in one transaction.
+        """
+        keys = [(self.type_id(transaction_type), category) for transaction_type, category in pairs]
+        missing = {key for key in keys if key not in self.category_ids}
+        if missing:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO categories (type_id, name) VALUES (?, ?)", missing
+                )
+            self.load()
+        return [(type_id, self.category_ids[type_id, category]) for type_id, category in keys]
+
+    def categories(self):
+        """{type: [category names]} in the order they were added"""
+        categories = {name: [] for name in self.type_ids}
+        for type_id, name in self.category_ids:  # loaded in id order
+            categories[self.type_names[type_id]].append(name)
+        return categories
+
+
+class Ledger:
+    """Headless access to the finance database: schema, writes, month
+    queries and the summary math used by the UI. Not thread-safe; use one
+    Ledger per thread."""
+
+    def __init__(self, path=DEFAULT_PATH, profile=DEFAULT_PROFILE, upgrade=True):
+        self.path = path
+        self.profile = profile
+        self.conn = connect(path, profile)
+        if upgrade:
+            upgrade_database(self.conn)
+        self.vocabulary = Vocabulary(self.conn)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def query(self, sql, parameters=()):
+        """Run a SELECT and fetch all its rows (timed when metrics are on)"""
+        if not metrics.enabled:
+            return self.conn.execute(sql, parameters).fetchall()
+        start = time.perf_counter()
+        rows = self.conn.execute(sql, parameters).fetchall()
+        metrics.query(sql, start, len(rows))
+        return rows
+
+    def execute(self, sql, parameters=(), many=False):
+        """Run a write statement (``many``: once per parameter set) and return the cursor"""
+        run = self.conn.executemany if many else self.conn.execute
+        if not metrics.enabled:
+            return run(sql, parameters)
+        start = time.perf_counter()
+        cursor = run(sql, parameters)
+        metrics.query(sql, start, 0)
+        return cursor
+
+    # Writes
+
+    def add(self, transaction_type, amount, description, category, month, year, date=None):
+        """Insert one transaction (amount in minor units) and return its id"""
+        [(type_id, category_id)] = self.vocabulary.ids([(transaction_type, category)])
+        with self.conn:
+            cursor = self.execute(
+                INSERT_SQL,
+                (type_id, amount, description, category_id, month, year, date or now_text()),
+            )
+        return cursor.lastrowid
+
+    def add_many(self, rows):
+        """Insert (type, amount, description, category, month, year[, date])
+        rows in a single transaction and return how many were inserted"""
+        date = now_text()
+        rows = [row if len(row) == 7 else (*row, date) for row in rows]
+        ids = self.vocabulary.ids((row[0], row[3]) for row in rows)
+        with self.conn:
+            cursor = self.execute(
+                INSERT_SQL,
+                (
+                    (type_id, row[1], row[2], category_id, *row[4:])
+                    for row, (type_id, category_id) in zip(rows, ids)
+                ),
+                many=True,
+            )
+        return cursor.rowcount
+
+    def delete(self, transaction_id):
+        """Delete one transaction; returns True if it existed"""
+        with self.conn:
+            cursor = self.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
+        return cursor.rowcount > 0
+
+    def delete_many(self, transaction_ids):
+        """Delete transactions by id in a single transaction; returns the count"""
+        with self.conn:
+            cursor = self.execute(
+                "DELETE FROM transactions WHERE id = ?",
+                ((transaction_id,) for transaction_id in transaction_ids),
+                many=True,
+            )
+        return cursor.rowcount
+
+    # Reads
+
+    def month_aggregates(self, year, month):
+        """(type, total, count) rows of a month"""
+        type_name = self.vocabulary.type_name
+        return [
+            (type_name(type_id), total, count)
+            for type_id, total, count in self.query(MONTH_TOTALS_QUERY, (year, month))
+        ]
+
+    def categories(self):
+        """{type: [category names]}, for the forms"""
+        self.vocabulary.load()
+        return self.vocabulary.categories()
+
+    def usage(self):
+        """(type, description, category, uses, julian day of the last use) rows"""
+        type_name = self.vocabulary.type_name
+        category_name = self.vocabulary.category_name
+        return [
+            (type_name(type_id), description, category_name(category_id), uses, last_day)
+            for type_id, description, category_id, uses, last_day in self.query(USAGE_QUERY)
+        ]
+
+    def category_totals(self, start, end):
+        """(type, category, total, count) of every month from ``start`` to
+        ``end`` inclusive ((year, month) pairs), largest total first"""
+        type_name = self.vocabulary.type_name
+        category_name = self.vocabulary.category_name
+        rows = [
+            (type_name(type_id), category_name(category_id), total, count)
+            for type_id, category_id, total, count in self.query(CATEGORY_TOTALS_QUERY, (*start, *end))
+        ]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows
+
+    def type_aggregate(self, year, month, transaction_type):
+        """(total, count) of one list of a month"""
+        rows = self.query(
+            "SELECT total, count FROM monthly_aggregates WHERE year = ? AND month = ? AND type_id = ?",
+            (year, month, self.vocabulary.type_id(transaction_type)),
+        )
+        return rows[0] if rows else (0, 0)
+
+    def position(self, transaction_id):
+        """Index of a transaction in its month list (as paged by month_page)"""
+        rows = self.query(
+            "SELECT year, month, type_id, date FROM transactions WHERE id = ?", (transaction_id,)
+        )
+        if not rows:
+            return None
+        return self.query(ROW_POSITION_QUERY, (*rows[0], transaction_id))[0][0]
+
+    def month_summary(self, year, month):
+        return MonthSummary.from_aggregates(self.month_aggregates(year, month))
+
+    def month_page(self, year, month, transaction_type, offset=0, limit=100):
+        """Transactions of one list, newest first"""
+        rows = self.query(
+            MONTH_PAGE_QUERY, (year, month, self.vocabulary.type_id(transaction_type), limit, offset)
+        )
+        return self.transactions(rows)
+
+    def transactions(self, rows):
+        """Transaction objects of MONTH_PAGE_QUERY rows, with category names"""
+        category_name = self.vocabulary.category_name
+        return [
+            Transaction(id, amount, description, category_name(category_id), date)
+            for id, amount, description, category_id, date in rows
+        ]
+
+    def read_month(self, year, month, page_size=100, types=None):
+        """Aggregates plus the first page of every non-empty list of a month
+        (of the lists of ``types`` only, when given)"""
+        aggregate_rows = self.month_aggregates(year, month)
+        first_pages = {
+            transaction_type: self.month_page(year, month, transaction_type, 0, page_size)
+            for transaction_type, _, _ in aggregate_rows
+            if types is None or transaction_type in types
+        }
+        return MonthView(aggregate_rows, first_pages)
+
+    def stream_month(self, year, month, page_size=100, chunk_size=25, types=None):
+        """Yield a month's aggregate rows, then the first page of its lists in chunks.
+
+        The first item is ``(None, aggregate_rows)``, so totals can be shown
+        before any transaction is read; the rest are ``(type, transactions)``
+        chunks of up to ``chunk_size`` rows, taken from the lists in turn
+        with ``fetchmany`` so every list gets its first rows early. Only the
+        lists of ``types`` are read when given (the totals cover every type).
+        """
+        aggregate_rows = self.month_aggregates(year, month)
+        yield None, aggregate_rows
+
+        cursors = {
+            transaction_type: self.conn.execute(
+                MONTH_PAGE_QUERY,
+                (year, month, self.vocabulary.type_id(transaction_type), page_size, 0),
+            )
+            for transaction_type, _, _ in aggregate_rows
+            if types is None or transaction_type in types
+        }
+        while cursors:
+            for transaction_type, cursor in list(cursors.items()):
+                start = time.perf_counter()
+                rows = cursor.fetchmany(chunk_size)
+                if metrics.enabled:
+                    metrics.query(MONTH_PAGE_QUERY, start, len(rows))
+                if len(rows) < chunk_size:
+                    del cursors[transaction_type]
+                if rows:
+                    yield transaction_type, self.transactions(rows)
+
+    def search(self, text, limit=50, offset=0):
+        """Transactions whose description or category has every word of
+        ``text`` (the last one as a prefix): the best of the recent ones
+        first, then the rest newest first"""
+        expression = match_expression(text)
+        if expression is None:
+            return []
+        type_name = self.vocabulary.type_name
+        category_name = self.vocabulary.category_name
+        return [
+            SearchResult(
+                id, type_name(type_id), amount, description, category_name(category_id), date, month, year
+            )
+            for sql, parameters in search_pages(expression, limit, offset)
+            for id, type_id, amount, description, category_id, date, month, year in self.query(sql, parameters)
+        ]
+
+    def search_count(self, text):
+        """How many transactions ``search`` can page through for ``text``"""
+        expression = match_expression(text)
+        if expression is None:
+            return 0
+        return self.query(SEARCH_COUNT_QUERY, (expression,))[0][0]
+
+    def summarize_months(self, start, end):
+        """Summaries of every month from ``start`` to ``end`` inclusive.
+
+        ``start`` and ``end`` are (year, month) pairs. Returns a list of
+        ((year, month), MonthSummary) for the months that have transactions.
+        """
+        rows_by_month = {}
+        type_name = self.vocabulary.type_name
+        for year, month, type_id, total, count in self.query(
+            RANGE_TOTALS_QUERY, (start[0] * 12 + start[1], end[0] * 12 + end[1])
+        ):
+            rows_by_month.setdefault((year, month), []).append((type_name(type_id), total, count))
+        return [
+            (key, MonthSummary.from_aggregates(rows)) for key, rows in rows_by_month.items()
+        ]
+
+    def summarize_range(self, start, end):
+        """One summary for all months from ``start`` to ``end`` inclusive"""
+        rows = self.query(
+            """
+            SELECT type_id, SUM(total), SUM(count)
+            FROM monthly_aggregates
+            WHERE year * 12 + month BETWEEN ? AND ?
+            GROUP BY type_id
+            """,
+            (start[0] * 12 + start[1], end[0] * 12 + end[1]),
+        )
+        type_name = self.vocabulary.type_name
+        return MonthSummary.from_aggregates(
+            (type_name(type_id), total, count) for type_id, total, count in rows
+        )
@@ -1,34 +1,52 @@
 import tkinter as tk
 from tkinter import ttk
-import sqlite3
-import math
+import argparse
 from datetime import datetime
-
-
-def create_rounded_rectangle(canvas, x1, y1, x2, y2, radius=15, **kwargs):
-    """Create a rounded rectangle on a canvas using arcs and lines"""
-    if radius > (x2 - x1) / 2:
-        radius = (x2 - x1) / 2
-    if radius > (y2 - y1) / 2:
-        radius = (y2 - y1) / 2
-
-    # Create the rounded rectangle using multiple shapes and return all IDs
-    elements = []
-
-    # Main rectangles
-    elements.append(canvas.create_rectangle(x1 + radius, y1, x2 - radius, y2, outline="", **kwargs))
-    elements.append(canvas.create_rectangle(x1, y1 + radius, x2, y2 - radius, outline="", **kwargs))
-
-    # Corners (ovals)
-    elements.append(canvas.create_oval(x1, y1, x1 + 2*radius, y1 + 2*radius, outline="", **kwargs))  # Top-left
-    elements.append(canvas.create_oval(x2 - 2*radius, y1, x2, y1 + 2*radius, outline="", **kwargs))  # Top-right
-    elements.append(canvas.create_oval(x1, y2 - 2*radius, x1 + 2*radius, y2, outline="", **kwargs))  # Bottom-left
-    elements.append(canvas.create_oval(x2 - 2*radius, y2 - 2*radius, x2, y2, outline="", **kwargs))  # Bottom-right
-
-    return elements
-
-# Add method to Canvas class
-tk.Canvas.create_rounded_rectangle = create_rounded_rectangle
+from functools import lru_cache
+
+from autocomplete import Suggestions, normalize
+from backup import BACKUP_DIR, DEFAULT_INTERVAL, BackupScheduler, uses_wal
+from chart_panel import ChartPanel
+from db_worker import DatabaseWorker
+from instrumentation import metrics
+from ledger import MonthSummary, Transaction, allocate, now_text
+from money import format_amount, parse_amount
+from month_cache import MonthCache, MonthView
+from notifications import ToastNotifier
+from perf_panel import PerformancePanel
+from report_window import ReportWindow
+from reports import RangeSums
+from search_window import SearchWindow
+from shapes import create_rounded_rectangle
+from storage import DEFAULT_PATH, DEFAULT_PROFILE, STORAGE_PROFILES
+from virtual_list import VirtualList
+
+
+# Rows per list page, rows per streamed chunk of a first page, and memory
+# allowed for cached month views
+LIST_PAGE_SIZE = 100
+LIST_CHUNK_SIZE = 25
+MONTH_CACHE_BUDGET = 8 * 1024 * 1024
+
+# Categories offered in a combo's drop-down, most used and most recent first
+CATEGORY_CHOICES = 20
+
+
+def shift_month(month, year, step):
+    """Return the (month, year) ``step`` months away"""
+    index = year * 12 + (month - 1) + step
+    return index % 12 + 1, index // 12
+
+
+@lru_cache(maxsize=64)
+def darken_color(color):
+    """Darken a hex color"""
+    if color.startswith('#'):
+        hex_color = color[1:]
+        rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        darkened = tuple(max(0, int(c * 0.8)) for c in rgb)
+        return '#%02x%02x%02x' % darkened
+    return color
 
 
 class FinanceApp:
@@ -42,9 +60,9 @@ class FinanceApp:
 
         canvas = tk.Canvas(parent, width=width, height=height, highlightthickness=0, bg=parent_bg, bd=0)
 
-        # Create rounded rectangle and store all element IDs
-        button_elements = canvas.create_rounded_rectangle(
-            2, 2, width - 2, height - 2,
+        # Create rounded rectangle (one canvas item)
+        shape_id = create_rounded_rectangle(
+            canvas, 2, 2, width - 2, height - 2,
             radius=corner_radius, fill=bg_color
         )
 
@@ -54,10 +72,11 @@ class FinanceApp:
             text=text, fill=fg_color, font=font
         )
 
-        # Store references for hover effect
+        # Store references for hover effect; the hover color is worked out once
         canvas.bg_color = bg_color
+        canvas.hover_color = self.darken_color(bg_color)
         canvas.text_id = text_id
-        canvas.button_elements = button_elements
+        canvas.shape_id = shape_id
 
         # Bind click event
         canvas.bind("<Button-1>", lambda e: command())
@@ -69,33 +88,15 @@ class FinanceApp:
 
     def on_button_hover_enter(self, canvas):
         """Handle button hover enter"""
-        hover_color = self.darken_color(canvas.bg_color)
-        # Update all button elements
-        if hasattr(canvas, 'button_elements'):
-            for element_id in canvas.button_elements:
-                try:
-                    canvas.itemconfig(element_id, fill=hover_color)
-                except:
-                    pass
+        canvas.itemconfig(canvas.shape_id, fill=canvas.hover_color)
 
     def on_button_hover_leave(self, canvas):
         """Handle button hover leave"""
-        # Restore original color for all button elements
-        if hasattr(canvas, 'button_elements'):
-            for element_id in canvas.button_elements:
-                try:
-                    canvas.itemconfig(element_id, fill=canvas.bg_color)
-                except:
-                    pass
+        canvas.itemconfig(canvas.shape_id, fill=canvas.bg_color)
 
     def darken_color(self, color):
         """Darken a hex color"""
-        if color.startswith('#'):
-            hex_color = color[1:]
-            rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-            darkened = tuple(max(0, int(c * 0.8)) for c in rgb)
-            return '#%02x%02x%02x' % darkened
-        return color
+        return darken_color(color)
 
     def create_rounded_entry(self, parent, font, width=200, height=35, corner_radius=8):
         """Create an entry widget with rounded corners"""
@@ -112,8 +113,8 @@ class FinanceApp:
         canvas.pack()
 
         # Create rounded rectangle background
-        canvas.create_rounded_rectangle(
-            1, 1, width - 1, height - 1,
+        create_rounded_rectangle(
+            canvas, 1, 1, width - 1, height - 1,
             radius=corner_radius, fill="white"
         )
 
@@ -143,147 +144,72 @@ class FinanceApp:
         canvas = tk.Canvas(parent, width=width, height=height, highlightthickness=0, bg=parent_bg, bd=0)
 
         # Create rounded rectangle
-        canvas.create_rounded_rectangle(
-            0, 0, width, height,
+        create_rounded_rectangle(
+            canvas, 0, 0, width, height,
             radius=corner_radius, fill=bg_color
         )
 
         return canvas
 
-    def show_custom_popup(self, title, message, popup_type="info"):
-        """Create a custom popup window without system frames"""
-        # Create toplevel window
-        popup = tk.Toplevel(self.root)
-        popup.overrideredirect(True)  # Remove system window decorations
-        popup.configure(bg="#2c2c2c")
-
-        # Calculate size and position
-        width = 450
-        height = 250
-        x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (width // 2)
-        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (height // 2)
-        popup.geometry(f"{width}x{height}+{x}+{y}")
-
-        # Make popup modal
-        popup.transient(self.root)
-
-        # Main container with rounded appearance
-        main_frame = tk.Frame(popup, bg="#2c2c2c")
-        main_frame.pack(fill="both", expand=True, padx=8, pady=8)
-
-        # Inner frame with rounded background
-        inner_frame = tk.Frame(main_frame, bg="#3a3a3a")
-        inner_frame.pack(fill="both", expand=True, padx=4, pady=4)
-
-        # Title section
-        title_frame = tk.Frame(inner_frame, bg="#3a3a3a")
-        title_frame.pack(fill="x", pady=(15, 10))
-
-        title_label = tk.Label(
-            title_frame,
-            text=title,
-            font=("Poppins", 14, "bold"),
-            fg="white",
-            bg="#3a3a3a"
-        )
-        title_label.pack()
-
-        # Message section
-        message_frame = tk.Frame(inner_frame, bg="#3a3a3a")
-        message_frame.pack(fill="both", expand=True, pady=(0, 20))
-
-        message_label = tk.Label(
-            message_frame,
-            text=message,
-            font=("Poppins", 11),
-            fg="#e0e0e0",
-            bg="#3a3a3a",
-            wraplength=400,
-            justify="center"
-        )
-        message_label.pack(expand=True, pady=(10, 20))
+    def show_info_popup(self, message):
+        """Show an info notification"""
+        self.toasts.show(message, "info")
 
-        # Button section
-        button_frame = tk.Frame(inner_frame, bg="#3a3a3a")
-        button_frame.pack(pady=(0, 15))
+    def show_success_popup(self, message):
+        """Show a success notification"""
+        self.toasts.show(message, "success")
 
-        # Determine button color based on popup type
-        button_colors = {
-            "info": "#2196F3",
-            "success": "#4CAF50",
-            "warning": "#FF9800",
-            "error": "#f44336"
-        }
-        button_color = button_colors.get(popup_type, "#2196F3")
+    def show_warning_popup(self, message):
+        """Show a warning notification"""
+        self.toasts.show(message, "warning")
 
-        # Rounded close button
-        close_btn = self.create_rounded_button(
-            button_frame,
-            text="Cerrar",
-            command=popup.destroy,
-            bg_color=button_color,
-            fg_color="white",
-            font=("Poppins", 11, "bold"),
-            width=100,
-            height=40,
-            corner_radius=10
-        )
-        close_btn.pack()
+    def show_error_popup(self, message):
+        """Show an error notification"""
+        self.toasts.show(message, "error")
 
-        # Add subtle shadow effect with multiple frames
-        shadow_frame1 = tk.Frame(popup, bg="#1a1a1a", height=2)
-        shadow_frame1.place(x=2, y=height-2, width=width-2)
+    def show_confirmation_popup(self, title, message):
+        """Show the confirmation dialog and wait for Yes/No"""
+        if self.confirmation_popup is None:
+            self.build_confirmation_popup()
+        popup = self.confirmation_popup
 
-        shadow_frame2 = tk.Frame(popup, bg="#1a1a1a", width=2)
-        shadow_frame2.place(x=width-2, y=2, height=height-2)
+        self.confirmation_title.config(text=title)
+        self.confirmation_message.config(text=message)
 
-        # Bind Escape key to close
-        popup.bind('<Escape>', lambda e: popup.destroy())
+        # Center on the window, which may have moved since last time
+        width = 480
+        height = 260
+        x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (width // 2)
+        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (height // 2)
+        popup.geometry(f"{width}x{height}+{x}+{y}")
+        popup.deiconify()
 
         # Make sure window is visible before grab_set
         popup.update_idletasks()
         popup.grab_set()
-
-        # Focus on popup
         popup.focus_set()
 
-        return popup
-
-    def show_info_popup(self, message):
-        """Show an info popup"""
-        return self.show_custom_popup("Información", message, "info")
-
-    def show_success_popup(self, message):
-        """Show a success popup"""
-        return self.show_custom_popup("Éxito", message, "success")
-
-    def show_warning_popup(self, message):
-        """Show a warning popup"""
-        return self.show_custom_popup("Advertencia", message, "warning")
+        popup.wait_variable(self.confirmation_result)  # Wait for Yes/No
+        popup.grab_release()
+        popup.withdraw()
+        return self.confirmation_result.get()
 
-    def show_error_popup(self, message):
-        """Show an error popup"""
-        return self.show_custom_popup("Error", message, "error")
-
-    def show_confirmation_popup(self, title, message):
-        """Show a confirmation popup with Yes/No buttons"""
+    def build_confirmation_popup(self):
+        """Build the confirmation dialog once; it is hidden, not destroyed, after use"""
         # Create toplevel window
         popup = tk.Toplevel(self.root)
+        popup.withdraw()
         popup.overrideredirect(True)
         popup.configure(bg="#2c2c2c")
 
-        # Calculate size and position
-        width = 480
-        height = 260
-        x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (width // 2)
-        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (height // 2)
-        popup.geometry(f"{width}x{height}+{x}+{y}")
-
         # Make popup modal
         popup.transient(self.root)
 
         # Store result
-        result = {"value": False}
+        result = tk.BooleanVar(popup, value=False)
+
+        width = 480
+        height = 260
 
         # Main container
         main_frame = tk.Frame(popup, bg="#2c2c2c")
@@ -298,7 +224,6 @@ class FinanceApp:
 
         title_label = tk.Label(
             title_frame,
-            text=title,
             font=("Poppins", 14, "bold"),
             fg="white",
             bg="#3a3a3a"
@@ -311,7 +236,6 @@ class FinanceApp:
 
         message_label = tk.Label(
             message_frame,
-            text=message,
             font=("Poppins", 11),
             fg="#e0e0e0",
             bg="#3a3a3a",
@@ -325,12 +249,10 @@ class FinanceApp:
         button_frame.pack(pady=(0, 15))
 
         def on_yes():
-            result["value"] = True
-            popup.destroy()
+            result.set(True)
 
         def on_no():
-            result["value"] = False
-            popup.destroy()
+            result.set(False)
 
         # Yes button
         yes_btn = self.create_rounded_button(
@@ -371,17 +293,22 @@ class FinanceApp:
         popup.bind('<Return>', lambda e: on_yes())
         popup.bind('<Escape>', lambda e: on_no())
 
-        # Make sure window is visible before grab_set
-        popup.update_idletasks()
-        popup.grab_set()
-
-        popup.focus_set()
-        popup.wait_window()  # Wait for window to close
-
-        return result["value"]
-
-    def __init__(self, root):
+        self.confirmation_popup = popup
+        self.confirmation_title = title_label
+        self.confirmation_message = message_label
+        self.confirmation_result = result
+
+    def __init__(
+        self,
+        root,
+        db_path=DEFAULT_PATH,
+        profile=DEFAULT_PROFILE,
+        backup_dir=BACKUP_DIR,
+        backup_interval=DEFAULT_INTERVAL,
+    ):
         self.root = root
+        self.db_path = db_path
+        self.profile = profile
         self.root.title("Coiner - Gestor Financiero Personal")
         self.root.geometry("1400x900")
         self.root.configure(bg="#2c2c2c")
@@ -391,51 +318,73 @@ class FinanceApp:
         self.current_month = now.month
         self.current_year = now.year
 
-        # Initialize database
-        self.init_database()
+        # Recently shown and prefetched months, rendered without the database
+        self.month_cache = MonthCache(MONTH_CACHE_BUDGET)
+        self.prefetching = set()
+        self.displayed_month = None
+        self.displayed_summary = None
 
-        # Create main interface
-        self.create_widgets()
-        self.load_data()
+        # Notifications reuse one toast; the confirmation dialog is built on first use
+        self.confirmation_popup = None
 
-    def init_database(self):
-        """Initialize SQLite database with new schema"""
-        self.conn = sqlite3.connect("finance.db")
-        self.cursor = self.conn.cursor()
-
-        # Create transactions table with new schema
-        self.cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS transactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                type TEXT NOT NULL,  -- 'income_fixed', 'income_variable', 'expense_indispensable', 'expense_necesarios', 'expense_innecesarios'
-                amount REAL NOT NULL,
-                description TEXT NOT NULL,
-                category TEXT NOT NULL,
-                month INTEGER NOT NULL,
-                year INTEGER NOT NULL,
-                date TEXT NOT NULL
-            )
-        """
+        # Initialize database
+        with metrics.timer("init_database"):
+            self.init_database()
+
+        # Create main interface; the category combos are filled from the
+        # categories table once the worker has read it, then ranked by use
+        # once the autocomplete index is built
+        self.category_combos = {}
+        self.suggestions = None
+        self.range_sums = None
+        with metrics.timer("create_widgets"):
+            self.create_widgets()
+        self.toasts = ToastNotifier(self.root)
+        self.performance_panel = PerformancePanel(self.root, metrics)
+        self.root.bind("<F12>", lambda e: self.performance_panel.toggle())
+        self.search_window = SearchWindow(
+            self.root, self.db, self.go_to_month, self.on_database_error
         )
-
-        # Create monthly budgets table for automatic calculations
-        self.cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS monthly_budgets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                month INTEGER NOT NULL,
-                year INTEGER NOT NULL,
-                total_income REAL DEFAULT 0,
-                ahorro_percentage REAL DEFAULT 0.10,
-                deuda_percentage REAL DEFAULT 0.05,
-                inversion_percentage REAL DEFAULT 0.10,
-                UNIQUE(month, year)
-            )
-        """
+        self.root.bind("<Control-f>", lambda e: self.search_window.show())
+        self.report_window = ReportWindow(
+            self.root, lambda: (self.current_month, self.current_year)
+        )
+        self.root.bind("<Control-r>", lambda e: self.report_window.show())
+        self.chart_panel = ChartPanel(
+            self.root,
+            self.db,
+            lambda: (self.current_month, self.current_year),
+            self.on_database_error,
         )
+        self.root.bind("<Control-g>", lambda e: self.chart_panel.toggle())
+
+        # Hot backups every backup_interval minutes (0 turns them off). With
+        # a rollback journal a backup would lock out the app's commits, so
+        # those databases are backed up by hand with the app closed
+        self.backups = None
+        if backup_interval and not uses_wal(self.db_path):
+            print("⚠️  Automatic backups need WAL (profile fast or read-mostly): "
+                  "run python backup.py create with the app closed")
+        elif backup_interval:
+            self.backups = BackupScheduler(
+                self.root,
+                self.db_path,
+                backup_dir,
+                backup_interval,
+                on_error=lambda error: self.show_error_popup(
+                    f"No se pudo crear la copia de seguridad: {error}"
+                ),
+            )
+        self.load_categories()
+        self.load_data()
+        self.load_range_sums()
+        self.load_suggestions()
 
-        self.conn.commit()
+    def init_database(self):
+        """Initialize SQLite database with new schema"""
+        # Every query runs on the database worker thread, through its
+        # Ledger; opening it creates or upgrades the schema in place
+        self.db = DatabaseWorker(self.root, self.db_path, self.profile)
 
     def create_widgets(self):
         """Create the main UI components"""
@@ -458,6 +407,14 @@ class FinanceApp:
         # Summary frame at bottom
         self.create_summary_section()
 
+        self.listboxes = {
+            "income_fixed": self.fixed_listbox,
+            "income_variable": self.variable_listbox,
+            "expense_indispensable": self.indispensable_listbox,
+            "expense_necesarios": self.necesarios_listbox,
+            "expense_innecesarios": self.innecesarios_listbox,
+        }
+
     def create_header(self):
         """Create title and month navigation"""
         header_frame = tk.Frame(self.root, bg="#2c2c2c", height=120)
@@ -474,6 +431,31 @@ class FinanceApp:
         )
         title_label.pack(pady=(15, 8))
 
+        # Search and reports open their own windows
+        tools_frame = tk.Frame(header_frame, bg="#2c2c2c")
+        tools_frame.place(relx=1.0, x=-30, y=15, anchor="ne")
+        for text, command in (
+            ("Gráficos", lambda: self.chart_panel.toggle()),
+            ("Reportes", lambda: self.report_window.show()),
+            ("Buscar", lambda: self.search_window.show()),
+        ):
+            tk.Button(
+                tools_frame,
+                text=text,
+                command=command,
+                bg="#404040",
+                fg="white",
+                font=("Poppins", 10, "bold"),
+                cursor="hand2",
+                bd=0,
+                highlightthickness=0,
+                activebackground="#505050",
+                activeforeground="white",
+                relief="flat",
+                padx=14,
+                pady=4,
+            ).pack(side="left", padx=(8, 0))
+
         # Month navigation
         nav_frame = tk.Frame(header_frame, bg="#2c2c2c")
         nav_frame.pack(pady=10)
@@ -604,26 +586,6 @@ class FinanceApp:
         )
         desc_entry.pack(fill="x", pady=(5, 12), padx=4, ipady=6)
 
-        # Category based on type (from HolaMundo.xlsx)
-        categories = {
-            "income_fixed": [
-                "Padres",
-                "CDT intereses",
-                "Salario",
-                "Pensión",
-                "Arriendo recibido",
-                "Otro",
-            ],
-            "income_variable": [
-                "Freelance",
-                "Trabajos AI",
-                "Show de magia",
-                "Proyectos",
-                "Retorno Pizza",
-                "Consultoría",
-                "Otro",
-            ],
-        }
 
         tk.Label(
             form_frame,
@@ -634,10 +596,12 @@ class FinanceApp:
         ).pack(anchor="w")
         category_combo = ttk.Combobox(
             form_frame,
-            values=categories[income_type],
             font=("Poppins", 11),
         )
         category_combo.pack(fill="x", pady=(5, 15), padx=4, ipady=4)
+        self.category_combos[income_type] = category_combo
+        self.bind_autocomplete(desc_entry, income_type, "descriptions")
+        self.bind_autocomplete(category_combo, income_type, "categories")
 
         # Rounded Add button
         add_btn = self.create_rounded_button(
@@ -661,36 +625,34 @@ class FinanceApp:
         list_frame = tk.Frame(list_outer_frame, bg="#454545")
         list_frame.pack(fill="both", expand=True, padx=8, pady=8, ipady=8, ipadx=8)
 
-        # Scrollable listbox
-        listbox_frame = tk.Frame(list_frame, bg="#454545")
-        listbox_frame.pack(fill="both", expand=True)
-
-        scrollbar = tk.Scrollbar(
-            listbox_frame,
-            bg="#505050",
-            troughcolor="#454545",
-            bd=0,
-            highlightthickness=0,
-            relief="flat",
-            width=12
-        )
-        scrollbar.pack(side="right", fill="y")
-
-        listbox = tk.Listbox(
-            listbox_frame,
-            yscrollcommand=scrollbar.set,
-            font=("Poppins", 9),
-            bg="#505050",
-            fg="white",
-            relief="flat",
-            bd=0,
-            highlightthickness=0,
-            selectbackground="#606060",
-            selectforeground="white",
-            activestyle="none"
+        # Virtual list: only the visible rows are fetched and formatted
+        listbox = VirtualList(
+            list_frame,
+            format_row=self.format_transaction,
+            page_size=LIST_PAGE_SIZE,
+            on_select=self.on_income_select,
+            bg="#454545",
+            listbox_options=dict(
+                font=("Poppins", 9),
+                bg="#505050",
+                fg="white",
+                relief="flat",
+                bd=0,
+                highlightthickness=0,
+                selectbackground="#606060",
+                selectforeground="white",
+                activestyle="none"
+            ),
+            scrollbar_options=dict(
+                bg="#505050",
+                troughcolor="#454545",
+                bd=0,
+                highlightthickness=0,
+                relief="flat",
+                width=12
+            ),
         )
-        listbox.pack(fill="both", expand=True, padx=(4, 16), pady=4)
-        scrollbar.config(command=listbox.yview)
+        listbox.pack(fill="both", expand=True)
 
         # Store references
         if income_type == "income_fixed":
@@ -698,13 +660,10 @@ class FinanceApp:
         else:
             self.variable_listbox = listbox
 
-        # Bind selection event to update allocations
-        listbox.bind('<<ListboxSelect>>', lambda event: self.on_income_select(event, income_type))
-
         # Rounded Delete button
         delete_btn = self.create_rounded_button(
             list_frame,
-            text="Eliminar Seleccionado",
+            text="Eliminar Seleccionados",
             command=lambda: self.delete_transaction(income_type),
             bg_color="#f44336",
             fg_color="white",
@@ -728,7 +687,7 @@ class FinanceApp:
         # Title
         title_label = tk.Label(
             allocations_frame,
-            text="Asignaciones Automáticas (Selecciona un ingreso)",
+            text="Asignaciones Automáticas (Selecciona uno o más ingresos)",
             font=("Poppins", 12, "bold"),
             fg="white",
             bg="#404040",
@@ -769,39 +728,17 @@ class FinanceApp:
         )
         self.selected_inversion_label.pack(side="left", padx=20)
 
-    def on_income_select(self, event, income_type):
+    def on_income_select(self, selection):
         """Handle income item selection to update allocations"""
-        listbox = event.widget
-        selection = listbox.curselection()
-
         if selection:
-            # Get selected item text
-            selected_text = listbox.get(selection[0])
-
-            # Extract amount from the text (format: "$amount - description (category) | ID: id_val")
-            try:
-                # Split by " - " and take the first part which contains "$amount"
-                amount_part = selected_text.split(" - ")[0]
-                # Remove the "$" and any commas, then convert to float
-                amount_str = amount_part.replace("$", "").replace(",", "")
-                amount = float(amount_str)
-
-                # Calculate allocations for this specific income
-                ahorro = amount * 0.10
-                deuda = amount * 0.05
-                inversion = amount * 0.10
-
-                # Update allocation labels
-                self.selected_ahorro_label.config(text=f"Ahorro (10%): ${ahorro:,.0f}")
-                self.selected_deuda_label.config(text=f"Pago Deuda (5%): ${deuda:,.0f}")
-                self.selected_inversion_label.config(text=f"Inversión (10%): ${inversion:,.0f}")
-
-            except (IndexError, ValueError) as e:
-                # Reset if can't parse amount
-                print(f"Error parsing amount from: {selected_text} - {e}")
-                self.selected_ahorro_label.config(text="Ahorro (10%): $0")
-                self.selected_deuda_label.config(text="Pago Deuda (5%): $0")
-                self.selected_inversion_label.config(text="Inversión (10%): $0")
+            # Calculate allocations for the selected incomes together
+            amount = sum(row.amount for _, row in selection)
+            ahorro, deuda, inversion = allocate(amount)
+
+            # Update allocation labels
+            self.selected_ahorro_label.config(text=f"Ahorro (10%): {format_amount(ahorro)}")
+            self.selected_deuda_label.config(text=f"Pago Deuda (5%): {format_amount(deuda)}")
+            self.selected_inversion_label.config(text=f"Inversión (10%): {format_amount(inversion)}")
         else:
             # Reset when no selection
             self.selected_ahorro_label.config(text="Ahorro (10%): $0")
@@ -887,44 +824,6 @@ class FinanceApp:
         )
         desc_entry.pack(fill="x", pady=(5, 12), padx=4, ipady=6)
 
-        # Categories based on type (from HolaMundo.xlsx)
-        categories = {
-            "expense_indispensable": [
-                "Arriendo",
-                "Servicios públicos",
-                "Alimentación básica",
-                "Transporte público",
-                "Seguro médico",
-                "Medicamentos",
-                "Otro",
-            ],
-            "expense_necesarios": [
-                "Adobe",
-                "Overleaf",
-                "BodyTech",
-                "YT Premium",
-                "Claude",
-                "Hostinger",
-                "Netflix",
-                "Spotify",
-                "Internet",
-                "Teléfono",
-                "Otro",
-            ],
-            "expense_innecesarios": [
-                "Pizza",
-                "Café",
-                "Chocolates",
-                "Sr.wok",
-                "Bolos",
-                "Entretenimiento",
-                "Platziconf",
-                "Desodorante",
-                "Café Quindio",
-                "Camisa Fisica",
-                "Otro",
-            ],
-        }
 
         tk.Label(
             form_frame,
@@ -935,10 +834,12 @@ class FinanceApp:
         ).pack(anchor="w")
         category_combo = ttk.Combobox(
             form_frame,
-            values=categories[expense_type],
             font=("Poppins", 11),
         )
         category_combo.pack(fill="x", pady=(5, 15), padx=4, ipady=4)
+        self.category_combos[expense_type] = category_combo
+        self.bind_autocomplete(desc_entry, expense_type, "descriptions")
+        self.bind_autocomplete(category_combo, expense_type, "categories")
 
         # Rounded Add button for expenses
         add_btn = self.create_rounded_button(
@@ -962,36 +863,33 @@ class FinanceApp:
         list_frame = tk.Frame(list_outer_frame, bg="#454545")
         list_frame.pack(fill="both", expand=True, padx=8, pady=8, ipady=8, ipadx=8)
 
-        # Scrollable listbox
-        listbox_frame = tk.Frame(list_frame, bg="#454545")
-        listbox_frame.pack(fill="both", expand=True)
-
-        scrollbar = tk.Scrollbar(
-            listbox_frame,
-            bg="#505050",
-            troughcolor="#454545",
-            bd=0,
-            highlightthickness=0,
-            relief="flat",
-            width=12
-        )
-        scrollbar.pack(side="right", fill="y")
-
-        listbox = tk.Listbox(
-            listbox_frame,
-            yscrollcommand=scrollbar.set,
-            font=("Poppins", 9),
-            bg="#505050",
-            fg="white",
-            relief="flat",
-            bd=0,
-            highlightthickness=0,
-            selectbackground="#606060",
-            selectforeground="white",
-            activestyle="none"
+        # Virtual list: only the visible rows are fetched and formatted
+        listbox = VirtualList(
+            list_frame,
+            format_row=self.format_transaction,
+            page_size=LIST_PAGE_SIZE,
+            bg="#454545",
+            listbox_options=dict(
+                font=("Poppins", 9),
+                bg="#505050",
+                fg="white",
+                relief="flat",
+                bd=0,
+                highlightthickness=0,
+                selectbackground="#606060",
+                selectforeground="white",
+                activestyle="none"
+            ),
+            scrollbar_options=dict(
+                bg="#505050",
+                troughcolor="#454545",
+                bd=0,
+                highlightthickness=0,
+                relief="flat",
+                width=12
+            ),
         )
-        listbox.pack(fill="both", expand=True, padx=(4, 16), pady=4)
-        scrollbar.config(command=listbox.yview)
+        listbox.pack(fill="both", expand=True)
 
         # Store references
         if expense_type == "expense_indispensable":
@@ -1004,7 +902,7 @@ class FinanceApp:
         # Rounded Delete button for expenses
         delete_btn = self.create_rounded_button(
             list_frame,
-            text="Eliminar Seleccionado",
+            text="Eliminar Seleccionados",
             command=lambda: self.delete_transaction(expense_type),
             bg_color="#f44336",
             fg_color="white",
@@ -1170,12 +1068,20 @@ class FinanceApp:
         self.month_label.config(text=self.get_month_year_text())
         self.load_data()
 
+    def go_to_month(self, month, year):
+        """Navigate to any month (a search result's)"""
+        self.current_month = month
+        self.current_year = year
+        self.month_label.config(text=self.get_month_year_text())
+        self.load_data()
+
     def add_transaction(
         self, transaction_type, amount_entry, desc_entry, category_combo
     ):
         """Add a new transaction of any type"""
+        started = metrics.start()
         try:
-            amount = float(amount_entry.get())
+            amount = parse_amount(amount_entry.get())
             description = desc_entry.get().strip()
             category = category_combo.get()
 
@@ -1183,179 +1089,444 @@ class FinanceApp:
                 self.show_error_popup("Por favor completa todos los campos")
                 return
 
-            date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            self.cursor.execute(
-                """
-                INSERT INTO transactions (type, amount, description, category, month, year, date)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    transaction_type,
-                    amount,
-                    description,
-                    category,
-                    self.current_month,
-                    self.current_year,
-                    date,
-                ),
+            date = now_text()
+            values = (
+                transaction_type,
+                amount,
+                description,
+                category,
+                self.current_month,
+                self.current_year,
+                date,
             )
 
-            self.conn.commit()
+        except ValueError:
+            self.show_error_popup("Por favor ingresa un valor válido")
+            return
+
+        month_key = (values[5], values[4])
+
+        def insert(ledger):
+            transaction_id = ledger.add(*values)
+            return (
+                transaction_id,
+                ledger.position(transaction_id),
+                ledger.type_aggregate(*month_key, transaction_type),
+            )
+
+        def on_inserted(result):
+            transaction_id, position, stored = result
 
             # Clear entries
             amount_entry.delete(0, tk.END)
             desc_entry.delete(0, tk.END)
             category_combo.set("")
+            if self.suggestions is not None:
+                self.suggestions.add(transaction_type, description, category, values[6])
+                category_combo.config(
+                    values=self.suggestions.categories(transaction_type, "", CATEGORY_CHOICES)
+                )
+            else:
+                categories = self.root.tk.splitlist(category_combo.cget("values"))
+                if category not in categories:
+                    category_combo.config(values=(*categories, category))
 
-            self.load_data()
+            # Put the new row in its place instead of reloading the month
+            row = Transaction(transaction_id, amount, description, category, values[6])
+
+            def insert_row(listbox):
+                if position is None:
+                    return False
+                listbox.insert_row(position, row)
+                return True
+
+            self.apply_delta(month_key, transaction_type, amount, 1, stored, insert_row)
             self.show_success_popup("Transacción agregada exitosamente!")
+            metrics.stop("add_transaction", started)
 
-        except ValueError:
-            self.show_error_popup("Por favor ingresa un valor válido")
+        self.db.submit(insert, on_inserted, self.on_database_error, label="add_transaction")
+
+    def load_categories(self):
+        """Fill the category combos from the categories table"""
+
+        def on_loaded(categories):
+            for transaction_type, combo in self.category_combos.items():
+                combo.config(values=categories.get(transaction_type, []))
+
+        self.db.submit(
+            lambda ledger: ledger.categories(),
+            on_loaded,
+            self.on_database_error,
+            key="categories",
+            label="load_categories",
+        )
+
+    def load_suggestions(self):
+        """Build the autocomplete index from the whole history.
+
+        It reads every transaction, so it runs on a worker of its own
+        instead of holding up the month loads queued on self.db.
+        """
+        builder = DatabaseWorker(self.root, self.db_path, self.profile, poll_interval=100)
+
+        def on_built(suggestions):
+            builder.close()
+            self.suggestions = suggestions
+            for transaction_type, combo in self.category_combos.items():
+                combo.config(values=suggestions.categories(transaction_type, "", CATEGORY_CHOICES))
+
+        def on_failed(error):
+            builder.close()
+            self.on_database_error(error)
+
+        builder.submit(Suggestions.from_ledger, on_built, on_failed, label="build_suggestions")
+
+    def load_range_sums(self):
+        """Build the running monthly sums behind range reports and charts.
+
+        They come from monthly_aggregates, a few rows per month, so this
+        queues on self.db: writes queued before it are already counted and
+        the ones after it are added by apply_delta.
+        """
+
+        def on_built(sums):
+            self.range_sums = sums
+            self.report_window.set_sums(sums)
+            self.chart_panel.set_sums(sums)
+
+        self.db.submit(
+            RangeSums.from_ledger,
+            on_built,
+            self.on_database_error,
+            key="range_sums",
+            label="build_range_sums",
+        )
+
+    def bind_autocomplete(self, widget, transaction_type, field):
+        """Complete what is typed in ``widget`` with the best ``field``
+        suggestion ("descriptions" or "categories"). The completed part is
+        selected, so the next keystroke replaces it; a combo's drop-down
+        shows the other matches."""
+
+        def on_key(event):
+            if self.suggestions is None or not event.char or not event.char.isprintable():
+                return
+            typed = widget.get()
+            if widget.index("insert") != len(typed):
+                return
+
+            with metrics.timer("autocomplete"):
+                if field == "categories":
+                    matches = self.suggestions.categories(transaction_type, typed, CATEGORY_CHOICES)
+                    widget.config(values=matches)
+                else:
+                    matches = self.suggestions.descriptions(transaction_type, typed)
+            if not matches or len(matches[0]) <= len(typed):
+                return
+            best = matches[0]
+            if normalize(best[:len(typed)]) != normalize(typed):
+                return
+            widget.insert(tk.END, best[len(typed):])
+            widget.selection_range(len(typed), tk.END)
+            widget.icursor(len(typed))
+
+        widget.bind("<KeyRelease>", on_key, add="+")
 
     def delete_transaction(self, transaction_type):
-        """Delete selected transaction"""
+        """Delete the selected transactions of a list"""
         # Get the appropriate listbox
-        listbox_map = {
-            "income_fixed": self.fixed_listbox,
-            "income_variable": self.variable_listbox,
-            "expense_indispensable": self.indispensable_listbox,
-            "expense_necesarios": self.necesarios_listbox,
-            "expense_innecesarios": self.innecesarios_listbox,
-        }
-
-        listbox = listbox_map.get(transaction_type)
+        listbox = self.listboxes.get(transaction_type)
         if not listbox:
             return
 
-        selection = listbox.curselection()
-        if not selection:
+        if not listbox.selected:
             self.show_warning_popup("Por favor selecciona una transacción para eliminar")
             return
 
-        # Get the transaction ID from the selected item
-        selected_text = listbox.get(selection[0])
-        transaction_id = (
-            selected_text.split(" | ID: ")[1] if " | ID: " in selected_text else None
+        # Selected rows can sit on pages the list has dropped since; they
+        # are fetched again so every selected row is deleted
+        listbox.load_selected_rows(
+            lambda selection: self.confirm_delete(transaction_type, listbox, selection)
         )
 
-        if transaction_id:
-            if self.show_confirmation_popup(
-                "Confirmar", "¿Estás seguro de que quieres eliminar esta transacción?"
-            ):
-                self.cursor.execute(
-                    "DELETE FROM transactions WHERE id = ?", (transaction_id,)
-                )
-                self.conn.commit()
-                self.load_data()
+    def confirm_delete(self, transaction_type, listbox, selection):
+        """Ask for confirmation, then delete the rows of ``selection``"""
+        if selection is None or len(selection) != len(listbox.selected):
+            self.show_warning_popup("La lista cambió; vuelve a seleccionar las transacciones")
+            return
+
+        if len(selection) == 1:
+            message = "¿Estás seguro de que quieres eliminar esta transacción?"
+        else:
+            message = f"¿Estás seguro de que quieres eliminar estas {len(selection)} transacciones?"
+        if not self.show_confirmation_popup("Confirmar", message):
+            return
+
+        # Timed from the confirmation, not counting the time spent deciding
+        started = metrics.start()
+
+        # The rows belong to the month on screen
+        month_key = self.displayed_month
+        ids = [row.id for _, row in selection]
+        amount = sum(row.amount for _, row in selection)
+
+        def delete(ledger):
+            # One executemany in one transaction, however many rows
+            ledger.delete_many(ids)
+            return ledger.type_aggregate(*month_key, transaction_type)
+
+        def remove_rows(listbox):
+            # The rows must still be where they were selected
+            for index, row in selection:
+                current = listbox.get_row(index)
+                if current is None or current.id != row.id:
+                    return False
+            listbox.remove_rows([index for index, _ in selection])
+            return True
+
+        def on_deleted(stored):
+            self.apply_delta(
+                month_key, transaction_type, -amount, -len(selection), stored, remove_rows
+            )
+            if len(selection) == 1:
                 self.show_success_popup("Transacción eliminada exitosamente!")
+            else:
+                self.show_success_popup(f"{len(selection)} transacciones eliminadas exitosamente!")
+            metrics.stop("delete_transaction", started)
+
+        self.db.submit(delete, on_deleted, self.on_database_error, label="delete_transaction")
+
+    def apply_delta(self, month_key, transaction_type, amount, count, stored, update_list):
+        """Reflect one write on screen without reloading the month.
+
+        ``stored`` is the (total, count) the database holds for the type
+        after the write, and ``update_list(listbox)`` edits the list in
+        place, returning False if it cannot. If either check fails the
+        month is reloaded instead.
+        """
+        if self.range_sums is not None:
+            self.range_sums.add(*month_key, transaction_type, amount, count)
+            self.report_window.refresh()
+            self.chart_panel.refresh()
+
+        if month_key != self.displayed_month:
+            # Not on screen: it is read again when shown
+            self.month_cache.invalidate(month_key)
+            return
+
+        summary = self.displayed_summary.with_delta(transaction_type, amount, count)
+        expected = (summary.totals[transaction_type], summary.counts[transaction_type])
+        if expected != tuple(stored) or not update_list(self.listboxes[transaction_type]):
+            self.month_cache.invalidate(month_key)
+            self.load_data()
+            return
+
+        self.show_summary(summary)
+        self.cache_displayed_month()
+
+    def cache_displayed_month(self):
+        """Keep the cached view of the displayed month in step with the screen"""
+        first_pages = {}
+        for listbox_type, listbox in self.listboxes.items():
+            page = listbox.loaded_page(0)
+            if page is not None:
+                first_pages[listbox_type] = page
+        self.month_cache.put(
+            self.displayed_month, MonthView(self.displayed_summary.aggregate_rows(), first_pages)
+        )
 
     def load_data(self):
-        """Load data from database and update UI for current month"""
-        # Clear all listboxes
-        listboxes = {
-            "income_fixed": self.fixed_listbox,
-            "income_variable": self.variable_listbox,
-            "expense_indispensable": self.indispensable_listbox,
-            "expense_necesarios": self.necesarios_listbox,
-            "expense_innecesarios": self.innecesarios_listbox,
-        }
+        """Show the current month, from the month cache or the database worker"""
+        month, year = self.current_month, self.current_year
+        started = metrics.start()
+        # A report of the month's quarter, year, ... and the chart of its
+        # last 12 months follow the month shown
+        self.report_window.refresh()
+        self.chart_panel.refresh()
+
+        view = self.month_cache.get((year, month))
+        if view is not None:
+            metrics.count("month cache hits")
+            # Drop any slower load still on its way for another month
+            self.db.cancel("month_load")
+            self.show_month(month, year, view)
+            self.prefetch_neighbours()
+            metrics.stop("load_data (cached)", started)
+            return
 
-        for listbox in listboxes.values():
-            listbox.delete(0, tk.END)
+        metrics.count("month cache misses")
+
+        # The totals arrive first and are shown with empty lists, which then
+        # fill in chunks as the worker reads them
+        def on_chunk(chunk):
+            transaction_type, rows = chunk
+            if transaction_type is None:
+                self.show_month(month, year, MonthView(rows, {}), streaming=True)
+                metrics.stop("load_data (first paint)", started)
+            else:
+                self.listboxes[transaction_type].stream_rows(0, rows)
+
+        def on_loaded(_):
+            for listbox in self.listboxes.values():
+                listbox.end_stream(0)
+            self.cache_displayed_month()
+            self.prefetch_neighbours()
+            metrics.stop("load_data", started)
+
+        # Only the types with a list are streamed: the totals can include
+        # others (legacy expense_custom rows, types added to the table)
+        list_types = frozenset(self.listboxes)
+
+        # A newer month load supersedes this one (fast ‹/› clicks)
+        self.db.submit(
+            lambda ledger: ledger.stream_month(year, month, LIST_PAGE_SIZE, LIST_CHUNK_SIZE, list_types),
+            on_loaded,
+            self.on_database_error,
+            key="month_load",
+            label="load_data",
+            on_chunk=on_chunk,
+        )
 
-        # Initialize totals
-        totals = {
-            "income_fixed": 0,
-            "income_variable": 0,
-            "expense_indispensable": 0,
-            "expense_necesarios": 0,
-            "expense_innecesarios": 0,
-        }
+    def prefetch_neighbours(self):
+        """Load the months next to the current one into the cache in the background"""
+        list_types = frozenset(self.listboxes)
+        for step in (-1, 1):
+            month, year = shift_month(self.current_month, self.current_year, step)
+            key = (year, month)
+            if key in self.month_cache or key in self.prefetching:
+                continue
+            self.prefetching.add(key)
+
+            def on_prefetched(view, key=key):
+                self.prefetching.discard(key)
+                self.month_cache.put(key, view)
+
+            def on_failed(error, key=key):
+                self.prefetching.discard(key)
+
+            self.db.submit(
+                lambda ledger, month=month, year=year: ledger.read_month(
+                    year, month, LIST_PAGE_SIZE, list_types
+                ),
+                on_prefetched,
+                on_failed,
+                label="prefetch",
+            )
+
+    def show_month(self, month, year, view, streaming=False):
+        """Update lists and summary labels from a month view.
 
-        # Load transactions for current month and year
-        for transaction_type in listboxes.keys():
-            self.cursor.execute(
-                "SELECT * FROM transactions WHERE type = ? AND month = ? AND year = ? ORDER BY date DESC",
-                (transaction_type, self.current_month, self.current_year),
+        With ``streaming`` the lists' first pages are on their way from a
+        month stream instead of being in ``view``.
+        """
+        self.displayed_month = (year, month)
+
+        # Totals, row counts, allocations and balance of the month
+        summary = MonthSummary.from_aggregates(view.aggregate_rows)
+
+        # Hand each list its row source; rows are fetched as they scroll into view
+        for transaction_type, listbox in self.listboxes.items():
+            first_page = view.first_pages.get(transaction_type)
+            listbox.set_source(
+                summary.counts[transaction_type],
+                self.make_page_fetcher(transaction_type, month, year),
+                pages={0: first_page} if first_page is not None else None,
+                streaming=streaming,
             )
-            transactions = self.cursor.fetchall()
-
-            for transaction in transactions:
-                # Handle both old and new schema
-                if len(transaction) == 6:  # Old schema
-                    id_val, _, amount, description, category, _ = transaction
-                else:  # New schema
-                    id_val, _, amount, description, category, _, _, _ = transaction
-
-                totals[transaction_type] += amount
-                display_text = (
-                    f"${amount:,.0f} - {description} ({category}) | ID: {id_val}"
-                )
-                listboxes[transaction_type].insert(tk.END, display_text)
-
-        # Calculate totals and automatic allocations
-        total_income = totals["income_fixed"] + totals["income_variable"]
-        total_expenses = (
-            totals["expense_indispensable"]
-            + totals["expense_necesarios"]
-            + totals["expense_innecesarios"]
-        )
 
-        # Automatic calculations (percentages of total income)
-        ahorro = total_income * 0.10
-        pago_deuda = total_income * 0.05
-        inversion = total_income * 0.10
-        total_otros = ahorro + pago_deuda + inversion
+        self.show_summary(summary)
 
-        # Final balance
-        balance = total_income - total_otros - total_expenses
+    def show_summary(self, summary):
+        """Update the totals, allocations and balance labels"""
+        self.displayed_summary = summary
+        totals = summary.totals
 
         # Update all labels
         self.income_fixed_label.config(
-            text=f"Ingresos Fijos: ${totals['income_fixed']:,.0f}"
+            text=f"Ingresos Fijos: {format_amount(totals['income_fixed'])}"
         )
         self.income_variable_label.config(
-            text=f"Ingresos Variables: ${totals['income_variable']:,.0f}"
+            text=f"Ingresos Variables: {format_amount(totals['income_variable'])}"
         )
-        self.total_income_label.config(text=f"Total Ingresos (A): ${total_income:,.0f}")
+        self.total_income_label.config(text=f"Total Ingresos (A): {format_amount(summary.total_income)}")
 
         self.indispensable_label.config(
-            text=f"Indispensables: ${totals['expense_indispensable']:,.0f}"
+            text=f"Indispensables: {format_amount(totals['expense_indispensable'])}"
         )
         self.necesarios_label.config(
-            text=f"Necesarios: ${totals['expense_necesarios']:,.0f}"
+            text=f"Necesarios: {format_amount(totals['expense_necesarios'])}"
         )
         self.innecesarios_label.config(
-            text=f"Innecesarios: ${totals['expense_innecesarios']:,.0f}"
+            text=f"Innecesarios: {format_amount(totals['expense_innecesarios'])}"
         )
         self.total_expenses_label.config(
-            text=f"Total Egresos (C): ${total_expenses:,.0f}"
+            text=f"Total Egresos (C): {format_amount(summary.total_expenses)}"
         )
 
-        self.ahorro_label.config(text=f"Ahorro (10%): ${ahorro:,.0f}")
-        self.deuda_label.config(text=f"Pago Deuda (5%): ${pago_deuda:,.0f}")
-        self.inversion_label.config(text=f"Inversión (10%): ${inversion:,.0f}")
+        self.ahorro_label.config(text=f"Ahorro (10%): {format_amount(summary.ahorro)}")
+        self.deuda_label.config(text=f"Pago Deuda (5%): {format_amount(summary.pago_deuda)}")
+        self.inversion_label.config(text=f"Inversión (10%): {format_amount(summary.inversion)}")
 
-        balance_color = "#4CAF50" if balance >= 0 else "#f44336"
+        balance_color = "#4CAF50" if summary.balance >= 0 else "#f44336"
         self.balance_label.config(
-            text=f"Balance Final: ${balance:,.0f}", fg=balance_color
+            text=f"Balance Final: {format_amount(summary.balance)}", fg=balance_color
         )
 
+    def make_page_fetcher(self, transaction_type, month, year):
+        """Return a fetch(offset, limit, callback) callable for one list of a month"""
+
+        def fetch(offset, limit, callback):
+            self.db.submit(
+                lambda ledger: ledger.month_page(year, month, transaction_type, offset, limit),
+                callback,
+                self.on_database_error,
+                label="list page",
+            )
+
+        return fetch
+
+    def on_database_error(self, error):
+        """Report a failed database job"""
+        self.show_error_popup(f"Error de base de datos: {error}")
+
+    def format_transaction(self, row):
+        """Format a Transaction for display"""
+        return f"{format_amount(row.amount)} - {row.description} ({row.category}) | ID: {row.id}"
+
     def __del__(self):
-        """Close database connection when app is destroyed"""
-        if hasattr(self, "conn"):
-            self.conn.close()
+        """Stop the backups and the database worker when app is destroyed"""
+        if getattr(self, "backups", None) is not None:
+            self.backups.close()
+        if hasattr(self, "db"):
+            self.db.close()
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Coiner - Gestor Financiero Personal")
+    parser.add_argument("--db", default=DEFAULT_PATH, help="database file")
+    parser.add_argument(
+        "--profile",
+        choices=sorted(STORAGE_PROFILES),
+        default=DEFAULT_PROFILE,
+        help="SQLite storage profile",
+    )
+    parser.add_argument("--backup-dir", default=BACKUP_DIR, help="directory for the automatic backups")
+    parser.add_argument(
+        "--backup-interval",
+        type=int,
+        default=DEFAULT_INTERVAL,
+        help="minutes between automatic backups (0 disables them)",
+    )
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = FinanceApp(root)
+    app = FinanceApp(root, args.db, args.profile, args.backup_dir, args.backup_interval)
 
     def on_closing():
-        if hasattr(app, "conn"):
-            app.conn.close()
+        if app.backups is not None:
+            app.backups.close()
+        if hasattr(app, "db"):
+            app.db.close()
         root.destroy()
 
     root.protocol("WM_DELETE_WINDOW", on_closing)
@@ -1,55 +1,414 @@
-import sqlite3
-import os
+import argparse
+import time
 
-def migrate_database():
-    """Migrate the existing database to the new schema"""
+from aggregates import AGGREGATES_TABLE_SQL, create_aggregates
+from money import MINOR_UNITS
+from search import INDEX_RANGE_SQL, SEARCH_TABLE_SQL, create_search
+from storage import DEFAULT_PATH, DEFAULT_PROFILE, STORAGE_PROFILES, connect
 
-    # Backup the existing database
-    if os.path.exists("finance.db"):
-        os.rename("finance.db", "finance_backup.db")
-        print("📦 Backed up existing database to finance_backup.db")
+# Types a new database starts with, and the categories offered for each
+# (from HolaMundo.xlsx). More can be added as rows of transaction_types and
+# categories; a type's name starts with "income_" or "expense_".
+DEFAULT_CATEGORIES = {
+    "income_fixed": [
+        "Padres",
+        "CDT intereses",
+        "Salario",
+        "Pensión",
+        "Arriendo recibido",
+        "Otro",
+    ],
+    "income_variable": [
+        "Freelance",
+        "Trabajos AI",
+        "Show de magia",
+        "Proyectos",
+        "Retorno Pizza",
+        "Consultoría",
+        "Otro",
+    ],
+    "expense_indispensable": [
+        "Arriendo",
+        "Servicios públicos",
+        "Alimentación básica",
+        "Transporte público",
+        "Seguro médico",
+        "Medicamentos",
+        "Otro",
+    ],
+    "expense_necesarios": [
+        "Adobe",
+        "Overleaf",
+        "BodyTech",
+        "YT Premium",
+        "Claude",
+        "Hostinger",
+        "Netflix",
+        "Spotify",
+        "Internet",
+        "Teléfono",
+        "Otro",
+    ],
+    "expense_innecesarios": [
+        "Pizza",
+        "Café",
+        "Chocolates",
+        "Sr.wok",
+        "Bolos",
+        "Entretenimiento",
+        "Platziconf",
+        "Desodorante",
+        "Café Quindio",
+        "Camisa Fisica",
+        "Otro",
+    ],
+}
 
-    # Create new database with updated schema
-    conn = sqlite3.connect("finance.db")
+TRANSACTION_TYPES_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS transaction_types (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE  -- 'income_fixed', 'expense_necesarios', ...
+    )
+"""
+
+CATEGORIES_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS categories (
+        id INTEGER PRIMARY KEY,
+        type_id INTEGER NOT NULL REFERENCES transaction_types (id),
+        name TEXT NOT NULL,
+        UNIQUE (type_id, name)
+    )
+"""
+
+TRANSACTIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        type_id INTEGER NOT NULL REFERENCES transaction_types (id),
+        amount INTEGER NOT NULL,  -- minor units (centavos)
+        description TEXT NOT NULL,
+        category_id INTEGER NOT NULL REFERENCES categories (id),
+        month INTEGER NOT NULL,
+        year INTEGER NOT NULL,
+        date TEXT NOT NULL,
+        import_key TEXT  -- source row of imported transactions, for upserts
+    )
+"""
+
+# Composite index used by the month load in main.py
+MONTH_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_transactions_month
+    ON transactions (year, month, type_id, date)
+"""
+
+# Lets import_xlsx.py upsert the rows it created in an earlier import
+IMPORT_KEY_INDEX_SQL = """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_import_key
+    ON transactions (import_key) WHERE import_key IS NOT NULL
+"""
+
+# The transactions table of schema versions 1 to 4, with the type and
+# category names stored in every row
+TEXT_TRANSACTIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        type TEXT NOT NULL,
+        amount INTEGER NOT NULL,
+        description TEXT NOT NULL,
+        category TEXT NOT NULL,
+        month INTEGER NOT NULL,
+        year INTEGER NOT NULL,
+        date TEXT NOT NULL,
+        import_key TEXT
+    )
+"""
+
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def table_columns(cursor, table):
+    """Return {column name: declared type} for a table (empty if missing)"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1]: row[2].upper() for row in cursor.fetchall()}
+
+
+def legacy_columns(cursor):
+    """SELECT expressions (on alias t) for the amount, month, year and
+    import_key of any earlier transactions table.
+
+    Baseline databases store REAL amounts, the oldest ones have no
+    month/year columns (they come from the date) and import_key only
+    exists from v2 on, so v5 can copy a table of any of those shapes in a
+    single pass.
+    """
+    columns = table_columns(cursor, "transactions")
+    if columns.get("amount") == "INTEGER":
+        amount = "t.amount"
+    else:
+        amount = f"CAST(ROUND(t.amount * {MINOR_UNITS}) AS INTEGER)"
+    if "month" in columns:
+        month, year = "t.month", "t.year"
+    else:
+        month = "CAST(substr(trim(t.date), 6, 2) AS INTEGER)"
+        year = "CAST(substr(trim(t.date), 1, 4) AS INTEGER)"
+    import_key = "t.import_key" if "import_key" in columns else "NULL"
+    return amount, month, year, import_key
+
+
+def migrate_amounts(conn, batch_size, progress):
+    """v1: integer amounts and month/year columns.
+
+    The conversion happens in v5's copy, so an old database is rewritten
+    once. Here only a partial copy left by an interrupted run of the
+    earlier separate conversion is dropped; the original table is intact.
+    """
     cursor = conn.cursor()
+    cursor.execute("DROP TABLE IF EXISTS transactions_new")
+    cursor.execute(TEXT_TRANSACTIONS_TABLE_SQL.format(name="transactions"))
 
-    # Create transactions table with new schema
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS transactions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            type TEXT NOT NULL,
-            amount REAL NOT NULL,
-            description TEXT NOT NULL,
-            category TEXT NOT NULL,
-            month INTEGER NOT NULL,
-            year INTEGER NOT NULL,
-            date TEXT NOT NULL
-        )
+
+def migrate_import_key(conn, batch_size, progress):
+    """v2: import_key column for upserting imported rows"""
+    cursor = conn.cursor()
+    if "import_key" not in table_columns(cursor, "transactions"):
+        cursor.execute("ALTER TABLE transactions ADD COLUMN import_key TEXT")
+
+
+def superseded(conn, batch_size, progress):
+    """A migration whose work a later one redoes from scratch.
+
+    v3 (indexes) and v4 (monthly aggregates) built on the text columns that
+    v5 replaces; v5 creates both again for the new table.
     """
-    )
 
-    # Create monthly budgets table
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS monthly_budgets (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            month INTEGER NOT NULL,
-            year INTEGER NOT NULL,
-            total_income REAL DEFAULT 0,
-            ahorro_percentage REAL DEFAULT 0.10,
-            deuda_percentage REAL DEFAULT 0.05,
-            inversion_percentage REAL DEFAULT 0.10,
-            UNIQUE(month, year)
-        )
+
+def normalize_transactions(conn, batch_size, progress):
+    """v5: transaction_types and categories tables, referenced by integer ids.
+
+    Rows are copied into the new table in id-ordered batches, each its own
+    transaction, and an interrupted run resumes from the last copied id.
+    The copy also converts REAL amounts and fills month/year for databases
+    from before v1 (``legacy_columns``), so it is the only rewrite of the
+    table an upgrade does.
+    Every batch first adds the type and category names it uses to the
+    lookup tables, then copies its rows with their ids and sums its monthly
+    aggregates while the rows are still in the page cache. The swap, the
+    indexes and the triggers are left for upgrade_database to commit with
+    the version.
     """
+    cursor = conn.cursor()
+    amount, month, year, import_key = legacy_columns(cursor)
+    cursor.execute(TRANSACTION_TYPES_TABLE_SQL)
+    cursor.execute(CATEGORIES_TABLE_SQL)
+    cursor.executemany(
+        "INSERT OR IGNORE INTO transaction_types (id, name) VALUES (?, ?)",
+        enumerate(DEFAULT_CATEGORIES, 1),
+    )
+    cursor.executemany(
+        "INSERT OR IGNORE INTO categories (type_id, name) "
+        "SELECT id, ? FROM transaction_types WHERE name = ?",
+        (
+            (category, transaction_type)
+            for transaction_type, categories in DEFAULT_CATEGORIES.items()
+            for category in categories
+        ),
     )
+    cursor.execute(TRANSACTIONS_TABLE_SQL.format(name="transactions_normalized"))
+    cursor.execute(AGGREGATES_TABLE_SQL.format(name="monthly_aggregates_normalized"))
+    conn.commit()
+
+    cursor.execute("SELECT COUNT(*) FROM transactions")
+    total = cursor.fetchone()[0]
+    cursor.execute("SELECT COALESCE(MAX(id), 0), COUNT(*) FROM transactions_normalized")
+    last_id, copied = cursor.fetchone()
 
+    while True:
+        cursor.execute(
+            "SELECT MAX(id) FROM (SELECT id FROM transactions WHERE id > ? ORDER BY id LIMIT ?)",
+            (last_id, batch_size),
+        )
+        batch_end = cursor.fetchone()[0]
+        if batch_end is None:
+            break
+        batch = (last_id, batch_end)
+
+        cursor.execute(
+            """
+            INSERT OR IGNORE INTO transaction_types (name)
+            SELECT DISTINCT type FROM transactions WHERE id > ? AND id <= ?
+            """,
+            batch,
+        )
+        cursor.execute(
+            """
+            INSERT OR IGNORE INTO categories (type_id, name)
+            SELECT DISTINCT tt.id, t.category
+            FROM transactions t JOIN transaction_types tt ON tt.name = t.type
+            WHERE t.id > ? AND t.id <= ?
+            """,
+            batch,
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO transactions_normalized
+                (id, type_id, amount, description, category_id, month, year, date, import_key)
+            SELECT t.id, tt.id, {amount}, t.description, c.id, {month}, {year}, t.date, {import_key}
+            FROM transactions t
+            JOIN transaction_types tt ON tt.name = t.type
+            JOIN categories c ON c.type_id = tt.id AND c.name = t.category
+            WHERE t.id > ? AND t.id <= ?
+            """,
+            batch,
+        )
+        copied += cursor.rowcount
+        cursor.execute(
+            """
+            INSERT INTO monthly_aggregates_normalized (year, month, type_id, total, count)
+            SELECT year, month, type_id, SUM(amount), COUNT(*)
+            FROM transactions_normalized
+            WHERE id > ? AND id <= ?
+            GROUP BY year, month, type_id
+            ON CONFLICT (year, month, type_id) DO UPDATE
+            SET total = total + excluded.total, count = count + excluded.count
+            """,
+            batch,
+        )
+        conn.commit()
+        last_id = batch_end
+        if progress:
+            progress(copied, total)
+
+    # Dropping the old table also drops its indexes and triggers
+    cursor.execute("BEGIN")
+    cursor.execute("DROP TABLE transactions")
+    cursor.execute("ALTER TABLE transactions_normalized RENAME TO transactions")
+    cursor.execute("DROP TABLE IF EXISTS monthly_aggregates")
+    cursor.execute("ALTER TABLE monthly_aggregates_normalized RENAME TO monthly_aggregates")
+    # monthly_aggregates replaces the baseline's monthly_budgets, which
+    # nothing reads or writes
+    cursor.execute("DROP TABLE IF EXISTS monthly_budgets")
+    cursor.execute(MONTH_INDEX_SQL)
+    cursor.execute(IMPORT_KEY_INDEX_SQL)
+    create_aggregates(cursor)
+
+
+def index_search(conn, batch_size, progress):
+    """v6: full-text search index of descriptions and categories.
+
+    Filled in id-ordered batches that commit as they go, so an interrupted
+    run resumes after the last indexed id. The triggers that keep it
+    current are left for upgrade_database to commit with the version.
+    """
+    cursor = conn.cursor()
+    cursor.execute(SEARCH_TABLE_SQL)
     conn.commit()
+
+    cursor.execute("SELECT COUNT(*) FROM transactions")
+    total = cursor.fetchone()[0]
+    cursor.execute("SELECT rowid FROM transactions_search ORDER BY rowid DESC LIMIT 1")
+    row = cursor.fetchone()
+    last_id = row[0] if row else 0
+    cursor.execute("SELECT COUNT(*) FROM transactions WHERE id <= ?", (last_id,))
+    indexed = cursor.fetchone()[0]
+
+    while True:
+        cursor.execute(
+            "SELECT MAX(id) FROM (SELECT id FROM transactions WHERE id > ? ORDER BY id LIMIT ?)",
+            (last_id, batch_size),
+        )
+        batch_end = cursor.fetchone()[0]
+        if batch_end is None:
+            break
+        cursor.execute(INDEX_RANGE_SQL, (last_id, batch_end))
+        indexed += cursor.rowcount
+        conn.commit()
+        last_id = batch_end
+        if progress:
+            progress(indexed, total)
+
+    cursor.execute("BEGIN")
+    create_search(cursor)
+
+
+# (version, description, migration) in order. A database at version N has
+# had migrations 1..N applied; PRAGMA user_version stores N. Databases
+# from before versioning are at 0, whatever their shape, so every
+# migration must also be a no-op on a database that already has it.
+MIGRATIONS = [
+    (1, "integer amounts", migrate_amounts),
+    (2, "import_key column", migrate_import_key),
+    (3, "indexes", superseded),
+    (4, "monthly aggregates", superseded),
+    (5, "type and category ids", normalize_transactions),
+    (6, "full-text search", index_search),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def upgrade_database(conn, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Bring an open database to SCHEMA_VERSION, in place.
+
+    Each pending migration runs in its own transaction together with the
+    bump of user_version, so an interrupted upgrade restarts at the first
+    migration that did not finish; batched ones commit as they go and
+    resume from their last batch. ``progress(version, description, done,
+    total)`` is called when a migration starts (done and total None) and
+    after every batch. A current database costs one PRAGMA read.
+    """
+    version = schema_version(conn)
+    if version == SCHEMA_VERSION:
+        return
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {version} is newer than this version of Coiner ({SCHEMA_VERSION})"
+        )
+
+    for target, description, migration in MIGRATIONS:
+        if target <= version:
+            continue
+        if progress:
+            progress(target, description, None, None)
+            report = lambda done, total: progress(target, description, done, total)
+        else:
+            report = None
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        migration(conn, batch_size, report)
+        conn.execute(f"PRAGMA user_version = {target}")
+        conn.commit()
+
+
+def migrate_database(path=DEFAULT_PATH, batch_size=DEFAULT_BATCH_SIZE, profile=DEFAULT_PROFILE):
+    """Migrate the database at ``path`` to the current schema, in place"""
+    conn = connect(path, profile)
+    version = schema_version(conn)
+
+    def report(target, description, done, total):
+        # Batch counts overwrite each other on one line
+        if done is None:
+            print(f"\n🔄 v{target}: {description}", end="")
+        else:
+            print(f"\r🔄 v{target}: {description}: {done:,}/{total:,} transactions", end="")
+
+    start = time.perf_counter()
+    upgrade_database(conn, batch_size, report)
     conn.close()
 
-    print("✅ Database migrated successfully!")
-    print("🗃️  New schema created with month/year columns")
+    if version >= SCHEMA_VERSION:
+        print(f"✅ Database already at schema version {version}")
+    else:
+        print(f"\n\n✅ Database migrated from v{version} to v{SCHEMA_VERSION} in {time.perf_counter() - start:.1f} s")
+
 
 if __name__ == "__main__":
-    migrate_database()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Migrate finance.db to the current schema")
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--profile", choices=sorted(STORAGE_PROFILES), default=DEFAULT_PROFILE)
+    args = parser.parse_args()
+
+    migrate_database(args.db, args.batch_size, args.profile)
@@ -0,0 +1,37 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+# Amounts are stored as integer minor units (centavos) so sums are exact
+MINOR_UNITS = 100
+
+
+def parse_amount(text):
+    """Parse user input such as "1,500.50" or "$ 20000" into minor units"""
+    cleaned = str(text).strip().replace("$", "").replace(",", "").strip()
+    try:
+        value = Decimal(cleaned)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {text!r}")
+    if not value.is_finite():
+        raise ValueError(f"Invalid amount: {text!r}")
+    return to_minor(value)
+
+
+def to_minor(value):
+    """Convert an amount in pesos (int, float, str or Decimal) to minor units"""
+    if isinstance(value, int):
+        return value * MINOR_UNITS
+    if isinstance(value, float):
+        value = repr(value)
+    minor = (Decimal(value) * MINOR_UNITS).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+    return int(minor)
+
+
+def percentage(minor, percent):
+    """Exact ``percent`` % of an amount in minor units, rounded half up"""
+    return int((Decimal(minor) * percent / 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def format_amount(minor):
+    """Format minor units as whole pesos, e.g. 123456700 -> "$1,234,567" """
+    pesos = (Decimal(minor) / MINOR_UNITS).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+    return f"${pesos:,}"
@@ -0,0 +1,66 @@
+import sys
+from collections import OrderedDict
+
+
+def estimate_rows_size(rows):
+    """Rough memory footprint in bytes of a list of row tuples or __slots__ objects"""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        values = row if isinstance(row, tuple) else (getattr(row, name) for name in row.__slots__)
+        size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in values)
+    return size
+
+
+class MonthView:
+    """Everything needed to render a month without touching the database:
+    its aggregate rows and the first page of every transaction list."""
+
+    def __init__(self, aggregate_rows, first_pages):
+        self.aggregate_rows = aggregate_rows
+        self.first_pages = first_pages
+        self.size = estimate_rows_size(aggregate_rows) + sum(
+            estimate_rows_size(rows) for rows in first_pages.values()
+        )
+
+
+class MonthCache:
+    """LRU cache of MonthView objects keyed by (year, month), kept within a
+    memory budget in bytes. Only used from the Tk thread."""
+
+    def __init__(self, budget=8 * 1024 * 1024):
+        self.budget = budget
+        self.views = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        return key in self.views
+
+    def get(self, key):
+        view = self.views.get(key)
+        if view is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.views.move_to_end(key)
+        return view
+
+    def put(self, key, view):
+        self.invalidate(key)
+        if view.size > self.budget:
+            return
+        self.views[key] = view
+        self.size += view.size
+        while self.size > self.budget:
+            _, evicted = self.views.popitem(last=False)
+            self.size -= evicted.size
+
+    def invalidate(self, key):
+        view = self.views.pop(key, None)
+        if view is not None:
+            self.size -= view.size
+
+    def clear(self):
+        self.views.clear()
+        self.size = 0
@@ -0,0 +1,109 @@
+import tkinter as tk
+from collections import deque
+
+# Accent color and seconds on screen for each kind of message
+TOAST_STYLES = {
+    "info": ("#2196F3", 2.0),
+    "success": ("#4CAF50", 1.5),
+    "warning": ("#FF9800", 3.0),
+    "error": ("#f44336", 4.0),
+}
+
+
+def blend_color(start, end, t):
+    """Mix two "#rrggbb" colors, ``t`` going from 0 (start) to 1 (end)"""
+    a = [int(start[i:i + 2], 16) for i in (1, 3, 5)]
+    b = [int(end[i:i + 2], 16) for i in (1, 3, 5)]
+    return "#%02x%02x%02x" % tuple(round(x + (y - x) * t) for x, y in zip(a, b))
+
+
+class ToastNotifier:
+    """Non-modal notifications shown in one reused widget.
+
+    The toast is built once and placed over the bottom of the window when
+    there is something to say. Messages queue up and are shown in turn;
+    while others are waiting each one stays on screen for a shorter time.
+    It never grabs input, so typing continues while it is visible, and it
+    fades out by blending its colors into the background.
+    """
+
+    def __init__(self, root, bg="#3a3a3a", fg="#ffffff", fade_steps=8, fade_interval=30, max_queue=5):
+        self.root = root
+        self.bg = bg
+        self.fg = fg
+        self.fade_steps = fade_steps
+        self.fade_interval = fade_interval
+        self.messages = deque(maxlen=max_queue)
+        self.showing = False
+        self.fading = False
+        self.after_id = None
+
+        self.frame = tk.Frame(root, bg=bg, bd=0, highlightthickness=0)
+        self.accent = tk.Frame(self.frame, bg=bg, width=6)
+        self.accent.pack(side="left", fill="y")
+        self.label = tk.Label(
+            self.frame,
+            font=("Poppins", 11),
+            fg=fg,
+            bg=bg,
+            wraplength=520,
+            justify="left",
+            padx=16,
+            pady=10,
+        )
+        self.label.pack(side="left")
+
+        # Clicking the toast dismisses it
+        self.frame.bind("<Button-1>", lambda e: self.dismiss())
+        self.label.bind("<Button-1>", lambda e: self.dismiss())
+
+    def show(self, message, kind="info"):
+        """Queue a message; it is shown as soon as the toast is free"""
+        if self.messages and self.messages[-1] == (message, kind):
+            return
+        self.messages.append((message, kind))
+        if not self.showing:
+            self.show_next()
+        elif not self.fading and len(self.messages) == 1:
+            # Someone is waiting: cut the current message short
+            self.root.after_cancel(self.after_id)
+            self.after_id = self.root.after(400, self.fade, 0)
+
+    def show_next(self):
+        if not self.messages:
+            self.showing = False
+            self.fading = False
+            self.frame.place_forget()
+            return
+
+        message, kind = self.messages.popleft()
+        accent, seconds = TOAST_STYLES.get(kind, TOAST_STYLES["info"])
+        self.current_accent = accent
+        self.showing = True
+        self.fading = False
+
+        self.label.config(text=message, fg=self.fg)
+        self.accent.config(bg=accent)
+        self.frame.place(relx=0.5, rely=1.0, y=-24, anchor="s")
+        self.frame.lift()
+
+        duration = seconds * 1000 if not self.messages else 400
+        self.after_id = self.root.after(int(duration), self.fade, 0)
+
+    def fade(self, step):
+        """Blend the text and accent into the background, then show the next message"""
+        self.fading = True
+        if step >= self.fade_steps:
+            self.after_id = None
+            self.show_next()
+            return
+        t = (step + 1) / self.fade_steps
+        self.label.config(fg=blend_color(self.fg, self.bg, t))
+        self.accent.config(bg=blend_color(self.current_accent, self.bg, t))
+        self.after_id = self.root.after(self.fade_interval, self.fade, step + 1)
+
+    def dismiss(self):
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+        self.after_id = None
+        self.show_next()
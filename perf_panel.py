@@ -0,0 +1,129 @@
+import tkinter as tk
+
+# Where "Exportar" appends the metrics, one JSON object per line
+EXPORT_PATH = "coiner-metrics.jsonl"
+
+
+class PerformancePanel:
+    """Hidden window with the live contents of a Metrics instance.
+
+    Built the first time it is toggled on; while visible it refreshes
+    itself every ``refresh_interval`` ms and costs nothing when hidden.
+    """
+
+    def __init__(self, root, metrics, refresh_interval=1000):
+        self.root = root
+        self.metrics = metrics
+        self.refresh_interval = refresh_interval
+        self.window = None
+        self.after_id = None
+
+    def toggle(self):
+        if self.window is None:
+            self.build()
+        if self.window.winfo_viewable():
+            self.hide()
+        else:
+            self.window.deiconify()
+            self.window.lift()
+            self.refresh()
+
+    def hide(self):
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.window.withdraw()
+
+    def build(self):
+        window = tk.Toplevel(self.root)
+        window.withdraw()
+        window.title("Coiner - Rendimiento")
+        window.geometry("820x520")
+        window.configure(bg="#2c2c2c")
+        window.protocol("WM_DELETE_WINDOW", self.hide)
+        window.bind("<F12>", lambda e: self.hide())
+
+        buttons = tk.Frame(window, bg="#2c2c2c")
+        buttons.pack(fill="x", padx=10, pady=(10, 0))
+
+        button_options = dict(
+            bg="#404040",
+            fg="white",
+            activebackground="#505050",
+            activeforeground="white",
+            relief="flat",
+            bd=0,
+            padx=12,
+            pady=4,
+            font=("Poppins", 9, "bold"),
+        )
+        self.toggle_button = tk.Button(buttons, command=self.toggle_metrics, **button_options)
+        self.toggle_button.pack(side="left")
+        tk.Button(buttons, text="Reiniciar", command=self.reset, **button_options).pack(
+            side="left", padx=8
+        )
+        tk.Button(buttons, text="Exportar JSONL", command=self.export, **button_options).pack(
+            side="left"
+        )
+
+        self.status_label = tk.Label(
+            buttons, fg="#9ca3af", bg="#2c2c2c", font=("Poppins", 9), anchor="e"
+        )
+        self.status_label.pack(side="right")
+
+        self.text = tk.Text(
+            window,
+            font=("Courier", 9),
+            bg="#3a3a3a",
+            fg="#e0e0e0",
+            relief="flat",
+            bd=0,
+            highlightthickness=0,
+            wrap="none",
+        )
+        self.text.pack(fill="both", expand=True, padx=10, pady=10)
+        self.window = window
+
+    def refresh(self):
+        """Redraw the tables and schedule the next refresh"""
+        self.toggle_button.config(
+            text="Desactivar métricas" if self.metrics.enabled else "Activar métricas"
+        )
+        snapshot = self.metrics.snapshot()
+
+        lines = [f"{'nombre':<52} {'n':>7} {'media':>9} {'p50':>9} {'p95':>9} {'máx':>9}"]
+        for name, stats in sorted(snapshot["histograms"].items()):
+            lines.append(
+                f"{name[:52]:<52} {stats['count']:>7} {stats['mean']:>9.2f} "
+                f"{stats['p50']:>9.2f} {stats['p95']:>9.2f} {stats['max']:>9.2f}"
+            )
+        lines.append("")
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"{name:<52} {value:>7}")
+        if not self.metrics.enabled:
+            lines.append("")
+            lines.append("Las métricas están desactivadas (COINER_METRICS=1 las activa al iniciar).")
+
+        self.text.config(state="normal")
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", "\n".join(lines))
+        self.text.config(state="disabled")
+
+        self.after_id = self.root.after(self.refresh_interval, self.refresh)
+
+    def toggle_metrics(self):
+        self.metrics.enabled = not self.metrics.enabled
+        self.restart_refresh()
+
+    def reset(self):
+        self.metrics.reset()
+        self.restart_refresh()
+
+    def export(self):
+        count = self.metrics.export_jsonl(EXPORT_PATH)
+        self.status_label.config(text=f"{count} líneas agregadas a {EXPORT_PATH}")
+
+    def restart_refresh(self):
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+        self.refresh()
@@ -0,0 +1,209 @@
+import tkinter as tk
+
+from money import format_amount
+from reports import TYPE_LABELS, report_range
+
+# Range buttons: (label, kind for report_range)
+RANGE_BUTTONS = [
+    ("Mes", "month"),
+    ("Trimestre", "quarter"),
+    ("Año", "year"),
+    ("Últimos 12 meses", "trailing12"),
+]
+
+# Rows of the breakdown, as in the main window's summary section:
+# (key, font, color) on the left and the row's total on the right
+SUMMARY_ROWS = [
+    (
+        [
+            ("income_fixed", ("Poppins", 11, "bold"), "#4CAF50"),
+            ("income_variable", ("Poppins", 11, "bold"), "#4CAF50"),
+        ],
+        ("total_income", ("Poppins", 12, "bold"), "#66BB6A"),
+    ),
+    (
+        [
+            ("expense_indispensable", ("Poppins", 10), "#FF7043"),
+            ("expense_necesarios", ("Poppins", 10), "#FF7043"),
+            ("expense_innecesarios", ("Poppins", 10), "#FF7043"),
+        ],
+        ("total_expenses", ("Poppins", 12, "bold"), "#FF5722"),
+    ),
+    (
+        [
+            ("ahorro", ("Poppins", 10), "#81C784"),
+            ("pago_deuda", ("Poppins", 10), "#FFB74D"),
+            ("inversion", ("Poppins", 10), "#64B5F6"),
+        ],
+        ("balance", ("Poppins", 14, "bold"), "white"),
+    ),
+]
+
+LABELS = dict(
+    TYPE_LABELS,
+    total_income="Total Ingresos (A)",
+    total_expenses="Total Egresos (C)",
+    ahorro="Ahorro (10%)",
+    pago_deuda="Pago Deuda (5%)",
+    inversion="Inversión (10%)",
+    balance="Balance Final",
+)
+
+
+def month_text(year, month):
+    return f"{month:02d}/{year}"
+
+
+def parse_month_text(text):
+    """(year, month) of "MM/AAAA"; raises ValueError"""
+    month, year = map(int, text.strip().split("/"))
+    if not 1 <= month <= 12:
+        raise ValueError(text)
+    return year, month
+
+
+class ReportWindow:
+    """Hidden window with the totals, allocations and balance of a range of
+    months: the month shown in the main window's quarter, year, trailing
+    12 months, or any span typed in.
+
+    Built the first time it is shown. Reports come from a RangeSums the
+    app hands over with ``set_sums`` and keeps current; call ``refresh``
+    after it changes.
+    """
+
+    def __init__(self, root, current_month):
+        """``current_month()`` returns the (month, year) the app shows"""
+        self.root = root
+        self.current_month = current_month
+        self.sums = None
+        self.kind = "quarter"
+        self.span = None
+        self.window = None
+        self.visible = False
+
+    def show(self):
+        if self.window is None:
+            self.build()
+        self.visible = True
+        self.window.deiconify()
+        self.window.lift()
+        self.refresh()
+
+    def hide(self):
+        self.visible = False
+        self.window.withdraw()
+
+    def set_sums(self, sums):
+        self.sums = sums
+        self.refresh()
+
+    def build(self):
+        window = tk.Toplevel(self.root)
+        window.withdraw()
+        window.title("Coiner - Reportes")
+        window.geometry("1000x300")
+        window.configure(bg="#2c2c2c")
+        window.protocol("WM_DELETE_WINDOW", self.hide)
+        window.bind("<Escape>", lambda e: self.hide())
+
+        button_options = dict(
+            bg="#404040",
+            fg="white",
+            activebackground="#505050",
+            activeforeground="white",
+            relief="flat",
+            bd=0,
+            padx=12,
+            pady=4,
+            font=("Poppins", 9, "bold"),
+        )
+        entry_options = dict(
+            font=("Poppins", 10),
+            bg="#404040",
+            fg="white",
+            insertbackground="white",
+            relief="flat",
+            bd=4,
+            highlightthickness=0,
+            width=8,
+        )
+
+        buttons = tk.Frame(window, bg="#2c2c2c")
+        buttons.pack(fill="x", padx=10, pady=(10, 0))
+        for text, kind in RANGE_BUTTONS:
+            tk.Button(
+                buttons, text=text, command=lambda kind=kind: self.select(kind), **button_options
+            ).pack(side="left", padx=(0, 8))
+
+        tk.Button(buttons, text="Ver", command=self.select_span, **button_options).pack(side="right")
+        self.end_entry = tk.Entry(buttons, **entry_options)
+        self.end_entry.pack(side="right", padx=8)
+        tk.Label(buttons, text="hasta", fg="#9ca3af", bg="#2c2c2c", font=("Poppins", 9)).pack(side="right")
+        self.start_entry = tk.Entry(buttons, **entry_options)
+        self.start_entry.pack(side="right", padx=8)
+        tk.Label(buttons, text="Desde", fg="#9ca3af", bg="#2c2c2c", font=("Poppins", 9)).pack(side="right")
+        for entry in (self.start_entry, self.end_entry):
+            entry.bind("<Return>", lambda e: self.select_span())
+
+        self.range_label = tk.Label(
+            window, font=("Poppins", 16, "bold"), fg="#f3f4f6", bg="#2c2c2c"
+        )
+        self.range_label.pack(pady=(15, 10))
+
+        self.labels = {}
+        for items, (total_key, total_font, total_color) in SUMMARY_ROWS:
+            row = tk.Frame(window, bg="#2c2c2c")
+            row.pack(fill="x", padx=10, pady=4)
+            for key, font, color in items:
+                self.labels[key] = tk.Label(row, font=font, fg=color, bg="#2c2c2c")
+                self.labels[key].pack(side="left", padx=15)
+            self.labels[total_key] = tk.Label(row, font=total_font, fg=total_color, bg="#2c2c2c")
+            self.labels[total_key].pack(side="right", padx=15)
+        self.window = window
+
+    def select(self, kind):
+        self.kind = kind
+        self.span = None
+        self.refresh()
+
+    def select_span(self):
+        try:
+            start = parse_month_text(self.start_entry.get())
+            end = parse_month_text(self.end_entry.get() or self.start_entry.get())
+        except ValueError:
+            self.range_label.config(text="Usa el formato MM/AAAA")
+            return
+        self.span = (min(start, end), max(start, end))
+        self.refresh()
+
+    def refresh(self):
+        """Show the selected range again, if the window is visible"""
+        if not self.visible:
+            return
+
+        if self.span is not None:
+            start, end = self.span
+        else:
+            month, year = self.current_month()
+            start, end = report_range(self.kind, year, month)
+        span_text = month_text(*start) if start == end else f"{month_text(*start)} - {month_text(*end)}"
+
+        if self.sums is None:
+            self.range_label.config(text=f"{span_text} (cargando...)")
+            return
+        self.range_label.config(text=span_text)
+
+        summary = self.sums.summary(start, end)
+        values = dict(
+            summary.totals,
+            total_income=summary.total_income,
+            total_expenses=summary.total_expenses,
+            ahorro=summary.ahorro,
+            pago_deuda=summary.pago_deuda,
+            inversion=summary.inversion,
+            balance=summary.balance,
+        )
+        for key, label in self.labels.items():
+            label.config(text=f"{LABELS[key]}: {format_amount(values.get(key, 0))}")
+        self.labels["balance"].config(fg="#4CAF50" if summary.balance >= 0 else "#f44336")
@@ -0,0 +1,180 @@
+import argparse
+
+from ledger import EXPENSE_TYPES, INCOME_TYPES, TRANSACTION_TYPES, Ledger, MonthSummary
+from money import format_amount
+from storage import DEFAULT_PATH
+
+# Ranges a report can cover, ending at (or containing) a given month
+RANGE_KINDS = ("month", "quarter", "year", "trailing12")
+
+# Labels of the report breakdown, in the order of the app's summary section
+TYPE_LABELS = {
+    "income_fixed": "Ingresos Fijos",
+    "income_variable": "Ingresos Variables",
+    "expense_indispensable": "Indispensables",
+    "expense_necesarios": "Necesarios",
+    "expense_innecesarios": "Innecesarios",
+}
+
+
+def month_index(year, month):
+    return year * 12 + month - 1
+
+
+def report_range(kind, year, month):
+    """(start, end) (year, month) pairs of the ``kind`` range of a month:
+    the month itself, its quarter, its year or the 12 months ending in it"""
+    if kind == "month":
+        return (year, month), (year, month)
+    if kind == "quarter":
+        first = (month - 1) // 3 * 3 + 1
+        return (year, first), (year, first + 2)
+    if kind == "year":
+        return (year, 1), (year, 12)
+    if kind == "trailing12":
+        start = month_index(year, month) - 11
+        return (start // 12, start % 12 + 1), (year, month)
+    raise ValueError(f"Unknown range: {kind!r}")
+
+
+class RangeSums:
+    """Running totals and counts of every type, month by month, so the
+    summary of any range of months is two lookups per type.
+
+    ``totals[type][i]`` is the sum of the type's amounts over every month
+    up to ``first + i`` (a month index); a range is the difference of the
+    running sums at its ends. Built from ``monthly_aggregates`` and then
+    kept current by ``add`` as transactions are entered or deleted; a
+    write rewrites the running sums from its month on, which is at most a
+    few hundred months.
+    """
+
+    def __init__(self, rows):
+        """``rows``: ((year, month), MonthSummary) pairs, in any order"""
+        months = {month_index(*key): summary for key, summary in rows}
+        names = set(TRANSACTION_TYPES).union(*(summary.totals for summary in months.values()))
+        self.first = min(months, default=0)
+        self.totals = {name: [] for name in names}
+        self.counts = {name: [] for name in names}
+
+        total = dict.fromkeys(names, 0)
+        count = dict.fromkeys(names, 0)
+        for index in range(self.first, max(months, default=self.first - 1) + 1):
+            summary = months.get(index)
+            for name in names:
+                if summary is not None:
+                    total[name] += summary.totals.get(name, 0)
+                    count[name] += summary.counts.get(name, 0)
+                self.totals[name].append(total[name])
+                self.counts[name].append(count[name])
+
+    @classmethod
+    def from_ledger(cls, ledger):
+        return cls(ledger.summarize_months((0, 1), (9999, 12)))
+
+    def __len__(self):
+        """Months covered, from the first one with transactions to the last"""
+        return len(next(iter(self.totals.values()), []))
+
+    def summary(self, start, end):
+        """MonthSummary of every month from ``start`` to ``end`` inclusive"""
+        low = max(month_index(*start), self.first) - self.first
+        high = min(month_index(*end) - self.first, len(self) - 1)
+        totals = {}
+        counts = {}
+        for name in self.totals:
+            totals[name] = counts[name] = 0
+            if low <= high:
+                running, running_counts = self.totals[name], self.counts[name]
+                totals[name] = running[high] - (running[low - 1] if low else 0)
+                counts[name] = running_counts[high] - (running_counts[low - 1] if low else 0)
+        return MonthSummary(totals, counts)
+
+    def add(self, year, month, transaction_type, amount, count):
+        """Count ``count`` rows worth ``amount`` more (or fewer) in a month"""
+        if transaction_type not in self.totals:
+            # A type added to transaction_types after the sums were built
+            size = len(self)
+            self.totals[transaction_type] = [0] * size
+            self.counts[transaction_type] = [0] * size
+
+        index = month_index(year, month)
+        if not len(self):
+            self.first = index
+        if index < self.first:
+            # Months before the first one are empty: their running sums are 0
+            padding = [0] * (self.first - index)
+            for running in (*self.totals.values(), *self.counts.values()):
+                running[:0] = padding
+            self.first = index
+        last = self.first + len(self) - 1
+        for running in (*self.totals.values(), *self.counts.values()):
+            running.extend([running[-1] if running else 0] * (index - last))
+
+        offset = index - self.first
+        totals, counts = self.totals[transaction_type], self.counts[transaction_type]
+        for i in range(offset, len(totals)):
+            totals[i] += amount
+            counts[i] += count
+
+
+def report_lines(summary):
+    """The breakdown of the app's summary section, as text lines"""
+    def type_line(name):
+        return f"{TYPE_LABELS.get(name, name)}: {format_amount(summary.totals.get(name, 0))}"
+
+    lines = [type_line(name) for name in INCOME_TYPES]
+    lines.append(f"Total Ingresos (A): {format_amount(summary.total_income)}")
+    lines += [type_line(name) for name in EXPENSE_TYPES]
+    lines += [
+        f"Total Egresos (C): {format_amount(summary.total_expenses)}",
+        f"Ahorro (10%): {format_amount(summary.ahorro)}",
+        f"Pago Deuda (5%): {format_amount(summary.pago_deuda)}",
+        f"Inversión (10%): {format_amount(summary.inversion)}",
+        f"Balance Final: {format_amount(summary.balance)}",
+    ]
+    return lines
+
+
+def month_from_text(text):
+    """(year, month) of "YYYY-MM"; raises ValueError"""
+    try:
+        year, month = map(int, text.split("-"))
+    except ValueError:
+        raise ValueError(f"invalid month: {text!r} (expected YYYY-MM)") from None
+    if not 1 <= month <= 12:
+        raise ValueError(f"invalid month: {text!r}")
+    return year, month
+
+
+def parse_month(text):
+    """(year, month) of a "YYYY-MM" argument"""
+    try:
+        return month_from_text(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Totals, allocations and balance of a range of months")
+    parser.add_argument("range", choices=RANGE_KINDS + ("custom",))
+    parser.add_argument("month", type=parse_month, help="YYYY-MM: a month of the range (custom: its first)")
+    parser.add_argument("end", nargs="?", type=parse_month, help="custom: YYYY-MM of the last month")
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    if args.range == "custom":
+        start, end = args.month, args.end or args.month
+    else:
+        start, end = report_range(args.range, *args.month)
+
+    with Ledger(args.db) as ledger:
+        summary = ledger.summarize_range(start, end)
+
+    print(f"📊 {start[0]}-{start[1]:02d} .. {end[0]}-{end[1]:02d}")
+    for line in report_lines(summary):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
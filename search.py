@@ -0,0 +1,174 @@
+import argparse
+import re
+import sqlite3
+
+from money import format_amount
+
+# Full-text index of the description and category of every transaction,
+# kept current by the triggers below. It is contentless: it stores only the
+# index and looks rows up in transactions by rowid (= transactions.id), and
+# it records which column a word is in but not where (detail = column),
+# since searches are sets of words, never phrases. Accents are folded
+# ("cafe" finds "Café") and prefixes of up to 3 characters are indexed so
+# the word being typed is as fast to look up as a whole one.
+SEARCH_TABLE_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS transactions_search USING fts5 (
+        description,
+        category,
+        content = '',
+        detail = column,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '1 2 3'
+    )
+"""
+
+# A contentless table forgets the text it indexed, so deleting a row means
+# handing it the same text again
+SEARCH_TRIGGERS_SQL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_search_insert
+    AFTER INSERT ON transactions
+    BEGIN
+        INSERT INTO transactions_search (rowid, description, category)
+        VALUES (NEW.id, NEW.description, (SELECT name FROM categories WHERE id = NEW.category_id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_search_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        INSERT INTO transactions_search (transactions_search, rowid, description, category)
+        VALUES ('delete', OLD.id, OLD.description, (SELECT name FROM categories WHERE id = OLD.category_id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_search_update
+    AFTER UPDATE OF description, category_id ON transactions
+    BEGIN
+        INSERT INTO transactions_search (transactions_search, rowid, description, category)
+        VALUES ('delete', OLD.id, OLD.description, (SELECT name FROM categories WHERE id = OLD.category_id));
+
+        INSERT INTO transactions_search (rowid, description, category)
+        VALUES (NEW.id, NEW.description, (SELECT name FROM categories WHERE id = NEW.category_id));
+    END
+    """,
+]
+
+# Index the transactions with id in (?, ?]
+INDEX_RANGE_SQL = """
+    INSERT INTO transactions_search (rowid, description, category)
+    SELECT t.id, t.description, c.name
+    FROM transactions t JOIN categories c ON c.id = t.category_id
+    WHERE t.id > ? AND t.id <= ?
+"""
+
+# Matches ranked by relevance are the RANK_WINDOW most recently added ones;
+# scoring every match of a common word would take as long as reading them
+# all. Older matches follow, newest first.
+RANK_WINDOW = 500
+
+# A page of the ranked matches. Description matches weigh twice as much as
+# category matches and equally good matches come newest first. Only the
+# page is joined with transactions.
+SEARCH_RANKED_QUERY = """
+    SELECT t.id, t.type_id, t.amount, t.description, t.category_id, t.date, t.month, t.year
+    FROM (
+        SELECT rowid, bm25(transactions_search, 2.0, 1.0) AS score
+        FROM transactions_search
+        WHERE transactions_search MATCH ?
+        ORDER BY rowid DESC
+        LIMIT ?
+    ) s JOIN transactions t ON t.id = s.rowid
+    ORDER BY s.score, s.rowid DESC
+    LIMIT ? OFFSET ?
+"""
+
+# A page of the matches after the ranked ones (the offset counts from the
+# newest match)
+SEARCH_NEWEST_QUERY = """
+    SELECT t.id, t.type_id, t.amount, t.description, t.category_id, t.date, t.month, t.year
+    FROM (
+        SELECT rowid
+        FROM transactions_search
+        WHERE transactions_search MATCH ?
+        ORDER BY rowid DESC
+        LIMIT ? OFFSET ?
+    ) s JOIN transactions t ON t.id = s.rowid
+    ORDER BY s.rowid DESC
+"""
+
+SEARCH_COUNT_QUERY = "SELECT COUNT(*) FROM transactions_search WHERE transactions_search MATCH ?"
+
+
+def match_expression(text):
+    """FTS5 query for what the user typed: all of its words, the last one
+    possibly unfinished ("sr wo" -> '"sr" "wo"*').
+
+    Only runs of letters and digits are kept, so no input can be an FTS5
+    syntax error. Returns None when nothing is left.
+    """
+    words = re.findall(r"[^\W_]+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+
+def search_pages(expression, limit, offset):
+    """(query, parameters) pairs whose rows, in order, are one page of results"""
+    pages = []
+    if offset < RANK_WINDOW:
+        pages.append((SEARCH_RANKED_QUERY, (expression, RANK_WINDOW, limit, offset)))
+    if offset + limit > RANK_WINDOW:
+        start = max(offset, RANK_WINDOW)
+        pages.append((SEARCH_NEWEST_QUERY, (expression, offset + limit - start, start)))
+    return pages
+
+
+def create_search(cursor):
+    """Create the search table and its triggers (the table is not filled)"""
+    cursor.execute(SEARCH_TABLE_SQL)
+    for trigger_sql in SEARCH_TRIGGERS_SQL:
+        cursor.execute(trigger_sql)
+
+
+def rebuild_search(cursor):
+    """Index every transaction again from scratch"""
+    cursor.execute("INSERT INTO transactions_search (transactions_search) VALUES ('delete-all')")
+    cursor.execute(INDEX_RANGE_SQL, (0, 2**63 - 1))
+    cursor.execute("INSERT INTO transactions_search (transactions_search) VALUES ('optimize')")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search transactions from the command line")
+    parser.add_argument("query", nargs="?", help="words to look for (prefixes match)")
+    parser.add_argument("--db", default="finance.db")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--rebuild", action="store_true", help="index every transaction again")
+    args = parser.parse_args()
+
+    # migrate_database builds on this module
+    from migrate_database import upgrade_database
+
+    conn = sqlite3.connect(args.db)
+    upgrade_database(conn)
+    cursor = conn.cursor()
+
+    if args.rebuild:
+        rebuild_search(cursor)
+        conn.commit()
+        print("🔧 transactions_search rebuilt")
+
+    expression = match_expression(args.query or "")
+    if expression is not None:
+        total = cursor.execute(SEARCH_COUNT_QUERY, (expression,)).fetchone()[0]
+        categories = dict(cursor.execute("SELECT id, name FROM categories"))
+        print(f"🔎 {total:,} transactions match {args.query!r}")
+        for sql, parameters in search_pages(expression, args.limit, 0):
+            for _, _, amount, description, category_id, date, _, _ in cursor.execute(sql, parameters):
+                print(f"{date[:10]}  {format_amount(amount):>16}  {description} ({categories[category_id]})")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import tkinter as tk
+
+from money import format_amount
+from virtual_list import VirtualList
+
+# Results fetched per page and pause in typing (ms) before searching
+PAGE_SIZE = 50
+SEARCH_DELAY = 200
+
+TYPE_LABELS = {
+    "income_fixed": "Ingreso fijo",
+    "income_variable": "Ingreso variable",
+    "expense_indispensable": "Indispensable",
+    "expense_necesarios": "Necesario",
+    "expense_innecesarios": "Innecesario",
+}
+
+
+class SearchWindow:
+    """Hidden window to search every transaction by description and category.
+
+    Built the first time it is shown. Searches run on the database worker
+    once typing pauses for SEARCH_DELAY ms, each superseding the previous
+    one, and results are paged into a VirtualList. Double-click or Enter
+    on a result calls ``on_open(month, year)``.
+    """
+
+    def __init__(self, root, db, on_open, on_error=None):
+        self.root = root
+        self.db = db
+        self.on_open = on_open
+        self.on_error = on_error
+        self.window = None
+        self.after_id = None
+        self.text = ""
+
+    def show(self):
+        if self.window is None:
+            self.build()
+        self.window.deiconify()
+        self.window.lift()
+        self.entry.focus_set()
+        self.entry.select_range(0, tk.END)
+
+    def hide(self):
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.window.withdraw()
+
+    def build(self):
+        window = tk.Toplevel(self.root)
+        window.withdraw()
+        window.title("Coiner - Buscar")
+        window.geometry("760x520")
+        window.configure(bg="#2c2c2c")
+        window.protocol("WM_DELETE_WINDOW", self.hide)
+        window.bind("<Escape>", lambda e: self.hide())
+
+        self.entry = tk.Entry(
+            window,
+            font=("Poppins", 12),
+            bg="#404040",
+            fg="white",
+            insertbackground="white",
+            relief="flat",
+            bd=6,
+            highlightthickness=0,
+        )
+        self.entry.pack(fill="x", padx=10, pady=(10, 0))
+        self.entry.bind("<KeyRelease>", lambda e: self.schedule_search())
+        self.entry.bind("<Return>", lambda e: self.search_now())
+        self.entry.bind("<Down>", lambda e: self.results.listbox.focus_set())
+
+        self.status_label = tk.Label(
+            window, fg="#9ca3af", bg="#2c2c2c", font=("Poppins", 9), anchor="w"
+        )
+        self.status_label.pack(fill="x", padx=12, pady=(4, 0))
+
+        self.results = VirtualList(
+            window,
+            format_row=self.format_result,
+            page_size=PAGE_SIZE,
+            bg="#454545",
+            listbox_options=dict(
+                font=("Poppins", 9),
+                bg="#505050",
+                fg="white",
+                relief="flat",
+                bd=0,
+                highlightthickness=0,
+                selectbackground="#606060",
+                selectforeground="white",
+                activestyle="none"
+            ),
+            scrollbar_options=dict(
+                bg="#505050",
+                troughcolor="#454545",
+                bd=0,
+                highlightthickness=0,
+                relief="flat",
+                width=12
+            ),
+        )
+        self.results.pack(fill="both", expand=True, padx=10, pady=10)
+        self.results.listbox.bind("<Double-Button-1>", lambda e: self.open_selected())
+        self.results.listbox.bind("<Return>", lambda e: self.open_selected())
+        self.window = window
+
+    def format_result(self, row):
+        return (
+            f"{row.month:02d}/{row.year}  {format_amount(row.amount)} - {row.description} "
+            f"({row.category}) · {TYPE_LABELS.get(row.type, row.type)}"
+        )
+
+    def schedule_search(self):
+        """Search once typing pauses; Tk calls this on every key"""
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+        self.after_id = self.root.after(SEARCH_DELAY, self.search_now)
+
+    def search_now(self):
+        self.after_id = None
+        text = self.entry.get().strip()
+        if text == self.text:
+            return
+        self.text = text
+        if not text:
+            self.db.cancel("search")
+            self.results.set_source(0, None)
+            self.status_label.config(text="")
+            return
+
+        def on_found(found):
+            count, first_page = found
+            # A reply for older text can still arrive if it was already running
+            if text != self.text:
+                return
+            self.results.set_source(count, self.make_page_fetcher(text), pages={0: first_page})
+            self.status_label.config(text="1 resultado" if count == 1 else f"{count:,} resultados")
+
+        self.db.submit(
+            lambda ledger: (ledger.search_count(text), ledger.search(text, PAGE_SIZE, 0)),
+            on_found,
+            self.on_error,
+            key="search",
+            label="search",
+        )
+
+    def make_page_fetcher(self, text):
+        def fetch(offset, limit, callback):
+            self.db.submit(
+                lambda ledger: ledger.search(text, limit, offset),
+                callback,
+                self.on_error,
+                label="search page",
+            )
+
+        return fetch
+
+    def open_selected(self):
+        selection = self.results.selected_rows()
+        if selection:
+            _, row = selection[0]
+            self.on_open(row.month, row.year)
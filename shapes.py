@@ -0,0 +1,34 @@
+import math
+from functools import lru_cache
+
+# Straight segments used to approximate each rounded corner
+CORNER_SEGMENTS = 6
+
+
+@lru_cache(maxsize=256)
+def rounded_rectangle_points(x1, y1, x2, y2, radius):
+    """Outline of a rounded rectangle as a flat (x, y, ...) tuple.
+
+    Cached by geometry: every button or entry of the same size reuses it.
+    """
+    radius = min(radius, (x2 - x1) / 2, (y2 - y1) / 2)
+    corners = (
+        (x2 - radius, y1 + radius, -90),  # Top-right
+        (x2 - radius, y2 - radius, 0),  # Bottom-right
+        (x1 + radius, y2 - radius, 90),  # Bottom-left
+        (x1 + radius, y1 + radius, 180),  # Top-left
+    )
+    points = []
+    for cx, cy, start in corners:
+        for step in range(CORNER_SEGMENTS + 1):
+            angle = math.radians(start + 90 * step / CORNER_SEGMENTS)
+            points.append(cx + radius * math.cos(angle))
+            points.append(cy + radius * math.sin(angle))
+    return tuple(points)
+
+
+def create_rounded_rectangle(canvas, x1, y1, x2, y2, radius=15, **kwargs):
+    """Create a rounded rectangle on a canvas as a single polygon item"""
+    return canvas.create_polygon(
+        rounded_rectangle_points(x1, y1, x2, y2, radius), outline="", **kwargs
+    )
@@ -0,0 +1,56 @@
+import sqlite3
+
+DEFAULT_PATH = "finance.db"
+DEFAULT_PROFILE = "fast"
+
+# Connection settings for each storage profile:
+#   durable      SQLite's own defaults: rollback journal and an fsync on every
+#                commit. Safest on network or removable drives.
+#   fast         WAL with synchronous=NORMAL: commits are appends to the WAL
+#                and only checkpoints fsync. The database cannot be
+#                corrupted; a power cut may lose the last commits.
+#   read-mostly  Like fast, with a large memory map and page cache so
+#                browsing a long history is served from memory.
+STORAGE_PROFILES = {
+    "durable": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -2_000,  # KiB (negative) -> 2 MB, the SQLite default
+        "temp_store": "DEFAULT",
+        "cached_statements": 128,
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64_000,
+        "temp_store": "MEMORY",
+        "cached_statements": 256,
+    },
+    "read-mostly": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 1024 * 1024 * 1024,
+        "cache_size": -256_000,
+        "temp_store": "MEMORY",
+        "cached_statements": 512,
+    },
+}
+
+
+def connect(path=DEFAULT_PATH, profile=DEFAULT_PROFILE, **connect_options):
+    """Open ``path`` with the PRAGMAs of a storage profile"""
+    try:
+        settings = STORAGE_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown storage profile: {profile!r}") from None
+
+    conn = sqlite3.connect(path, cached_statements=settings["cached_statements"], **connect_options)
+    # journal_mode is stored in the file; the others last for the connection
+    conn.execute(f"PRAGMA journal_mode = {settings['journal_mode']}")
+    conn.execute(f"PRAGMA synchronous = {settings['synchronous']}")
+    conn.execute(f"PRAGMA mmap_size = {settings['mmap_size']}")
+    conn.execute(f"PRAGMA cache_size = {settings['cache_size']}")
+    conn.execute(f"PRAGMA temp_store = {settings['temp_store']}")
+    return conn
@@ -0,0 +1,361 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from collections import OrderedDict
+
+
+class VirtualList(tk.Frame):
+    """Listbox that only renders the rows currently visible on screen.
+
+    Rows are requested one page at a time from a
+    ``fetch(offset, limit, callback)`` callable, which may answer later
+    (e.g. from the database worker), and are formatted with ``format_row``
+    only when they scroll into view, so showing a month costs the same at
+    50 rows and at 200k rows. Rows still on their way show a placeholder.
+
+    Several rows can be selected (click, Ctrl/Shift+click); the selection
+    is kept as a set of absolute row indexes so it survives scrolling.
+
+    A source can also stream its first page: ``stream_rows`` appends rows
+    as they arrive and the list repaints once per idle slice, so the first
+    rows show before the page is complete.
+    """
+
+    def __init__(
+        self,
+        parent,
+        format_row,
+        on_select=None,
+        page_size=100,
+        max_pages=8,
+        listbox_options=None,
+        scrollbar_options=None,
+        **frame_options,
+    ):
+        super().__init__(parent, **frame_options)
+
+        self.format_row = format_row
+        self.on_select = on_select
+        self.page_size = page_size
+        self.max_pages = max_pages
+
+        self.fetch = None
+        self.count = 0
+        self.top = 0
+        self.visible = 1
+        self.selected = set()
+        self.cursor = None
+        self.pages = OrderedDict()
+        self.pending = set()
+        self.streaming = set()
+        self.source_id = 0
+        self.render_id = None
+
+        self.scrollbar = tk.Scrollbar(self, command=self.on_scrollbar, **(scrollbar_options or {}))
+        self.scrollbar.pack(side="right", fill="y")
+
+        # Selection is tracked by absolute row index, so each list keeps its
+        # own selection instead of handing it over to the X selection
+        listbox_options = dict(listbox_options or {}, exportselection=False, selectmode="extended")
+        self.listbox = tk.Listbox(self, **listbox_options)
+        self.listbox.pack(fill="both", expand=True, padx=(4, 16), pady=4)
+
+        font = tkfont.Font(font=self.listbox.cget("font"))
+        self.line_height = font.metrics("linespace") + 1
+
+        self.listbox.bind("<Configure>", self.on_resize)
+        self.listbox.bind("<<ListboxSelect>>", self.on_listbox_select)
+        self.listbox.bind("<MouseWheel>", self.on_mousewheel)
+        self.listbox.bind("<Button-4>", lambda e: self.scroll_by(-3))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll_by(3))
+        self.listbox.bind("<Up>", lambda e: self.move_selection(-1))
+        self.listbox.bind("<Down>", lambda e: self.move_selection(1))
+
+    def set_source(self, count, fetch, pages=None, streaming=False):
+        """Show ``count`` rows served by ``fetch(offset, limit, callback)``.
+
+        ``pages`` optionally seeds already loaded pages ({page number: rows}),
+        e.g. from the month cache, so they render without a fetch. With
+        ``streaming`` the first page is not fetched: it arrives through
+        ``stream_rows`` until ``end_stream``.
+        """
+        self.fetch = fetch
+        self.count = count
+        self.top = 0
+        self.selected.clear()
+        self.cursor = None
+        self.pages.clear()
+        self.pages.update(pages or {})
+        self.pending.clear()
+        self.streaming.clear()
+        if streaming and count:
+            self.pending.add(0)
+            self.streaming.add(0)
+        self.source_id += 1
+        self.render()
+
+    def stream_rows(self, page_no, rows):
+        """Append the next rows of a streamed page and repaint when idle"""
+        if page_no not in self.streaming:
+            # The stream was cut short (new source or shifted rows)
+            return
+        self.pages.setdefault(page_no, []).extend(rows)
+        self.schedule_render()
+
+    def end_stream(self, page_no):
+        """Mark a streamed page complete"""
+        if page_no in self.streaming:
+            self.streaming.discard(page_no)
+            self.pending.discard(page_no)
+
+    def get_row(self, index):
+        """Return the row at absolute position ``index``, or None if not loaded yet"""
+        page_no, offset = divmod(index, self.page_size)
+        page = self.pages.get(page_no)
+        if page is None:
+            self.request_page(page_no)
+            return None
+        self.pages.move_to_end(page_no)
+        return page[offset] if offset < len(page) else None
+
+    def request_page(self, page_no):
+        if page_no in self.pending or self.fetch is None:
+            return
+        self.pending.add(page_no)
+        source_id = self.source_id
+        self.fetch(
+            page_no * self.page_size,
+            self.page_size,
+            lambda rows: self.on_page_loaded(source_id, page_no, rows),
+        )
+
+    def on_page_loaded(self, source_id, page_no, rows):
+        # Pages requested for a previous source (e.g. another month) are dropped
+        if source_id != self.source_id:
+            return
+        self.pending.discard(page_no)
+        self.pages[page_no] = rows
+        if len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+        self.render()
+
+    def insert_row(self, index, row):
+        """Insert ``row`` at ``index`` without refetching the loaded pages"""
+        self.count += 1
+        self.selected = {i + 1 if i >= index else i for i in self.selected}
+        self.shift_pages(index, row)
+        self.render()
+
+    def remove_rows(self, indexes):
+        """Remove the rows at ``indexes`` without refetching the loaded pages"""
+        lost_selection = False
+        for index in sorted(indexes, reverse=True):
+            self.count -= 1
+            lost_selection |= index in self.selected
+            self.selected = {i - 1 if i > index else i for i in self.selected if i != index}
+            self.shift_pages(index, None)
+        self.cursor = None
+        self.top = max(0, min(self.top, self.count - self.visible))
+        self.render()
+        if lost_selection and self.on_select:
+            self.on_select(self.selected_rows())
+
+    def shift_pages(self, index, row):
+        """Shift loaded pages for ``row`` inserted at ``index`` (or removed, if None).
+
+        Every shifted page takes one boundary row from a neighbouring page,
+        so it can only be rebuilt if that neighbour is loaded; pages that
+        cannot be are dropped and fetched again when shown. Pages are
+        replaced rather than edited since they may be shared with a cache.
+        """
+        first, offset = divmod(index, self.page_size)
+        old_count = self.count - 1 if row is not None else self.count + 1
+
+        # A page still streaming cannot be shifted; it is fetched again
+        for page_no in self.streaming:
+            self.pages.pop(page_no, None)
+        self.streaming.clear()
+        old = dict(self.pages)
+
+        if row is not None and first not in old and offset == 0 and index == old_count:
+            # First row of a new page (or of an empty list)
+            self.pages[first] = [row]
+
+        for page_no in sorted(number for number in old if number >= first):
+            rows = list(old[page_no])
+            if row is not None:
+                if page_no == first:
+                    rows.insert(offset, row)
+                elif page_no - 1 in old:
+                    rows.insert(0, old[page_no - 1][-1])
+                else:
+                    del self.pages[page_no]
+                    continue
+                del rows[self.page_size:]
+            else:
+                if page_no * self.page_size >= self.count:
+                    # Past the new end of the list
+                    del self.pages[page_no]
+                    continue
+                del rows[offset if page_no == first else 0]
+                if (page_no + 1) * self.page_size < old_count:
+                    if page_no + 1 not in old:
+                        del self.pages[page_no]
+                        continue
+                    rows.append(old[page_no + 1][0])
+            self.pages[page_no] = rows
+
+        # Pages requested before the shift would land at stale offsets
+        self.pending.clear()
+        self.source_id += 1
+
+    def loaded_page(self, page_no):
+        """Rows of a page if it is completely loaded, else None"""
+        if page_no in self.streaming:
+            return None
+        return self.pages.get(page_no)
+
+    def selected_rows(self):
+        """Return [(index, row)] of the selection in list order.
+
+        Rows whose page is no longer loaded are requested and left out; use
+        ``load_selected_rows`` when every selected row is needed.
+        """
+        selection = []
+        for index in sorted(self.selected):
+            row = self.get_row(index)
+            if row is not None:
+                selection.append((index, row))
+        return selection
+
+    def load_selected_rows(self, callback):
+        """Call ``callback([(index, row)])`` with the whole selection in list
+        order, once the rows on pages no longer loaded have been fetched.
+
+        The missing pages are fetched without entering the page cache, so a
+        selection spanning more than ``max_pages`` pages is still complete.
+        ``callback(None)`` is called instead if the rows shift or the source
+        changes before they arrive.
+        """
+        indexes = sorted(self.selected)
+        rows = {}
+        missing = set()
+        for index in indexes:
+            page_no, offset = divmod(index, self.page_size)
+            page = self.loaded_page(page_no)
+            if page is None:
+                missing.add(page_no)
+            elif offset < len(page):
+                rows[index] = page[offset]
+        if not missing:
+            callback([(index, rows[index]) for index in indexes if index in rows])
+            return
+
+        source_id = self.source_id
+
+        def on_page(page_no, page):
+            if not missing:
+                return
+            if source_id != self.source_id:
+                missing.clear()
+                callback(None)
+                return
+            for index in indexes:
+                number, offset = divmod(index, self.page_size)
+                if number == page_no and offset < len(page):
+                    rows[index] = page[offset]
+            missing.discard(page_no)
+            if not missing:
+                callback([(index, rows[index]) for index in indexes if index in rows])
+
+        for page_no in sorted(missing):
+            self.fetch(
+                page_no * self.page_size,
+                self.page_size,
+                lambda page, page_no=page_no: on_page(page_no, page),
+            )
+
+    def schedule_render(self):
+        """Render once the event loop is idle, however many times it is called"""
+        if self.render_id is None:
+            self.render_id = self.after_idle(self.flush_render)
+
+    def flush_render(self):
+        self.render_id = None
+        self.render()
+
+    def render(self):
+        """Redraw the visible window of rows"""
+        if self.render_id is not None:
+            self.after_cancel(self.render_id)
+            self.render_id = None
+        self.listbox.delete(0, tk.END)
+
+        end = min(self.count, self.top + self.visible)
+        for index in range(self.top, end):
+            row = self.get_row(index)
+            self.listbox.insert(tk.END, self.format_row(row) if row is not None else "…")
+
+        for index in self.selected:
+            if self.top <= index < end:
+                self.listbox.selection_set(index - self.top)
+
+        if self.count:
+            self.scrollbar.set(self.top / self.count, end / self.count)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, top):
+        top = max(0, min(int(top), self.count - self.visible))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.top + rows)
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * self.count)
+        elif unit == "pages":
+            self.scroll_by(int(amount) * self.visible)
+        else:
+            self.scroll_by(int(amount))
+
+    def on_mousewheel(self, event):
+        self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def on_resize(self, event):
+        visible = max(1, event.height // self.line_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.top = max(0, min(self.top, self.count - self.visible))
+            self.render()
+
+    def move_selection(self, step):
+        """Arrow keys select the single row above or below the cursor"""
+        if not self.count:
+            return "break"
+        if self.cursor is None:
+            index = self.top
+        else:
+            index = max(0, min(self.cursor + step, self.count - 1))
+        self.cursor = index
+        self.selected = {index}
+        if index < self.top:
+            self.scroll_to(index)
+        elif index >= self.top + self.visible:
+            self.scroll_to(index - self.visible + 1)
+        self.render()
+        if self.on_select:
+            self.on_select(self.selected_rows())
+        return "break"
+
+    def on_listbox_select(self, event):
+        # Only the visible window is in the listbox; selected rows scrolled
+        # out of view stay selected
+        end = min(self.count, self.top + self.visible)
+        self.selected.difference_update(range(self.top, end))
+        self.selected.update(self.top + position for position in self.listbox.curselection())
+        self.cursor = self.top + self.listbox.index(tk.ACTIVE)
+        if self.on_select:
+            self.on_select(self.selected_rows())